@@ -1,13 +1,11 @@
-from PIL import Image
 import os
 import random
 
-# Global Variables
-Beer = Image.open(os.path.join(os.path.dirname(__file__), 'Images', 'Beer.jpg'))
-Stella = Image.open(os.path.join(os.path.dirname(__file__), 'Images', 'Stella.jpg'))
+# Images are loaded on first use rather than at import, to keep process start-up short
 
 # Function to load images from a folder
 def load_images_from_folder(folder):
+    from PIL import Image
     supported_exts = ('.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.webp')
     images = []
     for fname in os.listdir(folder):
@@ -21,9 +19,30 @@ def load_images_from_folder(folder):
                 print(f"Error loading image {path}: {e}")
     return images
 
-# Load personalized images
+# Personalized images, loaded by get_personalized_images()
 personalized_folder = os.path.join(os.path.dirname(__file__), 'Images', 'Personalized')
-personalized_images = load_images_from_folder(personalized_folder)
+personalized_images = None
+
+def get_personalized_images():
+    global personalized_images
+    if personalized_images is None:
+        personalized_images = load_images_from_folder(personalized_folder)
+    return personalized_images
+
+_fallback_images = {}
+
+# Built-in fallback images (Beer, Stella), opened on first use
+def get_fallback_image(name):
+    if name not in _fallback_images:
+        from PIL import Image
+        _fallback_images[name] = Image.open(os.path.join(os.path.dirname(__file__), 'Images', f'{name}.jpg'))
+    return _fallback_images[name]
+
+# Keeps asset_handler.Beer / asset_handler.Stella working without loading them at import
+def __getattr__(name):
+    if name in ('Beer', 'Stella'):
+        return get_fallback_image(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def get_mixed_images(general_images, personalized_images):
     # Avoid duplicates by using a set of filenames
@@ -88,13 +107,14 @@ class Display():
         backup_default_images = []
         if os.path.isdir(def_images_folder):
             backup_default_images = load_images_from_folder(def_images_folder)
+        personalized_images = get_personalized_images()
         # Load alcohol images
         if alcohol_folder and os.path.isdir(alcohol_folder):
             alcohol_images = load_images_from_folder(alcohol_folder)
             if not alcohol_images:
-                alcohol_images = backup_default_images if backup_default_images else [Beer, Stella]
+                alcohol_images = backup_default_images if backup_default_images else [get_fallback_image('Beer'), get_fallback_image('Stella')]
         else:
-            alcohol_images = backup_default_images if backup_default_images else [Beer, Stella]
+            alcohol_images = backup_default_images if backup_default_images else [get_fallback_image('Beer'), get_fallback_image('Stella')]
         # Load non-alcohol images
         if non_alcohol_folder and os.path.isdir(non_alcohol_folder):
             non_alcohol_images = load_images_from_folder(non_alcohol_folder)
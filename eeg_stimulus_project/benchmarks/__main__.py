@@ -0,0 +1,11 @@
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.benchmarks.harness import main
+
+if __name__ == "__main__":
+    sys.exit(main())
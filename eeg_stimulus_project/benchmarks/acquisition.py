@@ -0,0 +1,174 @@
+"""
+Acquisition-path benchmarks: LSL collector throughput and CPU, label end-to-end latency and
+save/export times. Everything runs against local simulated streams (lsl/replay.py).
+"""
+
+import contextlib
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+from pylsl import StreamInlet, local_clock, resolve_byprop
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.benchmarks.harness import BenchmarkSkipped, benchmark, metric, percentile
+from eeg_stimulus_project.config import config
+from eeg_stimulus_project.data.xdf_recorder import XDFWriter
+from eeg_stimulus_project.lsl.labels import LSLLabelStream
+from eeg_stimulus_project.lsl.replay import ReplayStream, SessionReplay
+from eeg_stimulus_project.utils.batch_convert import convert_file
+
+
+def synthetic_eeg(seconds, srate=None, channels=None, name="EEG", seed=0):
+    """A ReplayStream of noisy EEG-like data at the configured amplifier rate and channel count."""
+    settings = config.get('lsl.stream_settings.eeg', {})
+    srate = srate or settings.get('sampling_rate', 2048)
+    channels = channels or settings.get('channel_count', 32)
+    count = int(seconds * srate)
+    samples = (np.random.default_rng(seed).standard_normal((count, channels)) * 10).astype(np.float32)
+    return ReplayStream(name, "EEG", channels, srate, 'float32', np.arange(count) / srate, samples,
+                        source_id=f"benchmark_{name}")
+
+
+@contextlib.contextmanager
+def quiet():
+    # The collector prints a warning on every empty poll; keep that off the console
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+@benchmark("collector_throughput")
+def collector_throughput(quick=False):
+    """LSL.collect loop against a 2 kHz x 32 channel stream replayed in real time."""
+    from eeg_stimulus_project.lsl.stream_manager import LSL
+    duration = 2.0 if quick else config.get('benchmarks.duration', 10.0)
+    stream = synthetic_eeg(duration + 5.0)
+    replay = SessionReplay([stream], speed=1.0).start()
+    try:
+        with quiet():
+            LSL.init_lsl_stream()
+            if not LSL.streams.get('EEG'):
+                raise BenchmarkSkipped("the replayed EEG stream was not resolved")
+            LSL.start_collection()
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            time.sleep(duration)
+            LSL.collecting = False
+            LSL.collection_thread.join()
+            wall = time.perf_counter() - wall_start
+            # Process CPU time: includes the replay thread, which pushes chunks of 10 samples
+            cpu = time.process_time() - cpu_start
+        collected = len(LSL.collected_data['EEG'])
+    finally:
+        replay.stop()
+    expected = stream.nominal_srate * wall
+    return {
+        'samples_per_second': metric(collected / wall, "samples/s", "higher"),
+        'completeness': metric(collected / expected, "ratio", "higher"),
+        'cpu_percent': metric(100.0 * cpu / wall, "%"),
+        'info': {'srate': stream.nominal_srate, 'channels': stream.channel_count, 'seconds': wall},
+    }
+
+
+def _wire_listener(host):
+    # The label branch of ControlWindow.host_command_listener, used when the GUI modules cannot be imported
+    buffer = ''
+    while True:
+        data = host.connection.recv(4096).decode('utf-8')
+        if not data:
+            break
+        buffer += data
+        while "\n" in buffer:
+            line, buffer = buffer.split("\n", 1)
+            message = json.loads(line)
+            if message.get("action") == "label":
+                host.label_push(message.get("label"))
+
+
+@benchmark("label_latency")
+def label_latency(quick=False):
+    """Time from DisplayWindow.send_message to the label being pushed on the LSL marker outlet."""
+    count = 50 if quick else 500
+    client_sock, host_sock = socket.socketpair()
+    label_stream = LSLLabelStream(stream_name="benchmark_labels", source_id="benchmark_label_stream")
+    host = SimpleNamespace(connection=host_sock, label_push=label_stream.push_label,
+                           handle_network_log_message=lambda message: None)
+    client = SimpleNamespace(client=True, connection=client_sock)
+    try:
+        from eeg_stimulus_project.gui.control_window import ControlWindow
+        from eeg_stimulus_project.gui.display_window import DisplayWindow
+        listener = lambda: ControlWindow.host_command_listener(host)
+        send = lambda message: DisplayWindow.send_message(client, message)
+        path = "DisplayWindow.send_message -> ControlWindow.host_command_listener"
+    except Exception as e:
+        listener = lambda: _wire_listener(host)
+        send = lambda message: client_sock.sendall((json.dumps(message) + "\n").encode('utf-8'))
+        path = f"JSON-lines wire protocol (GUI modules unavailable: {type(e).__name__})"
+
+    found = resolve_byprop('name', "benchmark_labels", timeout=5.0)
+    if not found:
+        raise BenchmarkSkipped("label stream not resolved")
+    inlet = StreamInlet(found[0])
+    inlet.open_stream(timeout=5.0)
+    threading.Thread(target=listener, daemon=True).start()
+    latencies = []
+    try:
+        for i in range(count):
+            sent = local_clock()
+            send({"action": "label", "label": f"Benchmark Image {i}"})
+            sample, pushed = inlet.pull_sample(timeout=2.0)
+            if sample is not None:
+                # The outlet stamps each label with local_clock() at push time
+                latencies.append((pushed - sent) * 1000.0)
+            time.sleep(0.002)
+    finally:
+        client_sock.close()
+        host_sock.close()
+    if not latencies:
+        raise BenchmarkSkipped("no labels received")
+    return {
+        'p50_ms': metric(percentile(latencies, 50), "ms"),
+        'p95_ms': metric(percentile(latencies, 95), "ms"),
+        'max_ms': metric(max(latencies), "ms"),
+        'info': {'labels': len(latencies), 'path': path},
+    }
+
+
+@benchmark("save_export")
+def save_export(quick=False):
+    """Write a session's XDF and CSV files and convert the recording for analysis."""
+    from eeg_stimulus_project.data.data_saving import Save_Data
+    seconds = 10 if quick else 60
+    stream = synthetic_eeg(seconds)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, quiet():
+        path = os.path.join(tmp, "session.xdf")
+        started = time.perf_counter()
+        writer = XDFWriter(path)
+        writer.write_stream_header(1, stream.make_info().as_xml())
+        chunk = int(stream.nominal_srate)
+        for begin in range(0, len(stream), chunk):
+            writer.write_samples(1, stream.timestamps[begin:begin + chunk], stream.samples[begin:begin + chunk], 'float32')
+        writer.close()
+        results['xdf_write_ms'] = metric((time.perf_counter() - started) * 1000.0, "ms")
+
+        for fmt in ("npz", "csv"):
+            started = time.perf_counter()
+            convert_file(path, os.path.join(tmp, "converted", "session"), fmt)
+            results[f"convert_{fmt}_ms"] = metric((time.perf_counter() - started) * 1000.0, "ms")
+
+        trials = 500
+        started = time.perf_counter()
+        Save_Data(tmp, "2").save_data_stroop("Stroop Benchmark", ["Yes", "No"] * (trials // 2), list(range(trials)))
+        results['stroop_csv_ms'] = metric((time.perf_counter() - started) * 1000.0, "ms")
+    results['info'] = {'seconds': seconds, 'srate': stream.nominal_srate, 'channels': stream.channel_count}
+    return results
@@ -0,0 +1,176 @@
+"""
+Benchmark registry, runner and JSON result store.
+
+Benchmarks register themselves with @benchmark and return a dict of metrics, each
+{'value': float, 'unit': str, 'better': 'lower' | 'higher'}, optionally with an 'info' dict.
+Results of a run are written to benchmarks.results_dir as one JSON file and can be compared
+with an earlier run to flag regressions.
+"""
+
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import traceback
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.config import config
+
+BENCHMARKS = {}
+
+
+class BenchmarkSkipped(Exception):
+    """Raised by a benchmark that cannot run in the current environment."""
+
+
+def benchmark(name):
+    """Register a benchmark function under a name; it receives quick=True for short runs."""
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def metric(value, unit, better="lower"):
+    return {'value': float(value), 'unit': unit, 'better': better}
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return float('nan')
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=str(project_root),
+                                       stderr=subprocess.DEVNULL, timeout=5).decode().strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmarks(names=None, quick=False):
+    """
+    Run the selected benchmarks (all registered ones by default).
+
+    :return: Result dict with environment details and, per benchmark, its metrics, or the reason it was skipped.
+    """
+    # Import the modules that register the benchmarks
+    from eeg_stimulus_project.benchmarks import acquisition, presentation  # noqa: F401
+
+    selected = names or list(BENCHMARKS)
+    results = {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'quick': quick,
+        'benchmarks': {},
+    }
+    for name in selected:
+        if name not in BENCHMARKS:
+            raise KeyError(f"Unknown benchmark {name!r}; available: {', '.join(BENCHMARKS)}")
+        print(f"Running {name}...")
+        started = time.perf_counter()
+        try:
+            entry = {'metrics': BENCHMARKS[name](quick=quick)}
+        except BenchmarkSkipped as e:
+            entry = {'skipped': str(e)}
+        except Exception as e:
+            traceback.print_exc()
+            entry = {'error': f"{type(e).__name__}: {e}"}
+        entry['seconds'] = time.perf_counter() - started
+        info = entry.get('metrics', {}).pop('info', None)
+        if info:
+            entry['info'] = info
+        results['benchmarks'][name] = entry
+    return results
+
+
+def save_results(results, results_dir=None):
+    """Write a result dict to <results_dir>/<timestamp>.json and return the path."""
+    results_dir = Path(results_dir) if results_dir else config.get_absolute_path('benchmarks.results_dir')
+    results_dir.mkdir(parents=True, exist_ok=True)
+    stamp = results['timestamp'].replace(":", "").replace("-", "")
+    path = results_dir / f"bench_{stamp}.json"
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def latest_results(results_dir=None, exclude=None):
+    """Return the path of the newest stored result file (other than exclude), or None."""
+    results_dir = Path(results_dir) if results_dir else config.get_absolute_path('benchmarks.results_dir')
+    files = sorted(path for path in results_dir.glob("bench_*.json") if exclude is None or path != Path(exclude))
+    return files[-1] if files else None
+
+
+def compare(current, baseline, threshold=None):
+    """
+    Compare two result dicts metric by metric.
+
+    :param threshold: Relative change counted as a regression (defaults to benchmarks.regression_threshold).
+    :return: List of dicts (benchmark, metric, baseline, current, change, regression), change relative to baseline.
+    """
+    threshold = config.get('benchmarks.regression_threshold', 0.2) if threshold is None else threshold
+    rows = []
+    for name, entry in current['benchmarks'].items():
+        previous = baseline.get('benchmarks', {}).get(name, {}).get('metrics', {})
+        for key, value in entry.get('metrics', {}).items():
+            if key not in previous or not previous[key]['value']:
+                continue
+            old, new = previous[key]['value'], value['value']
+            change = (new - old) / abs(old)
+            worse = change > threshold if value['better'] == 'lower' else change < -threshold
+            rows.append({'benchmark': name, 'metric': key, 'baseline': old, 'current': new,
+                         'unit': value['unit'], 'change': change, 'regression': worse})
+    return rows
+
+
+def print_results(results, comparison=None):
+    changes = {(row['benchmark'], row['metric']): row for row in comparison or []}
+    for name, entry in results['benchmarks'].items():
+        if 'metrics' not in entry:
+            print(f"{name}: {'skipped' if 'skipped' in entry else 'error'} ({entry.get('skipped') or entry.get('error')})")
+            continue
+        print(f"{name}:")
+        for key, value in entry['metrics'].items():
+            line = f"  {key}: {value['value']:.3f} {value['unit']}"
+            row = changes.get((name, key))
+            if row:
+                line += f"  ({row['change']:+.1%} vs baseline{', REGRESSION' if row['regression'] else ''})"
+            print(line)
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Run the acquisition and stimulus benchmarks.")
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument("--quick", action="store_true", help="shorter runs, for smoke testing")
+    parser.add_argument("--results-dir", default=None, help="where to store the JSON results")
+    parser.add_argument("--baseline", default=None, help="result file to compare with (default: the latest stored run)")
+    parser.add_argument("--no-save", action="store_true", help="do not store this run")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.names or None, quick=args.quick)
+    path = None if args.no_save else save_results(results, args.results_dir)
+    baseline_path = args.baseline or latest_results(args.results_dir, exclude=path)
+    comparison = None
+    if baseline_path:
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            comparison = compare(results, json.load(f))
+        print(f"Compared with {baseline_path}")
+    print_results(results, comparison)
+    if path:
+        print(f"Results saved to {path}")
+    return 1 if comparison and any(row['regression'] for row in comparison) else 0
@@ -0,0 +1,120 @@
+"""
+Stimulus-path benchmarks: timer-driven stimulus onset error, EEG viewer frame time and the
+start-up (import) time of the session windows. Qt runs on the offscreen platform when no display is set.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.benchmarks.harness import BenchmarkSkipped, benchmark, metric, percentile
+
+
+_app = None
+
+
+def qt_application():
+    # Keep a reference so the application outlives the benchmark that created it
+    global _app
+    if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    _app = QApplication.instance() or QApplication([])
+    return _app
+
+
+@benchmark("stimulus_onset_error")
+def stimulus_onset_error(quick=False):
+    """How late QTimer.singleShot fires, the way DisplayWindow schedules image and crosshair changes."""
+    from PyQt5.QtCore import QEventLoop, QTimer
+    app = qt_application()
+    trials = 10 if quick else 50
+    interval_ms = 100
+    errors = []
+    loop = QEventLoop()
+
+    def schedule(remaining):
+        expected = time.perf_counter() + interval_ms / 1000.0
+
+        def fire():
+            errors.append((time.perf_counter() - expected) * 1000.0)
+            if remaining > 1:
+                schedule(remaining - 1)
+            else:
+                loop.quit()
+        QTimer.singleShot(interval_ms, fire)
+
+    schedule(trials)
+    loop.exec_()
+    app.processEvents()
+    absolute = [abs(e) for e in errors]
+    return {
+        'mean_abs_ms': metric(sum(absolute) / len(absolute), "ms"),
+        'p95_abs_ms': metric(percentile(absolute, 95), "ms"),
+        'max_late_ms': metric(max(errors), "ms"),
+        'info': {'trials': len(errors), 'interval_ms': interval_ms},
+    }
+
+
+@benchmark("viewer_frame_time")
+def viewer_frame_time(quick=False):
+    """Time to update and redraw one frame of the EEG viewer."""
+    qt_application()
+    from eeg_stimulus_project.data.eeg_graph_widget import EEGGraphWidget
+    widget = EEGGraphWidget()
+    widget.animation.event_source.stop()
+    frames = 10 if quick else 50
+    widget.canvas.draw()
+    times = []
+    for frame in range(frames):
+        started = time.perf_counter()
+        widget.update(frame)
+        widget.canvas.draw()
+        times.append((time.perf_counter() - started) * 1000.0)
+    widget.deleteLater()
+    mean = sum(times) / len(times)
+    return {
+        'mean_ms': metric(mean, "ms"),
+        'p95_ms': metric(percentile(times, 95), "ms"),
+        'fps': metric(1000.0 / mean, "frames/s", "higher"),
+        'info': {'frames': frames},
+    }
+
+
+STARTUP_MODULES = [
+    "eeg_stimulus_project.gui.control_window",
+    "eeg_stimulus_project.gui.main_gui",
+    "eeg_stimulus_project.gui.display_window",
+]
+
+
+@benchmark("session_startup")
+def session_startup(quick=False):
+    """Wall time of a fresh interpreter importing each session window module."""
+    env = dict(os.environ, PYTHONPATH=str(project_root) + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    if not env.get("DISPLAY") and sys.platform.startswith("linux"):
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    results, failures = {}, {}
+    repeats = 1 if quick else 3
+    for module in STARTUP_MODULES:
+        samples = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            process = subprocess.run([sys.executable, "-c", f"import {module}"], env=env, capture_output=True,
+                                     timeout=120, cwd=str(project_root))
+            if process.returncode != 0:
+                failures[module] = process.stderr.decode(errors='replace').strip().splitlines()[-1:]
+                break
+            samples.append((time.perf_counter() - started) * 1000.0)
+        if samples:
+            results[f"{module.rsplit('.', 1)[-1]}_import_ms"] = metric(min(samples), "ms")
+    if not results:
+        raise BenchmarkSkipped(f"no session module could be imported: {failures}")
+    results['info'] = {'failed': failures} if failures else {}
+    return results
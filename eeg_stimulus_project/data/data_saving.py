@@ -24,20 +24,21 @@ class Save_Data():
 
         # Save data to a file in the test directory
         file_path = os.path.join(test_dir, 'data.csv')
-        file_exists = os.path.isfile(file_path)
-
-        # If the file exists, delete it
-        if file_exists:
-            print("File already exists. Deleting the old file.")
-            os.remove(file_path)
-        
-        with open(file_path, 'a', newline='') as file:  # Append to the file
+        if os.path.isfile(file_path):
+            print("File already exists. Replacing the old file.")
+
+        # Write a temporary file and swap it in, so a crash never leaves a truncated data.csv
+        temp_path = file_path + '.tmp'
+        with open(temp_path, 'w', newline='') as file:
             writer = csv.writer(file)
             # Write headers
             writer.writerow(['User Inputs', 'Elapsed Time'])
             # Write the data
             for input, time in zip(user_inputs, elapsed_time):
                 writer.writerow([input, time])
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, file_path)
         print("Data saved successfully!")
 
     # NEEDS TO ADD IMAGE LABELING (KEEP TRACK)
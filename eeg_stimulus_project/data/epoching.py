@@ -0,0 +1,170 @@
+"""
+Vectorized epoching of continuous EEG around the marker labels pushed by LSLLabelStream.
+
+Marker time stamps are mapped to sample indices with np.searchsorted and every epoch of a condition
+is sliced in one fancy-indexing step from a strided sliding-window view of the data, giving a
+(trials x channels x samples) array. Results of epoch_session are cached per session and condition.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.utils.xdf_file_handler import XDFIndexedReader
+
+# Marker labels sent by DisplayWindow/ControlWindow, grouped into analysis conditions
+MARKER_PATTERNS = {
+    'image': r"^(?!Instruction Text: ).+ Image$",
+    'response_yes': r"^.+ Image: Yes$",
+    'response_no': r"^.+ Image: No$",
+    'crosshair': r"^Crosshair Shown$",
+    'craving': r"^craving_rating_\d+$",
+    'touch': r"^tactile_touch$",
+}
+
+
+def select_events(labels, times, condition):
+    """
+    Pick the marker time stamps belonging to a condition.
+
+    :param labels: Marker labels (strings, or one-element lists as loaded from XDF).
+    :param times: Marker time stamps.
+    :param condition: A key of MARKER_PATTERNS or a regular expression matched against the labels.
+    :return: A tuple (event_times, event_labels).
+    """
+    pattern = re.compile(MARKER_PATTERNS.get(condition, condition))
+    event_times, event_labels = [], []
+    for label, timestamp in zip(labels, times):
+        if isinstance(label, (list, tuple)):
+            label = label[0]
+        if pattern.search(label):
+            event_times.append(timestamp)
+            event_labels.append(label)
+    return np.asarray(event_times, dtype=float), event_labels
+
+
+class Epochs:
+    """
+    Epoched data of one condition.
+
+    :param data: Array of shape (trials, channels, samples).
+    :param times: Sample times relative to the event, in seconds.
+    :param event_times: Time stamp of each kept event.
+    :param labels: Marker label of each kept event.
+    :param dropped: Number of events too close to the start or end of the recording.
+    """
+
+    def __init__(self, data, times, event_times, labels, dropped=0):
+        self.data = data
+        self.times = times
+        self.event_times = event_times
+        self.labels = labels
+        self.dropped = dropped
+
+    def average(self):
+        """Return the ERP (channels x samples) of the condition."""
+        return self.data.mean(axis=0)
+
+    def save(self, path):
+        np.savez(path, data=self.data, times=self.times, event_times=self.event_times,
+                 labels=np.asarray(self.labels, dtype=str), dropped=self.dropped)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as cached:
+            return cls(cached['data'], cached['times'], cached['event_times'], list(cached['labels']), int(cached['dropped']))
+
+
+def epoch(data, data_times, event_times, tmin=-0.2, tmax=0.8, srate=None, baseline=(None, 0.0), labels=None):
+    """
+    Cut epochs around events from continuous data.
+
+    :param data: Continuous data, shape (samples, channels), as loaded from XDF.
+    :param data_times: Time stamp of each sample (sorted).
+    :param event_times: Time stamps of the events.
+    :param tmin: Epoch start relative to the event (seconds, negative for pre-stimulus).
+    :param tmax: Epoch end relative to the event (seconds).
+    :param srate: Sampling rate; estimated from data_times when omitted.
+    :param baseline: (start, end) in seconds relative to the event whose mean is subtracted per channel;
+                     None for no correction, None inside the tuple means the epoch edge.
+    :param labels: Optional label per event.
+    :return: An Epochs instance.
+    """
+    data = np.asarray(data)
+    data_times = np.asarray(data_times, dtype=float)
+    event_times = np.asarray(event_times, dtype=float)
+    if srate is None:
+        srate = (len(data_times) - 1) / (data_times[-1] - data_times[0])
+    length = int(round((tmax - tmin) * srate))
+    times = tmin + np.arange(length) / srate
+
+    if length > len(data):
+        return Epochs(np.empty((0, data.shape[1], length)), times, event_times[:0], [], dropped=len(event_times))
+
+    # Map the epoch start of every event to a sample index in one call
+    starts = np.searchsorted(data_times, event_times + tmin)
+    valid = (starts + length <= len(data)) & (event_times + tmin >= data_times[0])
+    kept = np.flatnonzero(valid)
+
+    # Strided view of every possible window; indexing it copies only the selected epochs
+    windows = sliding_window_view(data, length, axis=0)  # (samples - length + 1, channels, length)
+    epochs = windows[starts[kept]].astype(np.float64)
+
+    if baseline is not None and len(kept):
+        b_start = tmin if baseline[0] is None else baseline[0]
+        b_end = tmax if baseline[1] is None else baseline[1]
+        mask = (times >= b_start) & (times <= b_end)
+        if mask.any():
+            epochs -= epochs[:, :, mask].mean(axis=2, keepdims=True)
+
+    kept_labels = [labels[i] for i in kept] if labels is not None else [""] * len(kept)
+    return Epochs(epochs, times, event_times[kept], kept_labels, dropped=int(len(event_times) - len(kept)))
+
+
+def _cache_path(xdf_path, condition, params, cache_dir):
+    stat = os.stat(xdf_path)
+    key = json.dumps([condition, params, stat.st_size, stat.st_mtime_ns], sort_keys=True)
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    name = re.sub(r"[^A-Za-z0-9_-]+", "_", condition)[:40]
+    return Path(cache_dir or (str(xdf_path) + ".epochs")) / f"{name}_{digest}.npz"
+
+
+def epoch_session(xdf_path, condition, tmin=-0.2, tmax=0.8, baseline=(None, 0.0), eeg_stream="EEG",
+                  marker_stream="labels", cache_dir=None, use_cache=True):
+    """
+    Epoch one recorded session for a condition, reusing the cached result when available.
+
+    :param xdf_path: Path of the session's .xdf file.
+    :param condition: A key of MARKER_PATTERNS or a regular expression matched against the labels.
+    :param eeg_stream: Name of the EEG stream in the file.
+    :param marker_stream: Name of the marker stream (LSLLabelStream uses "labels").
+    :param cache_dir: Directory for cached epochs (defaults to "<xdf_path>.epochs").
+    :return: An Epochs instance.
+    """
+    params = {'tmin': tmin, 'tmax': tmax, 'baseline': list(baseline) if baseline is not None else None,
+              'eeg': eeg_stream, 'markers': marker_stream}
+    cache = _cache_path(xdf_path, condition, params, cache_dir)
+    if use_cache and cache.exists():
+        return Epochs.load(cache)
+
+    reader = XDFIndexedReader(str(xdf_path))
+    markers = reader.load_stream(marker_stream)
+    event_times, labels = select_events(markers['time_series'], markers['time_stamps'], condition)
+    eeg = reader.load_stream(eeg_stream)
+    srate = float(eeg['info']['nominal_srate'][0]) or None
+    result = epoch(eeg['time_series'], eeg['time_stamps'], event_times, tmin, tmax, srate, baseline, labels)
+
+    if use_cache:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        result.save(cache)
+    return result
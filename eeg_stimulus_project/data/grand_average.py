@@ -0,0 +1,242 @@
+"""
+Group-level (grand-average) ERPs across subjects for every test condition.
+
+Each subject is epoched in its own worker process with epoch_session. The workers return only
+running statistics (count, mean and sum of squared deviations per channel and sample). The parent
+merges them with the parallel Welford/Chan update, so memory stays constant in the number of
+subjects and trials. For each test condition of get_test_lists the grand average is the mean of the
+subject ERPs, with a confidence band over subjects. Trial-level statistics are stored next to it.
+
+Usage:
+    python -m eeg_stimulus_project.data.grand_average [--data-dir DIR] [--output-dir DIR]
+        [--markers image] [--tmin -0.2] [--tmax 0.8] [--workers N] [--confidence 0.95]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from statistics import NormalDist
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.config import config
+from eeg_stimulus_project.data.epoching import epoch_session
+
+
+def default_conditions():
+    """Return the passive and Stroop test names (the same lists main.get_test_lists uses)."""
+    return (list(config.get('experiment.test_types.passive', []))
+            + list(config.get('experiment.test_types.stroop', [])))
+
+
+class RunningStats:
+    """
+    Streaming mean and variance of equally shaped arrays (Welford, with Chan et al.'s merge step).
+
+    Only the count, the running mean and the sum of squared deviations (M2) are kept.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = None
+        self.m2 = None
+
+    def update(self, value):
+        """Add a single observation."""
+        value = np.asarray(value, dtype=np.float64)
+        if self.mean is None:
+            self.mean = np.zeros_like(value)
+            self.m2 = np.zeros_like(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def update_batch(self, values):
+        """Add a batch of observations stacked along the first axis."""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        batch = RunningStats()
+        batch.count = len(values)
+        batch.mean = values.mean(axis=0)
+        batch.m2 = ((values - batch.mean) ** 2).sum(axis=0)
+        self.merge(batch)
+
+    def merge(self, other):
+        """Combine another RunningStats into this one."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean.copy(), other.m2.copy()
+            return
+        if other.mean.shape != self.mean.shape:
+            raise ValueError(f"Cannot merge statistics of shape {other.mean.shape} into {self.mean.shape}")
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.count / total)
+        self.m2 = self.m2 + other.m2 + delta ** 2 * (self.count * other.count / total)
+        self.count = total
+
+    def variance(self, ddof=1):
+        if self.count <= ddof:
+            return np.full_like(self.mean, np.nan)
+        return self.m2 / (self.count - ddof)
+
+    def std(self, ddof=1):
+        return np.sqrt(self.variance(ddof))
+
+    def sem(self):
+        return self.std() / np.sqrt(self.count)
+
+    def confidence_band(self, confidence=0.95):
+        """Return (lower, upper) of the normal-approximation confidence interval of the mean."""
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        half_width = z * self.sem()
+        return self.mean - half_width, self.mean + half_width
+
+
+def subject_statistics(subject_dir, conditions, markers="image", tmin=-0.2, tmax=0.8, baseline=(None, 0.0),
+                       use_cache=True):
+    """
+    Epoch every recording of one subject; runs in a worker process.
+
+    :param subject_dir: A saved_data/subject_<id> directory.
+    :param conditions: Test names to look for below subject_dir/test_*/.
+    :param markers: Marker condition passed to epoch_session (a key of MARKER_PATTERNS or a regex).
+    :return: Dict mapping each condition with data to (trial RunningStats, epoch times).
+    """
+    results = {}
+    for condition in conditions:
+        stats = RunningStats()
+        times = None
+        for xdf_path in sorted(Path(subject_dir).glob(f"test_*/{condition}/*.xdf")):
+            try:
+                epochs = epoch_session(xdf_path, markers, tmin=tmin, tmax=tmax, baseline=baseline,
+                                       use_cache=use_cache)
+                stats.update_batch(epochs.data)
+            except Exception as e:
+                print(f"Skipping {xdf_path}: {e}")
+                continue
+            times = epochs.times
+        if stats.count:
+            results[condition] = (stats, times)
+    return results
+
+
+def _safe_name(name):
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", name).strip("_")
+
+
+def grand_average(data_dir=None, output_dir=None, conditions=None, markers="image", tmin=-0.2, tmax=0.8,
+                  baseline=(None, 0.0), workers=None, confidence=0.95, use_cache=True):
+    """
+    Compute the grand-average ERP of every condition across all subjects.
+
+    :param data_dir: The saved_data directory (defaults to paths.data_directory).
+    :param output_dir: Where to write one .npz per condition and summary.json (None to skip writing).
+    :param conditions: Test names to average (defaults to default_conditions()).
+    :param workers: Worker processes (defaults to the number of CPUs).
+    :param confidence: Confidence level of the band over subjects.
+    :return: Dict mapping condition to a dict with times, mean, lower, upper, std, n_subjects,
+             n_trials, trial_mean and trial_std.
+    """
+    data_dir = Path(data_dir) if data_dir else config.get_absolute_path('paths.data_directory')
+    conditions = list(conditions) if conditions is not None else default_conditions()
+    subject_dirs = sorted(path for path in data_dir.glob("subject_*") if path.is_dir())
+
+    subject_level = {condition: RunningStats() for condition in conditions}
+    trial_level = {condition: RunningStats() for condition in conditions}
+    condition_times = {}
+    if subject_dirs:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = {
+                pool.submit(subject_statistics, str(path), conditions, markers, tmin, tmax, baseline, use_cache): path.name
+                for path in subject_dirs
+            }
+            # Reduce each subject as soon as it finishes; nothing per-subject is kept afterwards
+            for future in as_completed(futures):
+                try:
+                    per_condition = future.result()
+                except Exception as e:
+                    print(f"Failed to process {futures[future]}: {e}")
+                    continue
+                for condition, (stats, times) in per_condition.items():
+                    expected = subject_level[condition].mean
+                    if expected is not None and expected.shape != stats.mean.shape:
+                        print(f"Skipping {futures[future]} for {condition}: epoch shape {stats.mean.shape} "
+                              f"differs from {expected.shape}")
+                        continue
+                    subject_level[condition].update(stats.mean)
+                    trial_level[condition].merge(stats)
+                    condition_times.setdefault(condition, times)
+
+    results = {}
+    for condition in conditions:
+        subjects, trials = subject_level[condition], trial_level[condition]
+        if not subjects.count:
+            continue
+        lower, upper = subjects.confidence_band(confidence)
+        results[condition] = {
+            'times': condition_times[condition],
+            'mean': subjects.mean,
+            'lower': lower,
+            'upper': upper,
+            'std': subjects.std(),
+            'n_subjects': subjects.count,
+            'n_trials': trials.count,
+            'trial_mean': trials.mean,
+            'trial_std': trials.std(),
+        }
+
+    if output_dir is not None:
+        save_results(results, output_dir, {'markers': markers, 'tmin': tmin, 'tmax': tmax, 'confidence': confidence})
+    return results
+
+
+def save_results(results, output_dir, params):
+    """Write one .npz per condition plus a summary.json describing them."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    summary = {'params': params, 'conditions': {}}
+    for condition, result in results.items():
+        filename = f"{_safe_name(condition)}.npz"
+        np.savez(output_dir / filename, **result)
+        summary['conditions'][condition] = {
+            'file': filename,
+            'n_subjects': result['n_subjects'],
+            'n_trials': result['n_trials'],
+        }
+    with open(output_dir / "summary.json", 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+
+
+def main(argv=None):
+    data_dir = config.get_absolute_path('paths.data_directory')
+    parser = argparse.ArgumentParser(description="Compute grand-average ERPs across subjects for every test condition.")
+    parser.add_argument("--data-dir", default=str(data_dir), help="saved_data directory to walk")
+    parser.add_argument("--output-dir", default=None, help="output directory (default: <data-dir>/grand_average)")
+    parser.add_argument("--markers", default="image", help="marker condition to epoch around")
+    parser.add_argument("--tmin", type=float, default=-0.2, help="epoch start in seconds")
+    parser.add_argument("--tmax", type=float, default=0.8, help="epoch end in seconds")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--confidence", type=float, default=0.95, help="confidence level of the band")
+    args = parser.parse_args(argv)
+    output_dir = args.output_dir or os.path.join(args.data_dir, "grand_average")
+    results = grand_average(args.data_dir, output_dir, markers=args.markers, tmin=args.tmin, tmax=args.tmax,
+                            workers=args.workers, confidence=args.confidence)
+    for condition, result in results.items():
+        print(f"{condition}: {result['n_subjects']} subjects, {result['n_trials']} trials")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+Reaction-time capture on the LSL clock.
+
+Stimulus onsets are taken when the widget showing the stimulus is painted, and responses from the
+key event's own timestamp (QKeyEvent.timestamp(), mapped onto the LSL clock) or, for keys caught by
+the global pynput listener, from the moment the OS hook fired. Reaction times are computed in one
+vectorized pass when the test ends, on the same clock as the LSL marker timestamps, and saved next
+to data.csv. Key event timestamps only have the resolution of the windowing system's event clock
+(the 10-16 ms system tick on Windows); the source column tells which clock each response used.
+"""
+
+import csv
+import os
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+from PyQt5.QtCore import QEvent, QObject
+from pylsl import local_clock
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.config import config
+
+RT_COLUMNS = ['trial', 'key', 'source', 'onset_kind', 'onset_time', 'response_time', 'rt_ms', 'rt_from_image_ms']
+
+
+class EventClockMapper:
+    """
+    Maps millisecond event timestamps of the windowing system onto the LSL clock.
+
+    The offset between the two clocks is estimated as the smallest (delivery time - event time) seen,
+    i.e. from the event that reached the application fastest. map() uses the events seen so far, so
+    it is only a live estimate; remap() applies the offset of a whole session at once.
+    """
+
+    def __init__(self):
+        self.offset = None
+
+    def map(self, event_ms, received=None):
+        received = local_clock() if received is None else received
+        offset = received - event_ms / 1000.0
+        if self.offset is None or offset < self.offset:
+            self.offset = offset
+        return event_ms / 1000.0 + self.offset
+
+    @staticmethod
+    def remap(event_ms, received):
+        """Map arrays of event timestamps (ms) with the smallest offset among all of them."""
+        event_times = np.asarray(event_ms, dtype=np.float64) / 1000.0
+        return event_times + np.min(np.asarray(received, dtype=np.float64) - event_times)
+
+
+class _PaintProbe(QObject):
+    """Records the time of the next paint event of a widget, then removes itself."""
+
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self.widget = widget
+        self.callback = callback
+        self.pending = True
+        widget.installEventFilter(self)
+
+    def eventFilter(self, source, event):
+        if self.pending and event.type() == QEvent.Paint:
+            self.cancel()
+            self.callback(local_clock())
+        return False
+
+    def cancel(self):
+        self.pending = False
+        self.widget.removeEventFilter(self)
+        self.deleteLater()
+
+
+class ReactionTimeRecorder:
+    """
+    Collects stimulus onsets and key responses during a test.
+
+    :param prompt_kind: Onset kind reaction times are measured from ('prompt': the response instructions).
+    """
+
+    def __init__(self, prompt_kind='prompt'):
+        self.prompt_kind = prompt_kind
+        self.clock = EventClockMapper()
+        self.onsets = []      # (trial, kind, time, source)
+        self.responses = []   # (trial, key, time, source); 'qt' times are live estimates until compute()
+        self.qt_stamps = []   # (index into responses, event timestamp in ms, receive time) of 'qt' responses
+        self.global_keys = []  # (key, time), from the pynput listener thread
+        self._consumed_global = 0
+        self._probes = {}  # id(widget) -> the widget's latest _PaintProbe
+        self._lock = threading.Lock()
+
+    def mark_onset(self, trial, kind, widget=None):
+        """
+        Record a stimulus onset: at the next paint of widget, or now if no widget is given.
+
+        Call it after the widget's content is set. A widget has one pending probe at most: an onset
+        whose paint has not happened yet is replaced, so one paint never counts for two stimuli.
+        """
+        if widget is None:
+            self._add_onset(trial, kind, local_clock(), 'call')
+            return
+        previous = self._probes.get(id(widget))
+        if previous is not None and previous.widget is widget and previous.pending:
+            previous.cancel()
+        self._probes[id(widget)] = _PaintProbe(widget, lambda t: self._add_onset(trial, kind, t, 'paint'))
+
+    def _add_onset(self, trial, kind, t, source):
+        with self._lock:
+            self.onsets.append((trial, kind, t, source))
+
+    def global_key(self, key):
+        """Record a key seen by the global listener; call it first thing in the listener callback."""
+        t = local_clock()
+        with self._lock:
+            self.global_keys.append((key, t))
+        return t
+
+    def key_event(self, trial, key, event=None):
+        """
+        Record a response from a Qt key event.
+
+        Events posted by the global listener carry no timestamp; they take the time of the
+        matching global key instead.
+
+        :return: The response time on the LSL clock (for Qt timestamps, mapped with the offset known so far).
+        """
+        received = local_clock()
+        timestamp = event.timestamp() if event is not None else 0
+        with self._lock:
+            if timestamp:
+                t, source = self.clock.map(timestamp, received), 'qt'
+                self.qt_stamps.append((len(self.responses), timestamp, received))
+            else:
+                t, source = self._take_global(key, received)
+            self.responses.append((trial, key, t, source))
+        return t
+
+    def _take_global(self, key, received):
+        window = config.get('data.reaction_time.global_match_window', 1.0)
+        for index in range(len(self.global_keys) - 1, self._consumed_global - 1, -1):
+            global_key, t = self.global_keys[index]
+            if global_key == key and 0 <= received - t <= window:
+                self._consumed_global = index + 1
+                return t, 'global'
+        return received, 'delivery'
+
+    def compute(self):
+        """
+        Reaction time of every response, from the latest prompt onset and the latest image onset before it.
+        Qt event timestamps are mapped here with the clock offset of the whole session, so every trial
+        uses the same offset.
+
+        :return: Dict of numpy columns named as RT_COLUMNS (NaN where there is no preceding onset).
+        """
+        with self._lock:
+            onsets, responses, qt_stamps = list(self.onsets), list(self.responses), list(self.qt_stamps)
+        trials = np.array([r[0] for r in responses], dtype=np.int64)
+        response_times = np.array([r[2] for r in responses], dtype=np.float64)
+        if qt_stamps:
+            index, event_ms, received = (np.array(column) for column in zip(*qt_stamps))
+            response_times[index] = self.clock.remap(event_ms, received)
+
+        def latest_before(kind):
+            times = np.sort(np.array([o[2] for o in onsets if o[1] == kind], dtype=np.float64))
+            if not len(times) or not len(response_times):
+                return np.full(len(response_times), np.nan)
+            index = np.searchsorted(times, response_times, side='right') - 1
+            return np.where(index >= 0, times[np.clip(index, 0, None)], np.nan)
+
+        prompt = latest_before(self.prompt_kind)
+        image = latest_before('image')
+        return {
+            'trial': trials,
+            'key': np.array([r[1] for r in responses], dtype=object),
+            'source': np.array([r[3] for r in responses], dtype=object),
+            'onset_kind': np.full(len(responses), self.prompt_kind, dtype=object),
+            'onset_time': prompt,
+            'response_time': response_times,
+            'rt_ms': (response_times - prompt) * 1000.0,
+            'rt_from_image_ms': (response_times - image) * 1000.0,
+        }
+
+    def save(self, path):
+        """Write the reaction times to a CSV file (atomically); returns the number of rows."""
+        columns = self.compute()
+        rows = len(columns['trial'])
+        temp_path = str(path) + '.tmp'
+        with open(temp_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(RT_COLUMNS)
+            for i in range(rows):
+                writer.writerow([int(columns['trial'][i]), columns['key'][i], columns['source'][i], columns['onset_kind'][i],
+                                 f"{columns['onset_time'][i]:.6f}", f"{columns['response_time'][i]:.6f}",
+                                 f"{columns['rt_ms'][i]:.3f}", f"{columns['rt_from_image_ms'][i]:.3f}"])
+        os.replace(temp_path, path)
+        return rows
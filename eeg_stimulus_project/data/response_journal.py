@@ -0,0 +1,171 @@
+"""
+Write-ahead journal of participant responses and trial transitions.
+
+Every trial onset, response, craving rating and block transition is appended to
+<base_dir>/<test>/responses.wal (JSON lines) as it happens. Appends only reach the OS page
+cache on the stimulus thread; a background thread fsyncs at most every fsync_interval seconds.
+After a crash the last unfinished block can be restored with resume_state().
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+from pylsl import local_clock
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.config import config
+
+JOURNAL_NAME = 'responses.wal'
+
+
+class ResponseJournal:
+    """
+    Append-only response journal of one test.
+
+    :param path: Journal file; appended to if it exists.
+    :param fsync_interval: Seconds between fsyncs of pending writes.
+    """
+
+    def __init__(self, path, fsync_interval=None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync_interval = config.get('data.response_journal.fsync_interval', 0.25) if fsync_interval is None else fsync_interval
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._closed = False
+        self.syncs = 0
+        self._thread = threading.Thread(target=self._sync_loop, daemon=True, name="ResponseJournal")
+        self._thread.start()
+
+    @classmethod
+    def for_test(cls, base_dir, test_name):
+        return cls(Path(base_dir) / test_name / JOURNAL_NAME)
+
+    def record(self, event, **fields):
+        """Append one record; returns immediately, durability follows within fsync_interval."""
+        entry = {'event': event, 't': local_clock(), 'wall': time.time()}
+        entry.update(fields)
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            if self._closed:
+                return
+            self._file.write(line)
+            self._file.flush()
+        self._dirty.set()
+
+    def sync(self):
+        """fsync everything appended so far; record() is not blocked while the disk catches up."""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._dirty.clear()
+            fd = self._file.fileno()
+        os.fsync(fd)
+        self.syncs += 1
+
+    def _sync_loop(self):
+        while True:
+            self._dirty.wait()
+            if self._closed:
+                return
+            try:
+                self.sync()
+            except OSError as e:
+                print(f"ResponseJournal: fsync failed: {e}", file=sys.stderr)
+            time.sleep(self.fsync_interval)
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._dirty.set()
+        self._thread.join()
+        self.sync()
+        with self._lock:
+            self._file.close()
+
+
+def read_journal(path):
+    """Records of a journal file; a torn last line from a crash is skipped."""
+    records = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def block_state(records):
+    """
+    Replay the records of the last block.
+
+    :return: Dict with test, order, trial_index (last trial shown, -1 before the first), answered
+             (indices of trials with a response), user_inputs, elapsed_time, cravings, elapsed
+             (last known timer value) and finished; None if no block was started.
+    """
+    starts = [i for i, record in enumerate(records) if record['event'] == 'block_start']
+    if not starts:
+        return None
+    start = records[starts[-1]]
+    state = {'test': start.get('test'), 'order': start.get('order', []), 'trial_index': -1, 'answered': set(),
+             'user_inputs': [], 'elapsed_time': [], 'cravings': [], 'elapsed': 0, 'finished': False}
+    for record in records[starts[-1] + 1:]:
+        event = record['event']
+        if event == 'trial':
+            state['trial_index'] = record['index']
+            state['elapsed'] = record.get('elapsed', state['elapsed'])
+        elif event == 'response':
+            state['answered'].add(record.get('index'))
+            state['user_inputs'].append(record['input'])
+            state['elapsed_time'].append(record['elapsed'])
+            state['elapsed'] = record['elapsed']
+        elif event == 'craving':
+            state['cravings'].append({'index': record['index'], 'rating': record['rating']})
+        elif event in ('block_end', 'stopped'):
+            state['finished'] = True
+    return state
+
+
+def resume_state(base_dir, test_name):
+    """
+    State of the last block of a test if it was interrupted (started, never ended or stopped), else None.
+    state['resume_index'] is the first trial to show again: the last one shown unless it was answered.
+    """
+    if not base_dir or not config.get('data.response_journal.resume', True):
+        return None
+    state = block_state(read_journal(Path(base_dir) / test_name / JOURNAL_NAME))
+    if state is None or state['finished'] or state['trial_index'] < 0:
+        return None
+    state['resume_index'] = state['trial_index'] + (1 if state['trial_index'] in state['answered'] else 0)
+    return state
+
+
+def restore_order(assets, order, name=lambda asset: os.path.basename(getattr(asset, 'filename', '') or '')):
+    """
+    Put freshly loaded assets back into a journaled order (the block may have been randomized).
+
+    :return: Reordered list, or None if the assets do not match the journaled names.
+    """
+    pool = {}
+    for asset in assets:
+        pool.setdefault(name(asset), []).append(asset)
+    restored = []
+    for asset_name in order:
+        if not pool.get(asset_name):
+            return None
+        restored.append(pool[asset_name].pop(0))
+    return restored if len(restored) == len(assets) else None
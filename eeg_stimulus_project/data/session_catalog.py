@@ -0,0 +1,211 @@
+"""
+SQLite catalog of the recordings below saved_data.
+
+The catalog mirrors the layout created by main.create_data_dirs
+(saved_data/subject_<id>/test_<n>/<test name>/) and stores, per XDF or CSV file, the subject,
+test number, condition, size, hash, duration and sample/marker counts, plus one row per XDF stream
+with its dropped-sample estimate. Files are only re-read when their size or modification time
+changed, so updating after every test is cheap and queries never touch the recordings.
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.config import config
+from eeg_stimulus_project.utils.xdf_file_handler import XDFIndexedReader
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    subject TEXT,
+    test_number TEXT,
+    condition TEXT,
+    kind TEXT,
+    size INTEGER,
+    mtime_ns INTEGER,
+    sha256 TEXT,
+    duration REAL,
+    sample_count INTEGER,
+    marker_count INTEGER,
+    dropped_samples INTEGER,
+    indexed_at REAL
+);
+CREATE TABLE IF NOT EXISTS streams (
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    name TEXT,
+    type TEXT,
+    channel_count INTEGER,
+    nominal_srate REAL,
+    sample_count INTEGER,
+    duration REAL,
+    dropped_samples INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_lookup ON sessions (subject, test_number, condition);
+CREATE INDEX IF NOT EXISTS idx_streams_session ON streams (session_id);
+"""
+
+
+def _sha256(path, block_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _describe_xdf(path):
+    """Return (duration, sample_count, marker_count, dropped_samples, stream_rows) for an XDF file."""
+    reader = XDFIndexedReader(str(path))
+    rows = []
+    sample_count = marker_count = dropped_total = 0
+    duration = 0.0
+    for sid, entry in reader.index['streams'].items():
+        info = entry['info']
+        count = entry['sample_count']
+        footer = entry.get('footer') or {}
+        if 'first_timestamp' in footer and 'last_timestamp' in footer:
+            first, last = footer['first_timestamp'], footer['last_timestamp']
+        elif count:
+            stamps = reader.load_stream(sid, synchronize_clocks=False)['time_stamps']
+            first, last = float(np.min(stamps)), float(np.max(stamps))
+        else:
+            first = last = 0.0
+        stream_duration = max(0.0, last - first)
+        dropped = None
+        if info['nominal_srate'] > 0 and count:
+            expected = int(round(stream_duration * info['nominal_srate'])) + 1
+            dropped = max(0, expected - count)
+            dropped_total += dropped
+            sample_count += count
+        else:
+            marker_count += count
+        duration = max(duration, stream_duration)
+        rows.append((info['name'], info['type'], info['channel_count'], info['nominal_srate'], count, stream_duration, dropped))
+    return duration, sample_count, marker_count, dropped_total, rows
+
+
+def _describe_csv(path):
+    """Return (duration, sample_count, marker_count, dropped_samples, stream_rows) for one of our CSV files."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        rows = max(0, sum(1 for _ in f) - 1)
+    return None, rows, None, None, []
+
+
+class SessionCatalog:
+    """
+    Incrementally updated index of saved recordings.
+
+    :param db_path: SQLite file (defaults to <data_dir>/catalog.sqlite).
+    :param data_dir: The saved_data directory (defaults to paths.data_directory).
+    """
+
+    def __init__(self, db_path=None, data_dir=None):
+        self.data_dir = Path(data_dir) if data_dir else config.get_absolute_path('paths.data_directory')
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(db_path or self.data_dir / "catalog.sqlite")
+        self.conn = sqlite3.connect(self.db_path, timeout=10)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def _recordings(self, root):
+        root = Path(root)
+        for path in sorted(root.rglob("*")):
+            if path.is_file() and path.suffix.lower() in (".xdf", ".csv"):
+                yield path
+
+    def _parse_location(self, path):
+        # subject_<id>/test_<n>/<test name>/<file>
+        try:
+            parts = Path(path).resolve().relative_to(self.data_dir.resolve()).parts
+        except ValueError:
+            return None, None, None
+        subject = parts[0][len("subject_"):] if len(parts) > 0 and parts[0].startswith("subject_") else None
+        test_number = parts[1][len("test_"):] if len(parts) > 1 and parts[1].startswith("test_") else None
+        condition = parts[2] if len(parts) > 3 else None
+        return subject, test_number, condition
+
+    def update(self, root=None):
+        """
+        Add or refresh every recording below root (defaults to the whole data directory).
+
+        :return: Number of files that were (re)indexed.
+        """
+        root = Path(root) if root else self.data_dir
+        updated = 0
+        for path in self._recordings(root):
+            # Only files inside the subject_*/test_* layout (skips e.g. converted outputs)
+            if self._parse_location(path)[0] is None:
+                continue
+            if self.update_file(path):
+                updated += 1
+        return updated
+
+    def update_file(self, path):
+        """Index one file if it is new or changed; returns True when the catalog was modified."""
+        path = Path(path).resolve()
+        stat = path.stat()
+        row = self.conn.execute("SELECT id, size, mtime_ns FROM sessions WHERE path = ?", (str(path),)).fetchone()
+        if row is not None and row['size'] == stat.st_size and row['mtime_ns'] == stat.st_mtime_ns:
+            return False
+        try:
+            if path.suffix.lower() == ".xdf":
+                duration, samples, markers, dropped, stream_rows = _describe_xdf(path)
+            else:
+                duration, samples, markers, dropped, stream_rows = _describe_csv(path)
+        except Exception as e:
+            print(f"Could not catalog {path}: {e}")
+            return False
+        subject, test_number, condition = self._parse_location(path)
+        with self.conn:
+            if row is not None:
+                self.conn.execute("DELETE FROM sessions WHERE id = ?", (row['id'],))
+            cursor = self.conn.execute(
+                "INSERT INTO sessions (path, subject, test_number, condition, kind, size, mtime_ns, sha256, duration,"
+                " sample_count, marker_count, dropped_samples, indexed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (str(path), subject, test_number, condition, path.suffix.lower().lstrip("."), stat.st_size,
+                 stat.st_mtime_ns, _sha256(path), duration, samples, markers, dropped, time.time())
+            )
+            self.conn.executemany(
+                "INSERT INTO streams (session_id, name, type, channel_count, nominal_srate, sample_count, duration,"
+                " dropped_samples) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(cursor.lastrowid,) + stream for stream in stream_rows]
+            )
+        return True
+
+    def remove_missing(self):
+        """Drop catalog entries whose files no longer exist; returns how many were removed."""
+        missing = [row['id'] for row in self.conn.execute("SELECT id, path FROM sessions") if not os.path.exists(row['path'])]
+        with self.conn:
+            self.conn.executemany("DELETE FROM sessions WHERE id = ?", [(i,) for i in missing])
+        return len(missing)
+
+    def query(self, subject=None, test_number=None, condition=None, kind=None):
+        """Return the matching sessions as dicts, ordered by subject, test and condition."""
+        clauses, params = [], []
+        for column, value in (('subject', subject), ('test_number', test_number), ('condition', condition), ('kind', kind)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(str(value))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(f"SELECT * FROM sessions{where} ORDER BY subject, test_number, condition, path", params)
+        return [dict(row) for row in rows]
+
+    def streams(self, session_id):
+        """Return the per-stream rows of one session."""
+        return [dict(row) for row in self.conn.execute("SELECT * FROM streams WHERE session_id = ?", (session_id,))]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,310 @@
+"""
+In-process XDF recorder, an alternative to the external LabRecorder application.
+
+Every recorded LSL stream gets its own thread that pulls chunks from an inlet and appends them to
+the file as Samples chunks, together with periodic ClockOffset chunks. A Boundary chunk is written
+at a fixed interval so readers can resynchronize on damaged files, and each stream ends with a
+StreamFooter. The resulting file can be read by pyxdf and any other XDF reader.
+"""
+
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.config import config
+
+# XDF chunk tags
+TAG_FILE_HEADER = 1
+TAG_STREAM_HEADER = 2
+TAG_SAMPLES = 3
+TAG_CLOCK_OFFSET = 4
+TAG_BOUNDARY = 5
+TAG_STREAM_FOOTER = 6
+
+BOUNDARY_UUID = bytes([0x43, 0xA5, 0x46, 0xDC, 0xCB, 0xF5, 0x41, 0x0F, 0xB3, 0x0E, 0xD5, 0x46, 0x73, 0x83, 0xCB, 0xE4])
+
+# numpy dtypes for the numeric LSL channel formats
+NUMERIC_FORMATS = {
+    'float32': '<f4',
+    'double64': '<f8',
+    'int8': '<i1',
+    'int16': '<i2',
+    'int32': '<i4',
+    'int64': '<i8',
+}
+
+
+def encode_varlen(value):
+    """Encode an XDF variable-length integer (length byte followed by 1, 4 or 8 bytes)."""
+    if value < 256:
+        return struct.pack('<BB', 1, value)
+    if value < 2 ** 32:
+        return struct.pack('<BI', 4, value)
+    return struct.pack('<BQ', 8, value)
+
+
+def encode_samples(timestamps, samples, channel_format):
+    """
+    Encode the body of a Samples chunk (everything after the stream id).
+
+    :param timestamps: Sequence of sample timestamps.
+    :param samples: Sequence of samples, each a sequence with one value per channel.
+    :param channel_format: LSL channel format name (e.g. 'float32', 'string').
+    """
+    count = len(timestamps)
+    header = encode_varlen(count)
+    if channel_format in NUMERIC_FORMATS:
+        values = np.asarray(samples, dtype=NUMERIC_FORMATS[channel_format])
+        if values.ndim == 1:
+            values = values.reshape(count, -1)
+        record = np.empty(count, dtype=[('tsb', 'u1'), ('ts', '<f8'), ('values', values.dtype, (values.shape[1],))])
+        record['tsb'] = 8
+        record['ts'] = timestamps
+        record['values'] = values
+        return header + record.tobytes()
+
+    parts = [header]
+    for timestamp, sample in zip(timestamps, samples):
+        parts.append(struct.pack('<Bd', 8, timestamp))
+        for value in sample:
+            data = str(value).encode('utf-8')
+            parts.append(encode_varlen(len(data)))
+            parts.append(data)
+    return b"".join(parts)
+
+
+class XDFWriter:
+    """
+    Appends XDF chunks to a file. Safe to call from several threads.
+
+    :param path: Output .xdf path; the file is created (or truncated) and the file header written.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'wb', buffering=1024 * 1024)
+        self.bytes_written = 0
+        self._file.write(b"XDF:")
+        self.write_chunk(TAG_FILE_HEADER, b'<?xml version="1.0"?><info><version>1.0</version></info>')
+
+    def write_chunk(self, tag, content, stream_id=None):
+        body = struct.pack('<H', tag)
+        if stream_id is not None:
+            body += struct.pack('<I', stream_id)
+        body += content
+        data = encode_varlen(len(body)) + body
+        with self._lock:
+            self._file.write(data)
+            self.bytes_written += len(data)
+
+    def write_stream_header(self, stream_id, xml):
+        self.write_chunk(TAG_STREAM_HEADER, xml.encode('utf-8'), stream_id)
+
+    def write_samples(self, stream_id, timestamps, samples, channel_format):
+        if len(timestamps):
+            self.write_chunk(TAG_SAMPLES, encode_samples(timestamps, samples, channel_format), stream_id)
+
+    def write_clock_offset(self, stream_id, collection_time, offset):
+        self.write_chunk(TAG_CLOCK_OFFSET, struct.pack('<dd', collection_time, offset), stream_id)
+
+    def write_boundary(self):
+        self.write_chunk(TAG_BOUNDARY, BOUNDARY_UUID)
+
+    def write_stream_footer(self, stream_id, first_timestamp, last_timestamp, sample_count, clock_offsets):
+        offsets = "".join(f"<offset><time>{t!r}</time><value>{v!r}</value></offset>" for t, v in clock_offsets)
+        xml = ('<?xml version="1.0"?><info>'
+               f'<first_timestamp>{first_timestamp!r}</first_timestamp>'
+               f'<last_timestamp>{last_timestamp!r}</last_timestamp>'
+               f'<sample_count>{sample_count}</sample_count>'
+               f'<clock_offsets>{offsets}</clock_offsets></info>')
+        self.write_chunk(TAG_STREAM_FOOTER, xml.encode('utf-8'), stream_id)
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class StreamRecorder(threading.Thread):
+    """
+    Pulls one LSL stream in chunks and writes it to an XDFWriter.
+
+    :param stream_id: XDF stream id (unique within the file).
+    :param inlet: pylsl StreamInlet (or anything with pull_chunk/time_correction/info).
+    :param clock_offset_interval: Seconds between ClockOffset chunks.
+    """
+
+    def __init__(self, writer, stream_id, inlet, clock_offset_interval=5.0, pull_timeout=0.2, max_samples=4096):
+        super().__init__(daemon=True, name=f"XDFStream{stream_id}")
+        self.writer = writer
+        self.stream_id = stream_id
+        self.inlet = inlet
+        self.clock_offset_interval = clock_offset_interval
+        self.pull_timeout = pull_timeout
+        self.max_samples = max_samples
+        info = inlet.info()
+        self.name = info.name()
+        self.channel_format = _channel_format_name(info)
+        self.header_xml = info.as_xml()
+        self.sample_count = 0
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.clock_offsets = []
+        self._stop_event = threading.Event()
+
+    def _record_clock_offset(self):
+        from pylsl import local_clock
+        now = local_clock()
+        try:
+            offset = self.inlet.time_correction(timeout=1.0)
+        except Exception as e:
+            print(f"Clock offset for stream {self.name} unavailable: {e}")
+            return
+        # Like LabRecorder: the collection time is on the sender's clock (local time minus the offset)
+        collection_time = now - offset
+        self.clock_offsets.append((collection_time, offset))
+        self.writer.write_clock_offset(self.stream_id, collection_time, offset)
+
+    def run(self):
+        self.writer.write_stream_header(self.stream_id, self.header_xml)
+        next_offset = 0.0
+        while not self._stop_event.is_set():
+            now = time.monotonic()
+            if now >= next_offset:
+                self._record_clock_offset()
+                next_offset = now + self.clock_offset_interval
+            self._pull()
+        # Collect whatever is still buffered in the inlet
+        while self._pull(timeout=0.0):
+            pass
+        self._record_clock_offset()
+        self.writer.write_stream_footer(self.stream_id, self.first_timestamp or 0.0, self.last_timestamp or 0.0,
+                                        self.sample_count, self.clock_offsets)
+
+    def _pull(self, timeout=None):
+        try:
+            samples, timestamps = self.inlet.pull_chunk(timeout=self.pull_timeout if timeout is None else timeout,
+                                                        max_samples=self.max_samples)
+        except Exception as e:
+            print(f"Error pulling stream {self.name}: {e}")
+            self._stop_event.wait(self.pull_timeout)
+            return 0
+        if not timestamps:
+            return 0
+        self.writer.write_samples(self.stream_id, timestamps, samples, self.channel_format)
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamps[0]
+        self.last_timestamp = timestamps[-1]
+        self.sample_count += len(timestamps)
+        return len(timestamps)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+def _channel_format_name(info):
+    from pylsl import cf_string, cf_float32, cf_double64, cf_int8, cf_int16, cf_int32, cf_int64
+    formats = {cf_float32: 'float32', cf_double64: 'double64', cf_string: 'string',
+               cf_int8: 'int8', cf_int16: 'int16', cf_int32: 'int32', cf_int64: 'int64'}
+    return formats.get(info.channel_format(), 'float32')
+
+
+class XDFRecorder:
+    """
+    Records LSL streams to an XDF file without LabRecorder.
+
+    :param path: Output .xdf path.
+    :param stream_names: Names of the streams to record (defaults to data.xdf_recorder.streams;
+                         an empty list records every stream found).
+    """
+
+    def __init__(self, path, stream_names=None, resolve_timeout=None, clock_offset_interval=None, boundary_interval=None):
+        settings = config.get('data.xdf_recorder', {})
+        self.path = str(path)
+        self.stream_names = list(settings.get('streams', []) if stream_names is None else stream_names)
+        self.resolve_timeout = resolve_timeout if resolve_timeout is not None else settings.get('resolve_timeout', 2.0)
+        self.clock_offset_interval = clock_offset_interval or settings.get('clock_offset_interval', 5.0)
+        self.boundary_interval = boundary_interval or settings.get('boundary_interval', 10.0)
+        self.writer = None
+        self.recorders = []
+        self.started_at = None
+        self._stop_event = threading.Event()
+        self._boundary_thread = None
+
+    def start(self, stream_infos=None):
+        """
+        Resolve the streams and start recording.
+
+        :param stream_infos: pylsl StreamInfo objects to record (resolved on the network when omitted).
+        :return: Names of the streams being recorded.
+        """
+        from pylsl import StreamInlet, resolve_streams
+        if stream_infos is None:
+            stream_infos = resolve_streams(wait_time=self.resolve_timeout)
+            if self.stream_names:
+                stream_infos = [info for info in stream_infos if info.name() in self.stream_names]
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.writer = XDFWriter(self.path)
+        self.started_at = time.monotonic()
+        for stream_id, info in enumerate(stream_infos, start=1):
+            inlet = StreamInlet(info, max_buflen=360, recover=True)
+            self.add_inlet(inlet, stream_id)
+        self._stop_event.clear()
+        self._boundary_thread = threading.Thread(target=self._write_boundaries, daemon=True)
+        self._boundary_thread.start()
+        names = [recorder.name for recorder in self.recorders]
+        print(f"XDF recorder writing {', '.join(names) or 'no streams'} to {self.path}")
+        return names
+
+    def add_inlet(self, inlet, stream_id=None):
+        """Start recording an already opened inlet."""
+        stream_id = stream_id or len(self.recorders) + 1
+        recorder = StreamRecorder(self.writer, stream_id, inlet, clock_offset_interval=self.clock_offset_interval)
+        self.recorders.append(recorder)
+        recorder.start()
+        return recorder
+
+    def _write_boundaries(self):
+        while not self._stop_event.wait(self.boundary_interval):
+            self.writer.write_boundary()
+            self.writer.flush()
+
+    def stop(self, timeout=5.0):
+        """Stop all stream threads, write the footers and close the file; returns throughput statistics."""
+        self._stop_event.set()
+        for recorder in self.recorders:
+            recorder.stop()
+        for recorder in self.recorders:
+            recorder.join(timeout)
+        if self._boundary_thread is not None:
+            self._boundary_thread.join(timeout)
+        stats = self.stats()
+        if self.writer is not None:
+            self.writer.close()
+        print(f"XDF recorder stopped: {stats['samples']} samples, {stats['bytes_written']} bytes in {stats['elapsed']:.1f} s")
+        return stats
+
+    def stats(self):
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        written = self.writer.bytes_written if self.writer else 0
+        return {
+            'path': self.path,
+            'streams': {recorder.name: recorder.sample_count for recorder in self.recorders},
+            'samples': sum(recorder.sample_count for recorder in self.recorders),
+            'bytes_written': written,
+            'elapsed': elapsed,
+            'bytes_per_second': written / elapsed if elapsed > 0 else 0.0,
+        }
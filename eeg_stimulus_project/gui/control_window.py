@@ -1,6 +1,6 @@
-from PyQt5.QtWidgets import QFrame, QVBoxLayout, QApplication, QMainWindow, QWidget, QLabel, QPushButton, QHBoxLayout, QTextEdit, QStackedWidget
+from PyQt5.QtWidgets import QFrame, QVBoxLayout, QApplication, QMainWindow, QWidget, QLabel, QPushButton, QHBoxLayout, QStackedWidget
 from PyQt5.QtGui import QPixmap, QFont
-from PyQt5.QtCore import Qt, QTimer, QMetaObject, pyqtSignal, QObject
+from PyQt5.QtCore import Qt, QTimer
 import sys
 import subprocess
 import time 
@@ -31,24 +31,6 @@ if platform.system() == 'Windows':
 else:
     Application = None
 
-class QTextEditLogger(logging.Handler, QObject):
-    append_text = pyqtSignal(str)
-
-    def __init__(self, text_edit):
-        logging.Handler.__init__(self)
-        QObject.__init__(self)
-        self.text_edit = text_edit
-        self.append_text.connect(self._append)
-
-    def emit(self, record):
-        msg = self.format(record)
-        self.append_text.emit(msg)
-
-    def _append(self, msg):
-        self.text_edit.moveCursor(self.text_edit.textCursor().End)
-        self.text_edit.insertPlainText(msg + '\n')
-        self.text_edit.moveCursor(self.text_edit.textCursor().End)
-
 def excepthook(type, value, tb):
     logging.info("Uncaught exception:", value)
     traceback.print_exception(type, value, tb)
@@ -56,8 +38,13 @@ def excepthook(type, value, tb):
 sys.excepthook = excepthook
 
 # Import utility modules
-from eeg_stimulus_project.utils.labrecorder import LabRecorder
-from eeg_stimulus_project.utils.pupil_labs import PupilLabs
+from eeg_stimulus_project.utils.labrecorder import LabRecorder, compose_recording_path
+from eeg_stimulus_project.data.xdf_recorder import XDFRecorder
+from eeg_stimulus_project.data.session_catalog import SessionCatalog
+from eeg_stimulus_project.gui.log_console import LogConsole
+from eeg_stimulus_project.gui.teardown import Teardown
+from eeg_stimulus_project.utils.event_journal import record_event
+from eeg_stimulus_project.utils.gui_watchdog import timed
 from eeg_stimulus_project.lsl.labels import LSLLabelStream
 
 
@@ -76,6 +63,10 @@ class ControlWindow(QMainWindow):
         self.label_stream = None
         self.labrecorder = None
         self.lab_recorder_connected = False
+        self.native_recorder = config.get('data.recorder', 'labrecorder') == 'native'
+        self.xdf_recorder = None
+        self.xdf_recorder_thread = None
+        self.teardown = None  # stop in progress (gui/teardown.py)
         self.eyetracker = None
         self.current_test = None
         self.log_queue = log_queue
@@ -248,11 +239,11 @@ class ControlWindow(QMainWindow):
         log_label.setFont(QFont("Segoe UI", 12, QFont.Bold))
         self.control_layout.addWidget(log_label)
 
-        self.log_text_edit = QTextEdit(self)
-        self.log_text_edit.setReadOnly(True)
-        self.log_text_edit.setMinimumHeight(150)
-        self.log_text_edit.setStyleSheet("""
-            QTextEdit {
+        # Ring-buffered, rate-limited log view (gui/log_console.py)
+        self.log_console = LogConsole(self)
+        self.log_console.setMinimumHeight(150)
+        self.log_console.view.setStyleSheet("""
+            QListView {
                 background-color: #fff;
                 border-radius: 10px;
                 border: 1px solid #bc85fa;
@@ -260,12 +251,12 @@ class ControlWindow(QMainWindow):
                 font-size: 26px;
             }
         """)
-        self.control_layout.addWidget(self.log_text_edit)
+        self.control_layout.addWidget(self.log_console)
 
         logger = logging.getLogger()
         #logger.handlers = []  # Remove all existing handlers
 
-        log_handler = QTextEditLogger(self.log_text_edit)
+        log_handler = self.log_console.handler()
         log_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
 
         if log_queue is not None:
@@ -337,16 +328,11 @@ class ControlWindow(QMainWindow):
             except Exception as e:
                 self.write(f"Log queue error: {e}\n")
 
-    # Append message to QTextEdit in a thread-safe way
+    # Queue a message for the log console; safe from any thread
     def write(self, msg):
-        def append():
-            self.log_text_edit.moveCursor(self.log_text_edit.textCursor().End)
-            self.log_text_edit.insertPlainText(msg)
-            self.log_text_edit.moveCursor(self.log_text_edit.textCursor().End)
-        if self.log_text_edit.thread() == QApplication.instance().thread():
-            append()
-        else:
-            QMetaObject.invokeMethod(self.log_text_edit, append(), Qt.QueuedConnection)
+        msg = msg.rstrip('\n')
+        if msg:
+            self.log_console.model.append(msg)
 
     # Start the Actichamp application and automatically link to the EEG stream.
     def start_actichamp(self):
@@ -394,6 +380,13 @@ class ControlWindow(QMainWindow):
 
     #Start the LabRecorder application.
     def start_labrecorder(self):
+        if self.native_recorder:
+            # The built-in XDF recorder needs no external application
+            self.shared_status['lab_recorder_connected'] = True
+            logging.info("Using the built-in XDF recorder.")
+            self.connection.sendall((json.dumps({"action": "labrecorder_connected"}) + "\n").encode('utf-8'))
+            self.update_app_status_icon(self.labrecorder_connected_icon, True)
+            return
         def worker():
             try:
                 # Get labrecorder path from configuration based on platform
@@ -422,27 +415,33 @@ class ControlWindow(QMainWindow):
             if self.labrecorder.s is not None:
                 self.shared_status['lab_recorder_connected'] = True
                 logging.info("Connected to LabRecorder.")
+                record_event('device', 'labrecorder', status='connected')
                 self.connection.sendall((json.dumps({"action": "labrecorder_connected"}) + "\n").encode('utf-8'))
             else:
                 raise Exception()
         except Exception:
             self.shared_status['lab_recorder_connected'] = False
+            record_event('device', 'labrecorder', status='failed')
         self.update_app_status_icon(self.labrecorder_connected_icon, self.shared_status['lab_recorder_connected'])
 
     #Connect to the Pupil Labs Eye Tracker.
     def connect_eyetracker(self):
         try:
+            # The Pupil Labs API is slow to import; only load it when an eye tracker is connected
+            from eeg_stimulus_project.utils.pupil_labs import PupilLabs
             self.eyetracker = PupilLabs()
             time.sleep(2)  # Wait for the Pupil Labs device to initialize
             if self.eyetracker.device is not None:
                 self.shared_status['eyetracker_connected'] = True
                 self.connection.sendall((json.dumps({"action": "eyetracker_connected"}) + "\n").encode('utf-8'))
                 logging.info("Connected to Eye Tracker.")
+                record_event('device', 'eyetracker', status='connected')
                 self.eyetracker.estimate_time_offset()  # Estimate time offset
             else:
                 raise Exception()
         except Exception:
             logging.info(f"Failed to connect to Eye Tracker")
+            record_event('device', 'eyetracker', status='failed')
             self.shared_status['eyetracker_connected'] = False
         self.update_app_status_icon(self.eyetracker_connected_icon, self.shared_status['eyetracker_connected'])
         
@@ -481,7 +480,7 @@ class ControlWindow(QMainWindow):
     def handle_network_log_message(self, message):
         """
         Handle a log message received from the network (client).
-        Display it in the log text widget with a prefix to identify it as from client.
+        Queue it on the log console as a client entry.
         
         Args:
             message: Dictionary containing log message data
@@ -489,26 +488,29 @@ class ControlWindow(QMainWindow):
         try:
             # Extract log information
             formatted_msg = message.get('message', '')
-            level = message.get('level', 'INFO')
-            timestamp = message.get('timestamp', '')
+            level = message.get('levelno') or logging.getLevelName(message.get('level', 'INFO'))
+            timestamp = message.get('timestamp') or None
             
-            # Add a prefix to identify this as a client log message
-            client_msg = f"[CLIENT] {formatted_msg}"
-            
-            # Create a log record and display it
-            # We'll use the existing log handler to ensure consistent formatting
-            if hasattr(self, 'log_text_edit'):
-                # Use QMetaObject to ensure thread safety when updating UI
-                QMetaObject.invokeMethod(
-                    self.log_text_edit,
-                    'append',
-                    Qt.QueuedConnection,
-                    client_msg
-                )
+            if hasattr(self, 'log_console'):
+                # The model batches entries onto the GUI thread itself
+                self.log_console.model.append(formatted_msg, level if isinstance(level, int) else logging.INFO,
+                                              'client', timestamp)
             
         except Exception as e:
             logging.error(f"Error handling network log message: {e}")
 
+    def handle_log_batch(self, message):
+        """
+        Handle a batch of client log traffic (log records and client_log messages) shipped
+        by the client's MessageChannel.
+        """
+        for entry in message.get("messages", []):
+            if entry.get("type") == "log_message":
+                self.handle_network_log_message(entry)
+            elif entry.get("action") == "client_log":
+                # The log console marks client entries itself
+                logging.info(entry.get('message', ''), extra={'source': 'client'})
+
     def host_command_listener(self):
         logging.info("Host: Listening for commands...")
         buffer = ''
@@ -521,7 +523,6 @@ class ControlWindow(QMainWindow):
                     buffer += data
                     while "\n" in buffer:
                         line, buffer = buffer.split("\n", 1)
-                        logging.info(f'Host: Received line: {repr(line)}')
                         if not line.strip():
                             continue
                         try:
@@ -534,8 +535,14 @@ class ControlWindow(QMainWindow):
                             # Handle different message types
                             msg_type = message.get("type")
                             action = message.get("action")
+                            # Log batches carry the client's own log traffic; echoing them would log it twice
+                            if msg_type != "log_batch":
+                                logging.info(f'Host: Received line: {repr(line)}')
                             
-                            if msg_type == "log_message":
+                            if msg_type == "log_batch":
+                                # Batched log records and client_log messages from the client
+                                self.handle_log_batch(message)
+                            elif msg_type == "log_message":
                                 # This is a log message from the client
                                 self.handle_network_log_message(message)
                             elif action == "start_button":
@@ -568,9 +575,9 @@ class ControlWindow(QMainWindow):
                             elif action == "client_log":
                                 # Handle log messages from client
                                 log_message = message.get("message", "")
-                                logging.info(f"[CLIENT] {log_message}")
+                                logging.info(log_message, extra={'source': 'client'})
                         except Exception as e:
-                            logging.info(f"Host: Error processing command: {e}")
+                            logging.info(f"Host: Error processing command {repr(line)}: {e}")
                             traceback.print_exc()
                 except Exception as e:
                     logging.info(f"Host: Error handling command: {e}")
@@ -604,6 +611,7 @@ class ControlWindow(QMainWindow):
                             logging.info(f"Host: Pushing label: {label}")
                             self.update_app_status_icon(self.touchbox_connected_icon, True)
                             self.shared_status['tactile_connected'] = True
+                            record_event('device', 'tactile', status='connected')
                             self.connection.sendall((json.dumps({"action": "tactile_connected"}) + "\n").encode('utf-8'))
                         if msg.get("action") == "tactile_touch":
                             label = "tactile_touch"
@@ -617,10 +625,13 @@ class ControlWindow(QMainWindow):
         threading.Thread(target=tactile_listener, daemon=True).start()
 
     def start_test(self):
+        record_event('state', 'test_started', test=self.current_test)
         if self.label_stream is None:
             self.label_stream = LSLLabelStream()
 
-        if self.labrecorder and self.labrecorder.s is not None:
+        if self.native_recorder:
+            self.start_xdf_recorder(self.current_test if self.current_test else "default_test")
+        elif self.labrecorder and self.labrecorder.s is not None:
             test_name = self.current_test if self.current_test else "default_test"
             self.labrecorder.Start_Recorder(test_name)
         else:
@@ -634,13 +645,56 @@ class ControlWindow(QMainWindow):
             logging.info("Eyetracker not connected")
 
     def stop_test(self):
-        # Stop LabRecorder if connected
-        if self.labrecorder and self.labrecorder.s is not None:
-            self.labrecorder.Stop_Recorder()
+        test_name = self.current_test if self.current_test else "default_test"
+        record_event('state', 'test_stopped', test=test_name)
+        # Stop the recorders and the eyetracker in parallel, then catalog the finished files (all off the GUI thread)
+        teardown = Teardown(f"stop {test_name}")
+        if self.xdf_recorder is not None:
+            recorder, start_thread = self.xdf_recorder, self.xdf_recorder_thread
+            self.xdf_recorder = None
+            self.xdf_recorder_thread = None
+            teardown.add_device('xdf_recorder', lambda: self.finish_xdf_recorder(recorder, start_thread))
+        elif self.labrecorder and self.labrecorder.s is not None:
+            # Resolves once the XDF file has stopped changing, so the catalog hashes the finished file
+            teardown.add_device('labrecorder', self.labrecorder.Stop_Recorder)
         # Stop the eyetracker if connected`
         if self.eyetracker and self.eyetracker.device is not None:
-            self.eyetracker.stop_recording()
+            teardown.add_device('eyetracker', self.eyetracker.stop_recording)
+        if self.base_dir:
+            teardown.add_save('session_catalog', lambda: self.update_catalog(test_name))
+        teardown.finished.connect(self.on_teardown_finished)
+        self.teardown = teardown
+        teardown.start()
+
+    def on_teardown_finished(self, report):
+        for name, step in list(report['devices'].items()) + list(report['saves'].items()):
+            if step['status'] != 'ok':
+                logging.info(f"Stopping {name} did not complete: {step['status']}")
+        self.teardown = None
+
+    def start_xdf_recorder(self, test_name):
+        # Resolving the streams takes a moment, so start in the background
+        save_dir, filename = compose_recording_path(self.base_dir, test_name, self.subject_id)
+        self.xdf_recorder = XDFRecorder(save_dir / filename)
+        self.xdf_recorder_thread = threading.Thread(target=self.xdf_recorder.start, daemon=True)
+        self.xdf_recorder_thread.start()
+
+    def finish_xdf_recorder(self, recorder, start_thread):
+        # Blocks until the recording is closed
+        start_thread.join()
+        stats = recorder.stop()
+        logging.info(f"XDF recording saved: {stats['path']} ({stats['samples']} samples)")
+
+    def update_catalog(self, test_name):
+        # Add the recordings of the finished test to the session catalog
+        catalog = SessionCatalog()
+        try:
+            updated = catalog.update(Path(self.base_dir) / test_name)
+        finally:
+            catalog.close()
+        logging.info(f"Session catalog updated ({updated} files) for {test_name}")
 
+    @timed('label_push')
     def label_push(self, label):
         """
         Push a label to the LSL stream.
@@ -13,11 +13,14 @@ from PyQt5.QtGui import QFont, QPixmap, QKeyEvent
 from PyQt5.QtCore import Qt, QTimer, QEvent, pyqtSignal, pyqtSlot
 from eeg_stimulus_project.assets.asset_handler import Display
 from eeg_stimulus_project.data.data_saving import Save_Data
+from eeg_stimulus_project.data.reaction_time import ReactionTimeRecorder
+from eeg_stimulus_project.data.response_journal import ResponseJournal, restore_order, resume_state
 from eeg_stimulus_project.lsl.labels import LSLLabelStream
-from eeg_stimulus_project.utils.pupil_labs import PupilLabs
 from eeg_stimulus_project.gui.stimulus_order_frame import CravingRatingAsset
+from eeg_stimulus_project.utils.event_journal import record_event
+from eeg_stimulus_project.utils.message_channel import channel_for
+from eeg_stimulus_project.utils.gui_watchdog import timed
 import threading
-import json
 import time
 import logging
 import random
@@ -235,6 +238,7 @@ class DisplayWindow(QMainWindow):
             if self.shared_status.get('eyetracker_connected', False):
                 # Eye tracker is connected, uses same instance of eye tracker or creates a new one if needed
                 if self.eyetracker is None or self.eyetracker.device is None:
+                    from eeg_stimulus_project.utils.pupil_labs import PupilLabs
                     self.eyetracker = PupilLabs()
                 if self.eyetracker and self.eyetracker.device is not None:
                     self.eyetracker.start_recording()
@@ -251,6 +255,10 @@ class DisplayWindow(QMainWindow):
         self.base_dir = base_dir
         self.test_number = test_number
         self.connection = connection
+        # Write-ahead journal of trials and responses, so a crash mid-block loses nothing
+        self.response_journal = ResponseJournal.for_test(base_dir, current_test) if base_dir and current_test else None
+        # Stimulus onsets and key responses on the LSL clock, for reaction times
+        self.reaction_times = ReactionTimeRecorder()
 
         self.setWindowTitle("Display App")
         self.setGeometry(100, 100, 700, 700)
@@ -405,6 +413,9 @@ class DisplayWindow(QMainWindow):
                     )[current_test]
                     self.current_image_index = 0  # Reset the image index for the new trial
                     self.elapsed_time = 0  # Reset the elapsed time
+                    if not self.resume_from_journal():
+                        self.journal('block_start', test=current_test,
+                                     order=[os.path.basename(getattr(img, 'filename', '') or '') for img in self.images])
                     self.timer.start(1)  # Start the timer with 100 ms interval
                 if current_test in ['Stroop Multisensory Alcohol (Visual & Tactile)', 'Stroop Multisensory Neutral (Visual & Tactile)', 'Stroop Multisensory Alcohol (Visual & Olfactory)', 'Stroop Multisensory Neutral (Visual & Olfactory)']:
                     self.display_images_stroop()
@@ -433,6 +444,7 @@ class DisplayWindow(QMainWindow):
         logging.info(self.paused_time)
         self.send_message({"action": "client_log", "message": f"Paused time: {self.paused_time}"})
         self.paused_image_index = self.current_image_index 
+        self.journal('pause', index=self.current_image_index, elapsed=self.elapsed_time)
         logging.info(self.paused_image_index)
         self.send_message({"action": "client_log", "message": f"Paused image index: {self.paused_image_index}"})
          # Store the current image index
@@ -445,6 +457,7 @@ class DisplayWindow(QMainWindow):
     def resume_trial(self, event=None):
         label = "Resumed Trial"
         self.send_message({"action": "label", "label": label})  # Send label to the server
+        self.journal('resume', index=self.paused_image_index)
         self.Paused = False
         self.run_trial()  # Resume the trial
         if hasattr(self, 'mirror_widget') and self.mirror_widget is not None:
@@ -462,6 +475,7 @@ class DisplayWindow(QMainWindow):
                 label = f"{os.path.splitext(os.path.basename(img.filename))[0]} Image"
                 self.send_message({"action": "label", "label": label})  # Send label to the server
                 self.label_stream.push_label(label)
+                self.journal('trial', index=self.current_image_index, label=label, elapsed=self.elapsed_time)
                 logging.info(f"Current label: {label}")
                 self.send_message({"action": "client_log", "message": f"Current label: {label}"})
                 if self.eyetracker is not None:
@@ -491,10 +505,12 @@ class DisplayWindow(QMainWindow):
         pixmap = QPixmap(img.filename)
         self.current_pixmap = pixmap
         self.update_image_label()
+        self.reaction_times.mark_onset(self.current_image_index, 'image', self.image_label)
         if hasattr(img, 'filename'):
             label = f"{os.path.splitext(os.path.basename(img.filename))[0]} Image"
             self.send_message({"action": "label", "label": label})
             self.label_stream.push_label(label)
+            self.journal('trial', index=self.current_image_index, label=label, elapsed=self.elapsed_time)
             logging.info(f"Current label: {label}")
             self.send_message({"action": "client_log", "message": f"Current label: {label}"})
             self.current_label = label
@@ -531,6 +547,10 @@ class DisplayWindow(QMainWindow):
         label = "Crosshair Shown"
         self.send_message({"action": "label", "label": label})  # Send label to the server
         duration_ms = random.randint(800, 1200)
+        # In the viewing booth, keep the crosshair up until the turntable has reached the next object
+        turntable_window = getattr(self.frame, 'turntable_window', None)
+        if turntable_window is not None:
+            duration_ms = max(duration_ms, turntable_window.ready_in_ms())
         self.instructions_label.setText("+")
         self.instructions_label.setFont(QFont("Arial", 72, QFont.Bold))
         self.instructions_label.setAlignment(Qt.AlignCenter)
@@ -631,6 +651,7 @@ class DisplayWindow(QMainWindow):
             else:
                 label = "Passive Test Ended"
 
+            self.journal('block_end', elapsed=self.elapsed_time)
             self.send_message({"action": "label", "label": label})
             #self.label_stream.push_label("Test Ended")
             self.paused_image_index = 0
@@ -691,6 +712,7 @@ class DisplayWindow(QMainWindow):
         img = self.images[self.current_image_index]
         text = "Press the 'Y' key if congruent.\nPress the 'N' key if incongruent."
         self.image_label.setText(text)
+        self.reaction_times.mark_onset(self.current_image_index, 'prompt', self.image_label)
         self.image_label.setAlignment(Qt.AlignCenter)
         label_height = self.image_label.height()
         font_size = max(8, int(label_height * 0.04))
@@ -718,12 +740,15 @@ class DisplayWindow(QMainWindow):
             if event.type() == QEvent.KeyPress:
                 if event.key() == Qt.Key_Y or event.key() == Qt.Key_N:
                     img = self.images[self.current_image_index]
+                    # Time of the key press itself, not of this handler
+                    response_time = self.reaction_times.key_event(self.current_image_index,
+                                                                  'Y' if event.key() == Qt.Key_Y else 'N', event)
                     if event.key() == Qt.Key_Y:
                         self.user_data['user_inputs'].append('Yes') # Store the user input
                         if hasattr(img, 'filename'):
                             label = f"{os.path.splitext(os.path.basename(img.filename))[0]} Image: Yes"
                             self.send_message({"action": "label", "label": label})
-                            self.label_stream.push_label(label)
+                            self.label_stream.push_label(label, response_time)
                             logging.info(f"Current label: {label}")
                             self.send_message({"action": "client_log", "message": f"Current label: {label}"})
                             self.current_label = label  # Push label to LSL stream
@@ -732,11 +757,13 @@ class DisplayWindow(QMainWindow):
                         if hasattr(img, 'filename'):
                             label = f"{os.path.splitext(os.path.basename(img.filename))[0]} Image: No"
                             self.send_message({"action": "label", "label": label})
-                            self.label_stream.push_label(label)
+                            self.label_stream.push_label(label, response_time)
                             logging.info(f"Current label: {label}")
                             self.send_message({"action": "client_log", "message": f"Current label: {label}"})
                             self.current_label = label  # Push label to LSL stream
                     self.user_data['elapsed_time'].append(self.elapsed_time)  # Store the elapsed time
+                    self.journal('response', index=self.current_image_index, input=self.user_data['user_inputs'][-1],
+                                 elapsed=self.elapsed_time, time=response_time)
                     self.removeEventFilter(self)
                     if "Tactile" in self.current_test:
                         if self.next_asset_is_craving():
@@ -839,6 +866,10 @@ class DisplayWindow(QMainWindow):
                 self.mirror_widget = None
             if self.eyetracker and self.eyetracker.device is not None:
                 self.eyetracker.stop_recording()          
+            self.save_reaction_times()
+            if self.response_journal is not None:
+                self.journal('stopped', index=getattr(self, 'current_image_index', -1), elapsed=self.elapsed_time)
+                self.response_journal.close()
             super().closeEvent(event)
         else:
             # Prevent closing if stop wasn't pressed
@@ -905,10 +936,51 @@ class DisplayWindow(QMainWindow):
             self.mirror_widget.show_main_instructions()
         self.ready_for_space = True
 
+    # Write the reaction times of this test next to its data.csv
+    def save_reaction_times(self):
+        if not self.base_dir or not self.current_test or not self.reaction_times.responses:
+            return
+        try:
+            path = os.path.join(self.base_dir, self.current_test, 'reaction_times.csv')
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            rows = self.reaction_times.save(path)
+            logging.info(f"Saved {rows} reaction times to {path}")
+        except Exception as e:
+            logging.info(f"Error saving reaction times: {e}")
+
+    def journal(self, event, **fields):
+        # Append to the write-ahead response journal (no-op without a session directory)
+        if self.response_journal is not None:
+            self.response_journal.record(event, **fields)
+
+    # Restore an interrupted block of this test from the response journal; returns True if resumed
+    def resume_from_journal(self):
+        state = resume_state(self.base_dir, self.current_test)
+        if state is None:
+            return False
+        images = restore_order(self.images, state['order'])
+        if images is None or state['resume_index'] >= len(images):
+            logging.info("Response journal does not match the current assets; starting the block from the beginning.")
+            return False
+        self.images = images
+        self.current_image_index = state['resume_index']
+        self.elapsed_time = state['elapsed']
+        self.user_data['user_inputs'] = list(state['user_inputs'])
+        self.user_data['elapsed_time'] = list(state['elapsed_time'])
+        self.journal('resumed', index=self.current_image_index, elapsed=self.elapsed_time)
+        logging.info(f"Resuming {self.current_test} from the response journal at trial {self.current_image_index + 1}")
+        self.send_message({"action": "client_log", "message": f"Resuming {self.current_test} at trial {self.current_image_index + 1}"})
+        self.send_message({"action": "label", "label": "Resumed From Journal"})
+        return True
+
+    @timed('send_message')
     def send_message(self, message_dict):
         if self.client:
             try:
-                self.connection.sendall((json.dumps(message_dict) + "\n").encode('utf-8'))
+                # Labels go out immediately; client_log messages are batched behind them
+                channel_for(self.connection).send(message_dict)
+                if message_dict.get("action") == "label":
+                    record_event('label_sent', message_dict.get("label"))
             except Exception as e:
                 logging.info(f"Error sending message: {e}")
                 # Don't call send_message here to avoid infinite recursion
@@ -1069,6 +1141,7 @@ class DisplayWindow(QMainWindow):
             }
         """)
         self.craving_response = value
+        self.journal('craving', index=self.current_image_index, rating=value)
         self.send_message({"action": "crave", "crave": self.craving_response})  # Send label to the server
         self.removeEventFilter(self)
         # After craving rating is saved, go to the next step
@@ -1166,6 +1239,7 @@ class DisplayWindow(QMainWindow):
             if hasattr(key, 'char') and key.char is not None:
                 key_name = key.char.upper()
                 if key_name in ['Y', 'N'] and getattr(self, 'waiting_for_stroop_response', False):
+                    self.reaction_times.global_key(key_name)
                     print(f"[DEBUG] Global key pressed: {key_name}")
                     # Only post event if window is not focused
                     if not self.isActiveWindow():
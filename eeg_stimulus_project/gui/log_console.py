@@ -0,0 +1,230 @@
+"""
+Log console for the ControlWindow.
+
+Records from any thread are queued on a LogConsoleModel, which moves them into a fixed-size ring
+buffer in one batch per refresh tick on the GUI thread. The LogConsole widget shows the model
+through a filter proxy (minimum level, source, text) in a QListView, which only paints visible rows.
+"""
+
+import collections
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QSortFilterProxyModel, Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QCheckBox, QComboBox, QHBoxLayout, QLineEdit, QListView, QVBoxLayout, QWidget
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.config import config
+
+LogEntry = collections.namedtuple('LogEntry', ['created', 'levelno', 'source', 'text'])
+
+SOURCES = ('host', 'client')
+LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR')
+LEVEL_COLORS = {logging.WARNING: QColor("#b26a00"), logging.ERROR: QColor("#b82c2c"), logging.CRITICAL: QColor("#b82c2c")}
+
+LevelRole = Qt.UserRole + 1
+SourceRole = Qt.UserRole + 2
+
+
+class LogConsoleModel(QAbstractListModel):
+    """
+    Ring buffer of log entries exposed as a list model.
+
+    append() may be called from any thread; entries become rows at most refresh_hz times a second.
+
+    :param capacity: Number of entries kept; the oldest rows are removed as new ones arrive.
+    :param refresh_hz: Maximum number of batched updates per second.
+    """
+
+    flushed = pyqtSignal(int)
+
+    def __init__(self, capacity=None, refresh_hz=None, parent=None):
+        super().__init__(parent)
+        settings = config.get('gui.log_console', {}) or {}
+        self.capacity = capacity or settings.get('capacity', 20000)
+        refresh_hz = refresh_hz or settings.get('refresh_hz', 10)
+        self._buffer = [None] * self.capacity
+        self._start = 0
+        self._count = 0
+        # Entries that would fall out of the ring before the next flush are not worth keeping either
+        self._pending = collections.deque(maxlen=self.capacity)
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(1, int(1000 / refresh_hz)))
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    def append(self, text, levelno=logging.INFO, source='host', created=None):
+        """Queue one entry; safe to call from any thread."""
+        entry = LogEntry(created or time.time(), levelno, source, text)
+        with self._lock:
+            if len(self._pending) == self.capacity:
+                self.dropped += 1
+            self._pending.append(entry)
+
+    def flush(self):
+        """Move queued entries into the ring buffer in one model update (GUI thread)."""
+        with self._lock:
+            if not self._pending:
+                return
+            entries = list(self._pending)
+            self._pending.clear()
+        if len(entries) >= self.capacity:
+            self.beginResetModel()
+            self._buffer = entries[-self.capacity:]
+            self._start, self._count = 0, self.capacity
+            self.endResetModel()
+        else:
+            overflow = self._count + len(entries) - self.capacity
+            if overflow > 0:
+                self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+                self._start = (self._start + overflow) % self.capacity
+                self._count -= overflow
+                self.endRemoveRows()
+            self.beginInsertRows(QModelIndex(), self._count, self._count + len(entries) - 1)
+            for entry in entries:
+                self._buffer[(self._start + self._count) % self.capacity] = entry
+                self._count += 1
+            self.endInsertRows()
+        self.flushed.emit(len(entries))
+
+    def entry(self, row):
+        return self._buffer[(self._start + row) % self.capacity]
+
+    def entries(self):
+        return [self.entry(row) for row in range(self._count)]
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+        self.beginResetModel()
+        self._buffer = [None] * self.capacity
+        self._start = self._count = 0
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self._count:
+            return None
+        entry = self.entry(index.row())
+        if role == Qt.DisplayRole:
+            return f"[CLIENT] {entry.text}" if entry.source == 'client' else entry.text
+        if role == Qt.ForegroundRole:
+            return LEVEL_COLORS.get(entry.levelno)
+        if role == LevelRole:
+            return entry.levelno
+        if role == SourceRole:
+            return entry.source
+        return None
+
+
+class LogFilterProxy(QSortFilterProxyModel):
+    """Filters a LogConsoleModel by minimum level, source and a case-insensitive substring."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.min_level = logging.DEBUG
+        self.sources = set(SOURCES)
+        self.text = ''
+
+    def set_filters(self, min_level=None, sources=None, text=None):
+        if min_level is not None:
+            self.min_level = min_level
+        if sources is not None:
+            self.sources = set(sources)
+        if text is not None:
+            self.text = text.lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        entry = self.sourceModel().entry(source_row)
+        return (entry.levelno >= self.min_level and entry.source in self.sources
+                and (not self.text or self.text in entry.text.lower()))
+
+
+class LogConsoleHandler(logging.Handler):
+    """Logging handler feeding a LogConsoleModel; records may carry a 'source' attribute (extra={'source': ...})."""
+
+    def __init__(self, model, source='host'):
+        super().__init__()
+        self.model = model
+        self.source = source
+
+    def emit(self, record):
+        try:
+            self.model.append(self.format(record), record.levelno, getattr(record, 'source', self.source), record.created)
+        except Exception:
+            self.handleError(record)
+
+
+class LogConsole(QWidget):
+    """Filter bar and virtualized list view over a LogConsoleModel; follows new rows while scrolled to the bottom."""
+
+    def __init__(self, parent=None, capacity=None, refresh_hz=None):
+        super().__init__(parent)
+        self.model = LogConsoleModel(capacity, refresh_hz, self)
+        self.proxy = LogFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+
+        self.level_box = QComboBox(self)
+        self.level_box.addItems(LEVELS)
+        self.level_box.setCurrentText('INFO')
+        self.level_box.currentTextChanged.connect(self._update_filters)
+        self.source_boxes = {}
+        for source in SOURCES:
+            box = QCheckBox(source.capitalize(), self)
+            box.setChecked(True)
+            box.toggled.connect(self._update_filters)
+            self.source_boxes[source] = box
+        self.search_edit = QLineEdit(self)
+        self.search_edit.setPlaceholderText("Filter...")
+        self.search_edit.textChanged.connect(self._update_filters)
+
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(self.level_box)
+        for box in self.source_boxes.values():
+            filter_layout.addWidget(box)
+        filter_layout.addWidget(self.search_edit, 1)
+
+        self.view = QListView(self)
+        self.view.setModel(self.proxy)
+        self.view.setUniformItemSizes(True)
+        self.view.setEditTriggers(QListView.NoEditTriggers)
+        self.view.setSelectionMode(QListView.ExtendedSelection)
+        self.view.setVerticalScrollMode(QListView.ScrollPerPixel)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(filter_layout)
+        layout.addWidget(self.view)
+
+        self._follow = True
+        self.view.verticalScrollBar().valueChanged.connect(self._track_follow)
+        self.model.flushed.connect(self._scroll_if_following)
+        self._update_filters()
+
+    def handler(self, source='host'):
+        return LogConsoleHandler(self.model, source)
+
+    def _update_filters(self, *args):
+        self.proxy.set_filters(getattr(logging, self.level_box.currentText()),
+                               [source for source, box in self.source_boxes.items() if box.isChecked()],
+                               self.search_edit.text())
+
+    def _track_follow(self, value):
+        bar = self.view.verticalScrollBar()
+        self._follow = value >= bar.maximum()
+
+    def _scroll_if_following(self, count):
+        if self._follow:
+            self.view.scrollToBottom()
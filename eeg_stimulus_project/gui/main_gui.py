@@ -11,10 +11,12 @@ from eeg_stimulus_project.gui.sidebar import Sidebar
 from eeg_stimulus_project.gui.main_frame import MainFrame
 from eeg_stimulus_project.gui.display_window import DisplayWindow, MirroredDisplayWindow
 from eeg_stimulus_project.gui.stimulus_order_frame import StimulusOrderFrame
+from eeg_stimulus_project.gui.teardown import Teardown
 from eeg_stimulus_project.data.data_saving import Save_Data
 from eeg_stimulus_project.utils.labrecorder import LabRecorder
-from eeg_stimulus_project.utils.pupil_labs import PupilLabs
 from eeg_stimulus_project.lsl.labels import LSLLabelStream
+from eeg_stimulus_project.utils.message_channel import channel_for
+from eeg_stimulus_project.utils.gui_watchdog import timed
 from eeg_stimulus_project.assets.asset_handler import Display
 import logging
 from logging.handlers import QueueHandler
@@ -324,7 +326,7 @@ class GUI(QMainWindow):
             self._ping_time = time.time()
             msg = {"action": "latency_ping", "timestamp": self._ping_time}
             try:
-                self.connection.sendall((json.dumps(msg) + "\n").encode('utf-8'))
+                channel_for(self.connection).send_now(msg)
             except Exception as e:
                 logging.info(f"Error sending ping: {e}")
                 self.send_message({"action": "client_log", "message": f"Error sending ping: {e}"})
@@ -390,11 +392,12 @@ class GUI(QMainWindow):
         logger.handlers = []  # Remove other handlers
         logger.addHandler(queue_handler)
 
+    @timed('send_message')
     def send_message(self, message_dict):
         if self.client:
             # If this is a client, send the message to the server
             try:
-                self.connection.sendall((json.dumps(message_dict) + "\n").encode('utf-8'))
+                channel_for(self.connection).send(message_dict)
             except Exception as e:
                 logging.info(f"Error sending message: {e}")
                 # Don't call send_message here to avoid infinite recursion
@@ -410,6 +413,7 @@ class Frame(QFrame):
         self.labrecorder = None
         self.label_stream = None
         self.eyetracker = None
+        self.teardown = None  # stop in progress (gui/teardown.py)
         self.connection = connection
         self.client = client
         self.log_queue = log_queue
@@ -671,7 +675,7 @@ class Frame(QFrame):
             def send_message_from_turntable(msg):
                 if self.client:
                     try:
-                        self.connection.sendall((json.dumps(msg) + "\n").encode('utf-8'))
+                        channel_for(self.connection).send(msg)
                     except Exception as e:
                         logging.info(f"Error sending message: {e}")
 
@@ -687,62 +691,62 @@ class Frame(QFrame):
             self.turntable_window.show()
 
     #Function to handle what happens when the stop button is clicked for stroop tests(calls the data_saving file)
+    @timed('stop_button_clicked_stroop')
     def stop_button_clicked_stroop(self):
-        self.send_message({"action": "stop_button", "test": self.parent.get_current_test()})
-
-        save_data = Save_Data(self.base_dir, self.test_number)
-        self.start_button.setEnabled(True)  # Re-enable the start button after stopping
-        try:
-            if hasattr(self, 'display_widget') and self.display_widget is not None:
-                save_data.save_data_stroop(
-                    self.parent.get_current_test(),
-                    self.display_widget.user_data['user_inputs'],
-                    self.display_widget.user_data['elapsed_time']
-                )
-            else:
-                logging.info("No display_widget found for saving data.")
-                self.send_message({"action": "client_log", "message": "No display_widget found for saving data."})
-        except Exception as e:
-            logging.info(f"Error saving data: {e}")
-            self.send_message({"action": "client_log", "message": f"Error saving data: {e}"})
-        # Stop LabRecorder if connected
-        if self.labrecorder and self.labrecorder.s is not None:
-            self.labrecorder.Stop_Recorder()
-        # Stop the eyetracker if connected`
-        #if self.eyetracker and self.eyetracker.device is not None:
-        #    self.eyetracker.stop_recording()
-        if hasattr(self, 'display_widget') and self.display_widget is not None:
-            self.display_widget.stopped = True
-            self.display_widget.close()  # Close the display widget
-        time.sleep(2)  # Give some time for the display widget to stop
-        self.parent.open_secondary_gui(Qt.Unchecked, self.log_queue, label_stream=None)
-        self.label_stream = None  # Reset the label stream after stopping
+        self.stop_test(stroop=True)
 
     #Function to handle what happens when the stop button is clicked for passive tests(calls the data_saving file)
+    @timed('stop_button_clicked_passive')
     def stop_button_clicked_passive(self):
-        self.send_message({"action": "stop_button", "test": self.parent.get_current_test()})
+        self.stop_test(stroop=False)
+
+    # Stops the running test: the display closes right away, LabRecorder is stopped and the data saved in the background
+    def stop_test(self, stroop):
+        if self.teardown is not None:
+            logging.info("Stop already in progress.")
+            return
+        current_test = self.parent.get_current_test()
+        self.send_message({"action": "stop_button", "test": current_test})
 
         save_data = Save_Data(self.base_dir, self.test_number)
-        self.start_button.setEnabled(True)  # Re-enable the start button after stopping
-        try:
-            if hasattr(self, 'display_widget') and self.display_widget is not None:
-                save_data.save_data_passive(self.parent.get_current_test())
+        teardown = Teardown(f"stop {current_test}")
+        display_widget = getattr(self, 'display_widget', None)
+        if display_widget is not None:
+            if stroop:
+                # Copy the responses now; the display widget is closed before the save runs
+                user_inputs = list(display_widget.user_data['user_inputs'])
+                elapsed_time = list(display_widget.user_data['elapsed_time'])
+                teardown.add_save('data', lambda: save_data.save_data_stroop(current_test, user_inputs, elapsed_time))
             else:
-                logging.info("No display_widget found for saving data.")
-                self.send_message({"action": "client_log", "message": "No display_widget found for saving data."})
-        except Exception as e:
-            logging.info(f"Error saving data: {e}")
-            self.send_message({"action": "client_log", "message": f"Error saving data: {e}"})
+                teardown.add_save('data', lambda: save_data.save_data_passive(current_test))
+        else:
+            logging.info("No display_widget found for saving data.")
+            self.send_message({"action": "client_log", "message": "No display_widget found for saving data."})
         # Stop LabRecorder if connected
         if self.labrecorder and self.labrecorder.s is not None:
-            self.labrecorder.Stop_Recorder()
+            teardown.add_device('labrecorder', self.labrecorder.Stop_Recorder)
         # Stop the eyetracker if connected`
         #if self.eyetracker and self.eyetracker.device is not None:
-        #    self.eyetracker.stop_recording()
-        if hasattr(self, 'display_widget') and self.display_widget is not None:
-            self.display_widget.stopped = True
-            self.display_widget.close()
-        time.sleep(2)
+        #    teardown.add_device('eyetracker', self.eyetracker.stop_recording)
+        if display_widget is not None:
+            display_widget.stopped = True
+            display_widget.close()  # Close the display widget
+
+        teardown.finished.connect(self.on_stop_finished)
+        self.teardown = teardown
+        teardown.start()
+
+    # Runs on the GUI thread once the devices are stopped and the data is saved
+    def on_stop_finished(self, report):
+        save = report['saves'].get('data')
+        if save is not None and save['status'] != 'ok':
+            logging.info(f"Error saving data: {save['status']}")
+            self.send_message({"action": "client_log", "message": f"Error saving data: {save['status']}"})
+        for name, step in report['devices'].items():
+            if step['status'] != 'ok':
+                logging.info(f"Stopping {name} did not complete: {step['status']}")
+        self.teardown = None
+        self.start_button.setEnabled(True)  # Re-enable the start button after stopping
         self.parent.open_secondary_gui(Qt.Unchecked, self.log_queue, label_stream=None)
         self.label_stream = None  # Reset the label stream after stopping
 
@@ -761,11 +765,12 @@ class Frame(QFrame):
         self.pause_button.setEnabled(True)
         self.resume_button.setEnabled(True)
 
+    @timed('send_message')
     def send_message(self, message_dict):
         if self.client:
             # If this is a client, send the message to the server
             try:
-                self.connection.sendall((json.dumps(message_dict) + "\n").encode('utf-8'))
+                channel_for(self.connection).send(message_dict)
             except Exception as e:
                 logging.info(f"Error sending message: {e}")
                 # Don't call send_message here to avoid infinite recursion
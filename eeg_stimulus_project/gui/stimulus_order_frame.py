@@ -16,7 +16,6 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QFont, QPixmap, QIcon
 from PyQt5.QtCore import Qt, QSize
 from eeg_stimulus_project.assets.asset_handler import Display
-import openpyxl
 
 class StimulusOrderFrame(QWidget):
     """
@@ -0,0 +1,142 @@
+"""
+Stop/teardown of a test as a small state machine, off the GUI thread.
+
+A Teardown collects device shutdowns (LabRecorder, eye tracker, XDF recorder, ...) and save steps,
+then runs them from a background thread: all device shutdowns in parallel, each with its own
+timeout, then the save steps in order. States go idle -> stopping_devices -> saving -> done, and
+every transition and the final report are emitted as Qt signals, so slots on GUI objects run on
+the GUI thread. The report holds the status and duration of every step.
+"""
+
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.config import config
+from eeg_stimulus_project.utils.event_journal import record_event
+
+IDLE, STOPPING_DEVICES, SAVING, DONE = 'idle', 'stopping_devices', 'saving', 'done'
+
+
+class Teardown(QObject):
+    """
+    Parallel device shutdown followed by saving, reported through signals.
+
+    Keep a reference to the Teardown until finished is emitted.
+
+    :param name: Name used in the log and the event journal (e.g. "stop <test>").
+    :param timeout: Default seconds a device may take to shut down.
+    """
+
+    state_changed = pyqtSignal(str)
+    finished = pyqtSignal(dict)
+
+    def __init__(self, name, timeout=None, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.timeout = config.get('teardown.device_timeout', 10.0) if timeout is None else timeout
+        self.state = IDLE
+        self.devices = []  # (name, callable, timeout)
+        self.saves = []    # (name, callable)
+        self.report = None
+        self._thread = None
+
+    def add_device(self, name, stop, timeout=None):
+        """
+        Add a device shutdown; stop() may block or return a concurrent.futures.Future to wait for.
+        """
+        self.devices.append((name, stop, self.timeout if timeout is None else timeout))
+
+    def add_save(self, name, save):
+        """Add a save step; save steps run in order once every device is stopped or timed out."""
+        self.saves.append((name, save))
+
+    def start(self):
+        if self.state != IDLE:
+            raise RuntimeError(f"Teardown {self.name} already started")
+        self._thread = threading.Thread(target=self._run, daemon=True, name="Teardown")
+        self._thread.start()
+
+    def wait(self, timeout=None):
+        """Block until the teardown is done (for callers that are not on the GUI thread)."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.report
+
+    def _set_state(self, state):
+        self.state = state
+        self.state_changed.emit(state)
+
+    def _run(self):
+        started = time.perf_counter()
+        report = {'name': self.name, 'devices': {}, 'saves': {}}
+
+        self._set_state(STOPPING_DEVICES)
+        if self.devices:
+            executor = ThreadPoolExecutor(max_workers=len(self.devices), thread_name_prefix="TeardownDevice")
+            submitted = time.perf_counter()
+            futures = [(name, executor.submit(self._stop_device, stop, timeout), timeout) for name, stop, timeout in self.devices]
+            # Every device gets its own deadline, counted from the common start
+            for name, future, timeout in sorted(futures, key=lambda item: item[2]):
+                wait([future], timeout=max(0.0, submitted + timeout - time.perf_counter()))
+                if future.done():
+                    report['devices'][name] = future.result()
+                else:
+                    report['devices'][name] = {'status': 'timeout', 'duration_ms': timeout * 1000.0}
+            # A device that hangs keeps its thread; the teardown does not wait for it
+            executor.shutdown(wait=False)
+
+        self._set_state(SAVING)
+        for name, save in self.saves:
+            report['saves'][name] = self._timed_call(save)
+
+        report['total_ms'] = (time.perf_counter() - started) * 1000.0
+        report['ok'] = all(step['status'] == 'ok' for steps in (report['devices'], report['saves']) for step in steps.values())
+        self.report = report
+        try:
+            self._log(report)
+        except Exception as e:
+            # The UI must still hear that the teardown finished
+            print(f"Teardown: could not log the report: {e}", file=sys.stderr)
+        self._set_state(DONE)
+        self.finished.emit(report)
+
+    def _stop_device(self, stop, timeout):
+        started = time.perf_counter()
+        try:
+            result = stop()
+            if isinstance(result, Future):
+                result.result(timeout=max(0.0, timeout - (time.perf_counter() - started)))
+            if time.perf_counter() - started > timeout:
+                return {'status': 'timeout', 'duration_ms': (time.perf_counter() - started) * 1000.0}
+            return {'status': 'ok', 'duration_ms': (time.perf_counter() - started) * 1000.0}
+        except Exception as e:
+            status = 'timeout' if isinstance(e, TimeoutError) else f'failed: {e}'
+            return {'status': status, 'duration_ms': (time.perf_counter() - started) * 1000.0}
+
+    @staticmethod
+    def _timed_call(step):
+        started = time.perf_counter()
+        try:
+            step()
+            status = 'ok'
+        except Exception as e:
+            status = f'failed: {e}'
+        return {'status': status, 'duration_ms': (time.perf_counter() - started) * 1000.0}
+
+    def _log(self, report):
+        steps = ", ".join(f"{name} {step['status']} ({step['duration_ms']:.0f} ms)"
+                          for name, step in list(report['devices'].items()) + list(report['saves'].items()))
+        logging.info(f"Teardown {self.name} finished in {report['total_ms']:.0f} ms: {steps or 'nothing to do'}")
+        record_event('state', 'teardown_done', teardown=self.name, total_ms=round(report['total_ms'], 1),
+                     steps={name: {'status': step['status'], 'duration_ms': round(step['duration_ms'], 1)}
+                            for name, step in list(report['devices'].items()) + list(report['saves'].items())})
@@ -0,0 +1,111 @@
+from pylsl import StreamInfo, StreamOutlet, local_clock
+import sys
+from collections import deque
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.config import config
+
+
+def parse_force_records(buffer):
+    """
+    Parse complete "timestamp,force" records out of a raw byte buffer received from the tactile Pi.
+
+    Lines that are not numeric (e.g. the "time,value" header) are skipped. A trailing partial
+    line is returned so it can be prepended to the next chunk read from the socket.
+
+    :param buffer: Bytes received so far (may end in the middle of a record).
+    :return: A tuple (records, remainder) where records is a list of (pi_timestamp, force) tuples.
+    """
+    lines = buffer.split(b"\n")
+    remainder = lines.pop()
+    records = []
+    for line in lines:
+        parts = line.strip().split(b",")
+        if len(parts) != 2:
+            continue
+        try:
+            records.append((float(parts[0]), float(parts[1])))
+        except ValueError:
+            continue
+    return records, remainder
+
+
+class TactileForceStream:
+    """
+    Handles an LSL stream for publishing the tactile box force readings so LabRecorder
+    records them in the XDF next to the EEG and marker streams.
+
+    The Pi stamps every record with its own wall clock. Those source timestamps are mapped
+    onto the local LSL clock with the minimum of (local_clock - pi_timestamp) over the chunks of
+    the last clock_offset_window seconds, which keeps the original sample spacing, settles on the
+    offset with the lowest network delay and still follows the drift between the two clocks.
+    Pushed timestamps never go backwards when the offset moves.
+    """
+
+    def __init__(self, stream_name=None, stream_type=None, channel_count=None, nominal_srate=None, source_id="tactile_force_stream"):
+        stream_settings = config.get('lsl.stream_settings.tactile', {})
+        self.info = StreamInfo(
+            name=stream_name or stream_settings.get('name', 'Tactile'),
+            type=stream_type or stream_settings.get('type', 'Force'),
+            channel_count=channel_count or stream_settings.get('channel_count', 1),
+            nominal_srate=nominal_srate if nominal_srate is not None else stream_settings.get('sampling_rate', 100),
+            channel_format='float32',
+            source_id=source_id
+        )
+        channels = self.info.desc().append_child("channels")
+        channels.append_child("channel").append_child_value("label", "force").append_child_value("unit", "raw")
+        self.outlet = StreamOutlet(self.info)
+        self.clock_offset = None
+        self.clock_offset_window = stream_settings.get('clock_offset_window', 30.0)
+        # (receive_time, candidate offset) with increasing candidates: the front is the window minimum
+        self._offset_candidates = deque()
+        self.last_timestamp = None
+        self.samples_pushed = 0
+
+    def update_clock_offset(self, records, receive_time=None):
+        """
+        Refine the Pi-to-LSL clock offset using the records of one received chunk.
+
+        :param records: List of (pi_timestamp, force) tuples that arrived together.
+        :param receive_time: LSL time the chunk was received (defaults to now).
+        """
+        if not records:
+            return self.clock_offset
+        if receive_time is None:
+            receive_time = local_clock()
+        # The newest record in the chunk has the smallest transmission delay
+        candidate = receive_time - records[-1][0]
+        candidates = self._offset_candidates
+        while candidates and candidates[-1][1] >= candidate:
+            candidates.pop()
+        candidates.append((receive_time, candidate))
+        while candidates[0][0] < receive_time - self.clock_offset_window:
+            candidates.popleft()
+        self.clock_offset = candidates[0][1]
+        return self.clock_offset
+
+    def push_records(self, records, receive_time=None):
+        """
+        Push a chunk of parsed force records to the LSL outlet with mapped source timestamps.
+
+        :param records: List of (pi_timestamp, force) tuples.
+        :param receive_time: LSL time the chunk was received (defaults to now).
+        """
+        if not records or not self.outlet:
+            return
+        offset = self.update_clock_offset(records, receive_time)
+        samples = [[force] for _, force in records]
+        timestamps = []
+        for pi_time, _ in records:
+            # A faster chunk lowers the offset, which could put its first records before the last pushed one
+            timestamp = pi_time + offset
+            if self.last_timestamp is not None and timestamp < self.last_timestamp:
+                timestamp = self.last_timestamp
+            timestamps.append(timestamp)
+            self.last_timestamp = timestamp
+        self.outlet.push_chunk(samples, timestamps)
+        self.samples_pushed += len(samples)
@@ -1,4 +1,6 @@
-from pylsl import StreamInfo, StreamOutlet
+from pylsl import StreamInfo, StreamOutlet, local_clock
+
+from eeg_stimulus_project.utils.event_journal import record_event
 
 class LSLLabelStream:
     """
@@ -18,9 +20,13 @@ class LSLLabelStream:
             # Create the LSL outlet
             self.outlet = StreamOutlet(self.info)
 
-    def push_label(self, label):
+    def push_label(self, label, timestamp=None):
         """
         Push a label (string) to the LSL stream.
+
+        :param timestamp: LSL clock time of the event the label marks (defaults to now).
         """
         if self.outlet:
-            self.outlet.push_sample([str(label)])
+            timestamp = local_clock() if timestamp is None else timestamp
+            self.outlet.push_sample([str(label)], timestamp)
+            record_event('label', label, timestamp)
@@ -0,0 +1,257 @@
+import heapq
+import sys
+import threading
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pylsl import StreamInfo, StreamOutlet, local_clock
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.config import config
+from eeg_stimulus_project.utils.xdf_file_handler import XDFIndexedReader
+
+#Re-streams recorded sessions (XDF files or our CSV output) into LSL so the viewer, the collector and the
+#benchmarks can run against realistic data without an amplifier. All streams of a session are replayed by
+#one scheduler thread, so their relative timing (EEG vs. markers) is kept at every playback speed.
+
+
+class ReplayStream:
+    """
+    One recorded stream prepared for replay.
+
+    :param timestamps: Sample time stamps (seconds, any clock).
+    :param samples: 2-D numpy array for numeric streams, list of per-sample lists for string streams.
+    :param header_xml: Original StreamHeader XML; its <desc> (channel labels, units, ...) is copied to the outlet.
+    """
+
+    def __init__(self, name, stream_type, channel_count, nominal_srate, channel_format, timestamps, samples,
+                 source_id="", header_xml=None):
+        self.name = name
+        self.type = stream_type
+        self.channel_count = int(channel_count)
+        self.nominal_srate = float(nominal_srate)
+        self.channel_format = channel_format
+        self.timestamps = np.asarray(timestamps, dtype=float)
+        self.samples = samples
+        self.source_id = source_id
+        self.header_xml = header_xml
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def make_info(self):
+        """Create the StreamInfo of the replay outlet with the original metadata."""
+        info = StreamInfo(self.name, self.type, self.channel_count, self.nominal_srate, self.channel_format,
+                          self.source_id or f"replay_{self.name}")
+        if self.header_xml:
+            desc = ET.fromstring(self.header_xml).find('desc')
+            if desc is not None:
+                _copy_xml(desc, info.desc())
+        return info
+
+
+def _copy_xml(source, target):
+    # Recreate an XML subtree inside an LSL XMLElement
+    for child in source:
+        if len(child):
+            _copy_xml(child, target.append_child(child.tag))
+        else:
+            target.append_child_value(child.tag, child.text or "")
+
+
+def load_xdf_streams(path, names=None):
+    """
+    Load the streams of a recorded XDF file for replay.
+
+    :param names: Stream names to load (all streams when omitted).
+    :return: List of ReplayStream.
+    """
+    reader = XDFIndexedReader(str(path))
+    streams = []
+    for info in reader.streams:
+        if names and info['name'] not in names:
+            continue
+        data = reader.load_stream(info['stream_id'])
+        streams.append(ReplayStream(info['name'], info['type'], info['channel_count'], info['nominal_srate'],
+                                    info['channel_format'], data['time_stamps'], data['time_series'],
+                                    info['source_id'], reader.header_xml(info['stream_id'])))
+    return streams
+
+
+def load_csv_streams(path):
+    """
+    Load one of our CSV files for replay.
+
+    Tables with a Timestamp column (save_stream_to_csv and batch_convert output) become one stream named
+    after the file; the data.csv of a Stroop test becomes a marker stream of the responses, placed at the
+    cumulative elapsed times.
+
+    :return: List of ReplayStream.
+    """
+    path = Path(path)
+    frame = pd.read_csv(path)
+    if 'Timestamp' in frame.columns:
+        # batch_convert names its outputs "<recording>__<stream>.csv"
+        name = path.stem.split("__", 1)[1] if "__" in path.stem else path.stem
+        channels = [column for column in frame.columns if column != 'Timestamp']
+        timestamps = frame['Timestamp'].to_numpy(dtype=float)
+        settings = next((s for s in config.get('lsl.stream_settings', {}).values() if s.get('name') == name), {})
+        if all(pd.api.types.is_numeric_dtype(frame[column]) for column in channels):
+            samples = frame[channels].to_numpy(dtype=np.float32)
+            srate = settings.get('sampling_rate') or (round(1.0 / np.median(np.diff(timestamps))) if len(timestamps) > 1 else 0)
+            stream = ReplayStream(name, settings.get('type', 'EEG'), len(channels), srate, 'float32', timestamps, samples)
+        else:
+            samples = frame[channels].astype(str).values.tolist()
+            stream = ReplayStream(name, settings.get('type', 'Markers'), len(channels), 0, 'string', timestamps, samples)
+        stream.header_xml = ('<info><desc><channels>'
+                             + "".join(f"<channel><label>{column}</label></channel>" for column in channels)
+                             + '</channels></desc></info>')
+        return [stream]
+    if {'User Inputs', 'Elapsed Time'} <= set(frame.columns):
+        timestamps = frame['Elapsed Time'].to_numpy(dtype=float).cumsum() / 1000.0
+        samples = [[str(value)] for value in frame['User Inputs']]
+        return [ReplayStream("responses", "Markers", 1, 0, 'string', timestamps, samples)]
+    raise ValueError(f"{path} has neither a Timestamp column nor the User Inputs/Elapsed Time columns")
+
+
+def load_session(path, names=None):
+    """Load an .xdf or .csv recording for replay."""
+    if Path(path).suffix.lower() == ".xdf":
+        return load_xdf_streams(path, names)
+    return [stream for stream in load_csv_streams(path) if not names or stream.name in names]
+
+
+def default_chunk_size(stream):
+    """
+    Chunk size used by the recording device for a stream type.
+
+    Configured per stream type in lsl.replay.chunk_sizes; otherwise about 10 ms of samples for regular
+    streams and single samples for irregular (marker) streams.
+    """
+    configured = config.get('lsl.replay.chunk_sizes', {}).get(stream.type)
+    if configured:
+        return int(configured)
+    if stream.nominal_srate <= 0:
+        return 1
+    return max(1, int(round(stream.nominal_srate / 100)))
+
+
+class SessionReplay:
+    """
+    Publishes recorded streams as LSL outlets.
+
+    :param streams: ReplayStream objects (see load_session).
+    :param speed: Playback speed factor (1.0 = real time, 10.0 = ten times faster, 0 = as fast as possible);
+                  defaults to lsl.replay.speed.
+    :param chunk_size: Samples per pushed chunk, for every stream (defaults to default_chunk_size per stream).
+    :param loop: Start over at the end of the recording until stop() is called.
+    """
+
+    def __init__(self, streams, speed=None, chunk_size=None, loop=False):
+        self.streams = [stream for stream in streams if len(stream)]
+        self.speed = speed if speed is not None else config.get('lsl.replay.speed', 1.0)
+        self.chunk_sizes = [chunk_size or default_chunk_size(stream) for stream in self.streams]
+        self.loop = loop
+        self.outlets = []
+        self.samples_pushed = 0
+        self.chunks_pushed = 0
+        self.max_lag = 0.0
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def start(self, wait_for_consumers=0.0):
+        """
+        Create the outlets and start replaying in a background thread.
+
+        :param wait_for_consumers: Seconds to wait for an inlet on every outlet before the first sample is pushed.
+        """
+        if not self.streams:
+            raise ValueError("Nothing to replay: no stream contains samples")
+        self.outlets = [StreamOutlet(stream.make_info(), chunk_size=size)
+                        for stream, size in zip(self.streams, self.chunk_sizes)]
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(wait_for_consumers,), daemon=True, name="SessionReplay")
+        self._thread.start()
+        print(f"Replaying {', '.join(s.name for s in self.streams)} at "
+              f"{'maximum speed' if not self.speed else f'{self.speed:g}x'}")
+        return self
+
+    def wait_for_consumers(self, timeout=5.0):
+        """Block until every outlet has at least one consumer; returns True on success."""
+        return all(outlet.wait_for_consumers(timeout) for outlet in self.outlets)
+
+    def _run(self, consumer_timeout):
+        if consumer_timeout:
+            self.wait_for_consumers(consumer_timeout)
+        t0 = min(stream.timestamps[0] for stream in self.streams)
+        duration = max(stream.timestamps[-1] for stream in self.streams) - t0
+        start = local_clock()
+        while not self._stop_event.is_set():
+            self._play_once(t0, start)
+            if not self.loop:
+                break
+            # Keep the replayed clock continuous across repetitions
+            start += (duration + 0.001) / self.speed if self.speed else duration + 0.001
+        print(f"Replay finished: {self.samples_pushed} samples in {self.chunks_pushed} chunks")
+
+    def _play_once(self, t0, start):
+        # Each chunk is due when its last sample would have been acquired
+        queue = [(stream.timestamps[min(size, len(stream)) - 1], index, 0)
+                 for index, (stream, size) in enumerate(zip(self.streams, self.chunk_sizes))]
+        heapq.heapify(queue)
+        scale = 1.0 / self.speed if self.speed else 1.0
+        while queue and not self._stop_event.is_set():
+            due, index, begin = heapq.heappop(queue)
+            stream, size, outlet = self.streams[index], self.chunk_sizes[index], self.outlets[index]
+            end = min(begin + size, len(stream))
+            if self.speed:
+                delay = start + (due - t0) * scale - local_clock()
+                if delay > 0 and self._stop_event.wait(delay):
+                    break
+                self.max_lag = max(self.max_lag, -delay)
+            stamps = (start + (stream.timestamps[begin:end] - t0) * scale).tolist()
+            outlet.push_chunk(stream.samples[begin:end], stamps)
+            self.samples_pushed += end - begin
+            self.chunks_pushed += 1
+            if end < len(stream):
+                heapq.heappush(queue, (stream.timestamps[min(end + size, len(stream)) - 1], index, end))
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join(2.0)
+        self.outlets = []
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Re-stream a recorded session (XDF or CSV) into LSL.")
+    parser.add_argument("path", help=".xdf or .csv recording")
+    parser.add_argument("--speed", type=float, default=config.get('lsl.replay.speed', 1.0),
+                        help="playback speed factor, 0 for as fast as possible")
+    parser.add_argument("--chunk-size", type=int, default=None, help="samples per chunk (default: per device type)")
+    parser.add_argument("--streams", nargs="*", default=None, help="names of the streams to replay")
+    parser.add_argument("--loop", action="store_true", help="repeat the recording until interrupted")
+    args = parser.parse_args(argv)
+    replay = SessionReplay(load_session(args.path, args.streams), args.speed, args.chunk_size, args.loop).start()
+    try:
+        while replay.is_running():
+            replay.join(0.5)
+    except KeyboardInterrupt:
+        replay.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,5 @@
 import os
 import threading
-import pandas as pd
 import pylsl
 
 class Config:
@@ -177,6 +176,7 @@ class LSL:
                 columns = ['Timestamp'] + ['Label'] + [f'{stream_type}_{i + 1}' for i in range(channel_count)]
 
                 # Convert collected data to a DataFrame, format with columns above, and write to CSV
+                import pandas as pd
                 df = pd.DataFrame(LSL.collected_data[stream_type], columns=columns)
                 df = df.sort_values(by='Timestamp')
                 df.to_csv(os.path.join(path, f"{stream_type}_data.csv"), index=False)
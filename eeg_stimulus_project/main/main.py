@@ -6,12 +6,16 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+# Time the imports below when start-up profiling is enabled
+from eeg_stimulus_project.utils import startup_profiler
+startup_profiler.start('launcher')
+
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit, QMessageBox, QFileDialog, QGroupBox, QSizePolicy, QSpacerItem, QCheckBox
 )
 from PyQt5.QtGui import QFont, QIcon, QDesktopServices
-from PyQt5.QtCore import Qt, QUrl
-from multiprocessing import Manager, Process, Queue
+from PyQt5.QtCore import Qt, QUrl, QTimer
+from multiprocessing import Queue
 import socket
 import threading
 import logging
@@ -19,6 +23,8 @@ from logging.handlers import QueueListener
 
 # Import configuration manager
 from eeg_stimulus_project.config import config
+from eeg_stimulus_project.main.warm_workers import WarmWorkerPool, cold_worker_main, use_simulators_if_enabled
+from eeg_stimulus_project.utils.shared_status import SharedStatus
 
 
 # Import logging utilities
@@ -66,43 +72,22 @@ def create_data_dirs(subject_id, test_number):
     
     return str(base_dir)
 
-# Initializes shared resources for multiprocessing (status dict and log queue)
+# Initializes shared resources for multiprocessing (shared-memory status flags, all False, and log queue)
 def init_shared_resources():
-    manager = Manager()
-    shared_status = manager.dict()
-    shared_status['lab_recorder_connected'] = False
-    shared_status['eyetracker_connected'] = False
-    shared_status['lsl_enabled'] = False
-    shared_status['tactile_connected'] = False
+    shared_status = SharedStatus()
     log_queue = Queue()
-    return manager, shared_status, log_queue
+    return shared_status, log_queue
 
 # Launches the control window process (host)
 def run_control_window_host(connection, shared_status, log_queue, base_dir, test_number, host, subject_id):
-    from eeg_stimulus_project.utils.logging_utils import setup_child_process_logging
-    from eeg_stimulus_project.gui.control_window import ControlWindow
-    
-    # Setup logging for this child process
-    setup_child_process_logging(log_queue)
-    app = QApplication(sys.argv)
-    window = ControlWindow(connection, shared_status, log_queue, base_dir, test_number, host, subject_id)
-    window.show()
-    sys.exit(app.exec_())
+    cold_worker_main('control', shared_status, log_queue, dict(
+        connection=connection, base_dir=base_dir, test_number=test_number, host=host, subject_id=subject_id))
 
 # Launches the main GUI process (client or local)
 def run_main_gui_client(connection, shared_status, log_queue, base_dir, test_number, client, alcohol_folder=None, non_alcohol_folder=None, local_mode=False):
-    from eeg_stimulus_project.utils.logging_utils import setup_child_process_logging
-    from eeg_stimulus_project.gui.main_gui import GUI
-    
-    # Setup logging for this child process
-    # If this is a client, pass the connection for network logging
-    network_connection = connection if client else None
-    setup_child_process_logging(log_queue, network_connection)
-    
-    app = QApplication(sys.argv)
-    window = GUI(connection, shared_status, log_queue, base_dir, test_number, client, alcohol_folder, non_alcohol_folder, local_mode)
-    window.show()
-    sys.exit(app.exec_())
+    cold_worker_main('gui', shared_status, log_queue, dict(
+        connection=connection, base_dir=base_dir, test_number=test_number, client=client,
+        alcohol_folder=alcohol_folder, non_alcohol_folder=non_alcohol_folder, local_mode=local_mode))
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -258,12 +243,21 @@ class MainWindow(QMainWindow):
         # Store processes and state
         self.gui_process = None
         self.control_process = None
-        self.manager = None
         self.shared_status = None
+        self.log_queue = None
+        self.workers = None
         self.connection = None
         self.client_connected = False
         self.local_mode = False 
 
+    # Creates the shared resources and pre-starts the child processes while the experimenter fills in the form
+    def warm_up(self):
+        if self.workers is not None:
+            return
+        self.shared_status, self.log_queue = init_shared_resources()
+        self.workers = WarmWorkerPool(self.shared_status, self.log_queue)
+        self.workers.warm_up()
+
     # Main logic for starting the experiment in host, client, or both/local mode
     def start_experiment(self, client=False, host=False):
         # Disable buttons to prevent double starts
@@ -286,6 +280,9 @@ class MainWindow(QMainWindow):
                 QMessageBox.critical(self, "Error", "Please enter a valid Subject ID and Test Number (1 or 2).")
                 self._reset_buttons()
                 return
+            # The host only runs the control window
+            self.warm_up()
+            self.workers.release(['gui'])
             threading.Thread(target=self.start_server, daemon=True).start()  # Start server in background thread
         # Client mode: require host IP and connect
         elif client:
@@ -297,11 +294,12 @@ class MainWindow(QMainWindow):
                 logging.info("Could not connect to host. Check IP and network.")
                 self._reset_buttons()
                 return
-            # Directory and shared resources for client (base_dir is None for client)
-            base_dir = None
-            self.manager, self.shared_status, log_queue = init_shared_resources()
-            self.gui_process = Process(target=run_main_gui_client, args=(self.connection, self.shared_status, log_queue, base_dir, test_number, True, alcohol_folder, non_alcohol_folder)) # client=True
-            self.gui_process.start()
+            # Client has no data directory (base_dir is None)
+            self.warm_up()
+            self.workers.release(['control'])
+            self.gui_process = self.workers.launch(
+                'gui', connection=self.connection, base_dir=None, test_number=test_number, client=True,
+                alcohol_folder=alcohol_folder, non_alcohol_folder=non_alcohol_folder)
         else:
             # Both: local experiment (host and client on same machine)
             self.local_mode = True
@@ -310,15 +308,14 @@ class MainWindow(QMainWindow):
                 self._reset_buttons()
                 return
             base_dir = create_data_dirs(subject_id, test_number)
-            self.manager, self.shared_status, log_queue = init_shared_resources()
-            # Start control and GUI processes
-            self.control_process = Process(target=run_control_window_host, args=(self.connection, self.shared_status, log_queue, base_dir, test_number, False, subject_id)) # host=False
-            self.gui_process = Process(
-                target=run_main_gui_client,
-                args=(self.connection, self.shared_status, log_queue, base_dir, test_number, False, alcohol_folder, non_alcohol_folder, self.local_mode) 
-            ) # client=False
-            self.control_process.start()
-            self.gui_process.start()
+            self.warm_up()
+            # Hand the session to the control and GUI processes
+            self.control_process = self.workers.launch(
+                'control', connection=self.connection, base_dir=base_dir, test_number=test_number, host=False,
+                subject_id=subject_id)
+            self.gui_process = self.workers.launch(
+                'gui', connection=self.connection, base_dir=base_dir, test_number=test_number, client=False,
+                alcohol_folder=alcohol_folder, non_alcohol_folder=non_alcohol_folder, local_mode=self.local_mode)
 
     # Re-enable buttons after an error or experiment end
     def _reset_buttons(self):
@@ -347,14 +344,11 @@ class MainWindow(QMainWindow):
             subject_id = self.subject_id_input.text()
             test_number = self.test_number_input.text()
             base_dir = create_data_dirs(subject_id, test_number)
-            self.manager, self.shared_status, log_queue = init_shared_resources()
-
-            # Start the control window process only after connection
-            self.control_process = Process(
-                target=run_control_window_host,
-                args=(self.connection, self.shared_status, log_queue, base_dir, test_number, True, subject_id)  # host=True
-            )
-            self.control_process.start()
+
+            # Start the control window only after connection
+            self.control_process = self.workers.launch(
+                'control', connection=self.connection, base_dir=base_dir, test_number=test_number, host=True,
+                subject_id=subject_id)
         except Exception as e:
             logging.info(f"Host: Server error: {e}")
 
@@ -383,6 +377,11 @@ class MainWindow(QMainWindow):
         if self.control_process is not None:
             self.control_process.terminate()
             self.control_process.join()
+        if self.workers is not None:
+            self.workers.shutdown()
+        if self.shared_status is not None:
+            self.shared_status.close()
+            self.shared_status = None
         event.accept()
 
     # Monitors the client connection in a background thread
@@ -409,10 +408,20 @@ class MainWindow(QMainWindow):
 
 def main():
     """Main entry point for the EEG Stimulus Project."""
+    # Start the hardware simulators on their configured ports (the tactile supervisor starts the force server)
+    if config.get('simulators.enabled', False):
+        from eeg_stimulus_project.simulators.suite import SimulatorSuite
+        SimulatorSuite(devices=['labrecorder', 'ticcmd', 'pupil'], use_configured_ports=True).start()
+        use_simulators_if_enabled()
+
     # Create the application and main window, then run the application
     app = QApplication(sys.argv)
+    startup_profiler.mark('qapplication')
     window = MainWindow()
     window.show()
+    startup_profiler.first_window_shown()
+    # Boot the child processes once the launcher window is on screen
+    QTimer.singleShot(0, window.warm_up)
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
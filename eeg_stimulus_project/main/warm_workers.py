@@ -0,0 +1,173 @@
+"""
+Pre-started child processes for the control window and the main GUI.
+
+Starting a child with the spawn start method means a fresh interpreter plus the Qt and GUI imports,
+which used to happen after the experimenter pressed Start. WarmWorkerPool starts one worker per role
+as soon as the launcher window is up; each worker imports its window module, creates its
+QApplication and then waits on a pipe. Pressing Start only sends the session settings (connection,
+base_dir, test number, ...) down the pipe, and the worker builds and shows its window right away.
+"""
+
+import importlib
+import logging
+import sys
+from multiprocessing import Pipe, Process
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.config import config
+from eeg_stimulus_project.utils import startup_profiler
+
+# Role -> (module, window class); the class is constructed with the settings sent at launch
+ROLES = {
+    'control': ('eeg_stimulus_project.gui.control_window', 'ControlWindow'),
+    'gui': ('eeg_stimulus_project.gui.main_gui', 'GUI'),
+}
+
+
+# Points the device connections of this process at the hardware simulators when they are enabled
+def use_simulators_if_enabled():
+    if config.get('simulators.enabled', False):
+        from eeg_stimulus_project.simulators.suite import apply_simulator_config
+        apply_simulator_config()
+
+
+def boot_worker(role, log_queue):
+    """
+    Everything a child process can do before it knows its session.
+
+    :return: (QApplication, window class) of the role.
+    """
+    startup_profiler.start(role, restart=True)
+    use_simulators_if_enabled()
+    from eeg_stimulus_project.utils.logging_utils import setup_child_process_logging
+    setup_child_process_logging(log_queue)
+    module_name, class_name = ROLES[role]
+    window_class = getattr(importlib.import_module(module_name), class_name)
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv)
+    startup_profiler.mark('booted')
+    return app, window_class
+
+
+def run_window(role, app, window_class, shared_status, log_queue, settings):
+    """
+    Build the role's window from the session settings and run the event loop (does not return).
+
+    :param settings: Keyword arguments of the window class, apart from shared_status and log_queue.
+    """
+    from eeg_stimulus_project.utils.logging_utils import setup_child_process_logging
+    from eeg_stimulus_project.utils.event_journal import open_session_journal
+
+    if role == 'control':
+        journal_role = 'host' if settings.get('host') else 'local_control'
+        network_connection = None
+    else:
+        journal_role = 'client' if settings.get('client') else 'local_gui'
+        # A client also sends its logs to the host
+        network_connection = settings.get('connection') if settings.get('client') else None
+    setup_child_process_logging(log_queue, network_connection)
+    open_session_journal(settings.get('base_dir'), journal_role)
+    startup_profiler.mark('settings_received')
+
+    window = window_class(shared_status=shared_status, log_queue=log_queue, **settings)
+    window.show()
+    startup_profiler.first_window_shown()
+    from eeg_stimulus_project.utils.gui_watchdog import install_watchdog
+    install_watchdog(app)
+    sys.exit(app.exec_())
+
+
+def worker_main(role, pipe, shared_status, log_queue):
+    """Entry point of a warm worker: boot, wait for the session settings (None means exit), run."""
+    app, window_class = boot_worker(role, log_queue)
+    try:
+        settings = pipe.recv()
+    except (EOFError, OSError):
+        settings = None
+    pipe.close()
+    if settings is None:
+        return
+    run_window(role, app, window_class, shared_status, log_queue, settings)
+
+
+def cold_worker_main(role, shared_status, log_queue, settings):
+    """Entry point of a child started at launch time (warm workers disabled or not available)."""
+    app, window_class = boot_worker(role, log_queue)
+    run_window(role, app, window_class, shared_status, log_queue, settings)
+
+
+class WarmWorkerPool:
+    """
+    One pre-started worker per role, sharing the session's status dict and log queue.
+
+    :param shared_status: SharedStatus handed to every window.
+    :param log_queue: Log queue of the children (must be inherited, so it is fixed at warm-up).
+    :param enabled: Pre-start workers; when False launch() starts a fresh process every time.
+    """
+
+    def __init__(self, shared_status, log_queue, enabled=None):
+        self.shared_status = shared_status
+        self.log_queue = log_queue
+        self.enabled = config.get('processes.warm_workers', True) if enabled is None else enabled
+        self.workers = {}  # role -> (Process, parent end of the pipe)
+        self.released = []
+
+    def warm_up(self, roles=tuple(ROLES)):
+        if not self.enabled:
+            return
+        for role in roles:
+            if role in self.workers:
+                continue
+            parent_end, child_end = Pipe()
+            process = Process(target=worker_main, args=(role, child_end, self.shared_status, self.log_queue),
+                              name=f"warm-{role}", daemon=False)
+            process.start()
+            child_end.close()
+            self.workers[role] = (process, parent_end)
+            logging.info(f"Warm {role} worker started (pid {process.pid})")
+
+    def launch(self, role, **settings):
+        """
+        Start the role's window with the given settings.
+
+        :return: The Process running the window.
+        """
+        process, pipe = self.workers.pop(role, (None, None))
+        if process is not None and process.is_alive():
+            try:
+                pipe.send(settings)
+                pipe.close()
+                return process
+            except (OSError, ValueError) as e:
+                logging.info(f"Warm {role} worker unavailable ({e}); starting a new process")
+                process.terminate()
+        process = Process(target=cold_worker_main, args=(role, self.shared_status, self.log_queue, settings))
+        process.start()
+        return process
+
+    def release(self, roles=None):
+        """Tell idle workers (all, or those of the given roles) to exit; does not wait for them."""
+        for role in list(self.workers if roles is None else roles):
+            process, pipe = self.workers.pop(role, (None, None))
+            if process is None:
+                continue
+            try:
+                pipe.send(None)
+                pipe.close()
+            except (OSError, ValueError):
+                pass
+            self.released.append(process)
+
+    def shutdown(self, timeout=2.0):
+        """Release all idle workers and wait for them, terminating any that do not exit in time."""
+        self.release()
+        for process in self.released:
+            process.join(timeout=timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self.released = []
@@ -0,0 +1,110 @@
+import random
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.config import config
+
+
+def simulator_settings(device):
+    """Return the simulators.<device> settings merged over the shared simulators.host."""
+    settings = dict(config.get(f'simulators.{device}', {}) or {})
+    settings.setdefault('host', config.get('simulators.host', '127.0.0.1'))
+    return settings
+
+
+def simulated_delay(latency=0.0, jitter=0.0, rng=random):
+    """
+    Sleep for one simulated device round trip.
+
+    :param latency: Mean delay in seconds.
+    :param jitter: Standard deviation of the delay in seconds.
+    :return: The delay that was applied.
+    """
+    delay = max(0.0, rng.gauss(latency, jitter)) if jitter else max(0.0, latency)
+    if delay:
+        time.sleep(delay)
+    return delay
+
+
+class TCPSimulator:
+    """
+    Base class of the TCP device stand-ins: listens on host:port and serves every connection in its own thread.
+
+    :param port: Port to listen on (0 picks a free port; the chosen one is available as .port).
+    :param latency: Mean simulated delay in seconds, applied by subclasses per command or chunk.
+    :param jitter: Standard deviation of the delay in seconds.
+    """
+
+    name = "simulator"
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, seed=None):
+        self.host = host
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self.connections = 0
+        self._open = set()
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((host, port))
+        self._server.listen(5)
+        self.port = self._server.getsockname()[1]
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def address(self):
+        return self.host, self.port
+
+    def delay(self):
+        return simulated_delay(self.latency, self.jitter, self.rng)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True, name=f"{self.name}-accept")
+        self._thread.start()
+        print(f"{self.name} simulator listening on {self.host}:{self.port}")
+        return self
+
+    def _accept_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                break
+            self.connections += 1
+            self._open.add(conn)
+            threading.Thread(target=self._serve, args=(conn,), daemon=True, name=f"{self.name}-conn").start()
+
+    def _serve(self, conn):
+        try:
+            with conn:
+                self.handle_connection(conn)
+        except OSError:
+            pass  # Client went away
+        finally:
+            self._open.discard(conn)
+
+    def handle_connection(self, conn):
+        raise NotImplementedError
+
+    def is_stopped(self):
+        return self._stop_event.is_set()
+
+    def stop(self):
+        self._stop_event.set()
+        # shutdown() wakes the accept() and recv() calls blocked in the server threads
+        for sock in [self._server] + list(self._open):
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+        if self._thread is not None:
+            self._thread.join(2.0)
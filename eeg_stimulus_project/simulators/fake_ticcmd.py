@@ -0,0 +1,151 @@
+import argparse
+import json
+import os
+import stat
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.config import config
+from eeg_stimulus_project.simulators.common import simulated_delay, simulator_settings
+from eeg_stimulus_project.stimulus.turn_table_code.tic_driver import SimulatedTicTransport
+
+#Stand-in for Pololu's ticcmd utility. It accepts the options TicCmdTransport uses and keeps each device's
+#state in a JSON file, so consecutive invocations see a motor that keeps moving between calls (the same
+#trapezoidal model as SimulatedTicTransport). write_launcher() creates an executable that can be set as
+#hardware.motors.*.ticcmd_path.
+
+STATE_ENV = "FAKE_TICCMD_STATE_DIR"
+
+
+def state_dir():
+    if os.environ.get(STATE_ENV):
+        return Path(os.environ[STATE_ENV])
+    if config.get('simulators.ticcmd.state_dir'):
+        return config.get_path('simulators.ticcmd.state_dir')
+    return project_root / "eeg_stimulus_project" / "simulators" / ".ticcmd_state"
+
+
+def load_transport(path):
+    transport = SimulatedTicTransport()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return transport
+    transport.position = state['position']
+    transport.velocity = state['velocity']
+    transport.target = state['target']
+    transport.energized = state['energized']
+    transport.max_speed = state['max_speed']
+    transport.max_accel = state['max_accel']
+    transport.max_decel = state.get('max_decel', 0)
+    # Let the motor move for the time that passed since the previous invocation
+    transport._last_update = time.monotonic() - max(0.0, time.time() - state['updated_at'])
+    return transport
+
+
+def save_transport(path, transport):
+    state = {
+        'position': transport.position,
+        'velocity': transport.velocity,
+        'target': transport.target,
+        'energized': transport.energized,
+        'max_speed': transport.max_speed,
+        'max_accel': transport.max_accel,
+        'max_decel': transport.max_decel,
+        'updated_at': time.time(),
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def format_status(serial, status):
+    return "\n".join([
+        "Name: Simulated Tic",
+        f"Serial number: {serial}",
+        "Operation state: Normal",
+        f"Energized: {'Yes' if status['energized'] else 'No'}",
+        f"Position uncertain: {'Yes' if status['position_uncertain'] else 'No'}",
+        f"Target position: {status['target']}",
+        f"Current position: {status['position']}",
+        f"Current velocity: {status['velocity']}",
+    ]) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="ticcmd", description="Simulated ticcmd.")
+    parser.add_argument("-d", dest="serial", default="00000000")
+    parser.add_argument("-s", "--status", action="store_true")
+    parser.add_argument("--full", action="store_true")
+    parser.add_argument("--exit-safe-start", action="store_true")
+    parser.add_argument("--resume", action="store_true")
+    parser.add_argument("--reset-command-timeout", action="store_true")
+    parser.add_argument("--position", type=int)
+    parser.add_argument("--halt-and-set-position", type=int)
+    parser.add_argument("--energize", action="store_true")
+    parser.add_argument("--deenergize", action="store_true")
+    parser.add_argument("--max-speed", type=int)
+    parser.add_argument("--max-accel", type=int)
+    parser.add_argument("--max-decel", type=int)
+    parser.add_argument("--step-mode")
+    parser.add_argument("--current", type=int)
+    args = parser.parse_args(argv)
+
+    settings = simulator_settings('ticcmd')
+    simulated_delay(settings.get('latency', 0.0), settings.get('jitter', 0.0))
+
+    directory = state_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{args.serial}.json"
+    transport = load_transport(path)
+    if args.max_speed is not None:
+        transport.set_max_speed(args.max_speed)
+    if args.max_accel is not None:
+        transport.set_max_accel(args.max_accel)
+    if args.max_decel is not None:
+        transport.set_max_decel(args.max_decel)
+    if args.halt_and_set_position is not None:
+        transport.halt_and_set_position(args.halt_and_set_position)
+    if args.deenergize:
+        transport.deenergize()
+    if args.energize or args.resume:
+        transport.energize()
+    if args.position is not None:
+        transport.move_to(args.position)
+    status = transport.read_status()
+    save_transport(path, transport)
+    if args.status:
+        sys.stdout.write(format_status(args.serial, status))
+    return 0
+
+
+def write_launcher(directory=None):
+    """
+    Write an executable that runs this module, for use as a ticcmd_path.
+
+    :return: Path of the launcher (a shell script, or a .bat file on Windows).
+    """
+    directory = Path(directory) if directory else state_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    env_value = str(directory.resolve())
+    if os.name == 'nt':
+        launcher = directory / "ticcmd.bat"
+        launcher.write_text(f'@echo off\r\nset {STATE_ENV}={env_value}\r\nset PYTHONPATH={project_root};%PYTHONPATH%\r\n'
+                            f'"{sys.executable}" -m eeg_stimulus_project.simulators.fake_ticcmd %*\r\n')
+    else:
+        launcher = directory / "ticcmd"
+        launcher.write_text(f'#!/bin/sh\nexport {STATE_ENV}="{env_value}"\nexport PYTHONPATH="{project_root}${{PYTHONPATH:+:$PYTHONPATH}}"\n'
+                            f'exec "{sys.executable}" -m eeg_stimulus_project.simulators.fake_ticcmd "$@"\n')
+        launcher.chmod(launcher.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return str(launcher)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
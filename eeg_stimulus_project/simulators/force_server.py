@@ -0,0 +1,98 @@
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.simulators.common import TCPSimulator, simulator_settings
+
+
+class ForceSimulator(TCPSimulator):
+    """
+    Stand-in for the tactile box Pi: serves "timestamp,force" records on its data port.
+
+    Every client first receives the "time,value" header, then records at sampling_rate, sent
+    chunk_size records at a time like the Pi's script. The force is a noisy baseline with a touch
+    pulse every touch_interval seconds, so the threshold and re-zeroing logic have something to detect.
+
+    :param echo: Also print every record to stdout (the remote script's output read by the supervisor).
+    """
+
+    name = "Tactile force"
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, sampling_rate=100, chunk_size=1,
+                 baseline=0, noise=5.0, touch_interval=5.0, touch_duration=0.5, touch_force=900, echo=False, seed=None):
+        super().__init__(host, port, latency, jitter, seed)
+        self.sampling_rate = sampling_rate
+        self.chunk_size = max(1, int(chunk_size))
+        self.baseline = baseline
+        self.noise = noise
+        self.touch_interval = touch_interval
+        self.touch_duration = touch_duration
+        self.touch_force = touch_force
+        self.echo = echo
+        self.records_sent = 0
+
+    @classmethod
+    def from_config(cls, host=None, port=None, echo=False):
+        settings = simulator_settings('force')
+        return cls(host or settings['host'], settings.get('port', 0) if port is None else port, settings.get('latency', 0.0),
+                   settings.get('jitter', 0.0), settings.get('sampling_rate', 100), settings.get('chunk_size', 1),
+                   touch_interval=settings.get('touch_interval', 5.0), touch_force=settings.get('touch_force', 900),
+                   echo=echo)
+
+    def force_at(self, elapsed):
+        """Simulated force reading elapsed seconds after the client connected."""
+        value = self.baseline + self.rng.gauss(0.0, self.noise)
+        if self.touch_interval and elapsed % self.touch_interval < self.touch_duration:
+            # Half-sine press
+            value += self.touch_force * math.sin(math.pi * (elapsed % self.touch_interval) / self.touch_duration)
+        return int(round(value))
+
+    def handle_connection(self, conn):
+        conn.sendall(b"time,value\n")
+        period = 1.0 / self.sampling_rate
+        started = time.monotonic()
+        index = 0
+        while not self.is_stopped():
+            # Wait until the last record of the chunk has been "measured"
+            due = started + (index + self.chunk_size) * period
+            pause = due - time.monotonic()
+            if pause > 0:
+                time.sleep(pause)
+            now = time.time()
+            lines = []
+            for i in range(self.chunk_size):
+                elapsed = (index + i) * period
+                lines.append(f"{now - (self.chunk_size - 1 - i) * period:.3f},{self.force_at(elapsed)}\n")
+            index += self.chunk_size
+            self.delay()
+            conn.sendall("".join(lines).encode('utf-8'))
+            self.records_sent += len(lines)
+            if self.echo:
+                sys.stdout.write("".join(lines))
+                sys.stdout.flush()
+
+
+def main(argv=None):
+    settings = simulator_settings('force')
+    parser = argparse.ArgumentParser(description="Simulated tactile box force data server.")
+    parser.add_argument("--host", default=settings['host'])
+    parser.add_argument("--port", type=int, default=settings.get('port', 5006))
+    parser.add_argument("--echo", action="store_true", help="print every record, like the Pi script")
+    args = parser.parse_args(argv)
+    server = ForceSimulator.from_config(args.host, args.port, echo=args.echo).start()
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
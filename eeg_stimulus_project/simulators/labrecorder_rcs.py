@@ -0,0 +1,95 @@
+import os
+import re
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.data.xdf_recorder import XDFRecorder, XDFWriter
+from eeg_stimulus_project.simulators.common import TCPSimulator, simulator_settings
+
+FILENAME_COMMAND = re.compile(r"filename \{root:(.*)\} \{template:(.*)\}")
+
+
+class RCSSimulator(TCPSimulator):
+    """
+    Stand-in for LabRecorder's remote control socket (RCS).
+
+    Accepts the line commands LabRecorderRCSClient sends ("update", "select all", "filename {root:..}
+    {template:..}", "start", "stop"). On "start" the XDF file is created: header-only by default, or
+    with the LSL streams on the network recorded by XDFRecorder when record_streams is set.
+
+    :param reply: Answer every command with a bare "OK", as LabRecorder does (set to False to mimic a recorder without replies).
+    :param create_file: Create the XDF file on "start".
+    :param record_streams: Record the visible LSL streams into the file.
+    """
+
+    name = "LabRecorder RCS"
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, reply=True, create_file=True,
+                 record_streams=False, seed=None):
+        super().__init__(host, port, latency, jitter, seed)
+        self.reply = reply
+        self.create_file = create_file
+        self.record_streams = record_streams
+        self.commands = []
+        self.recordings = []
+        self._root = None
+        self._template = None
+        self._recorder = None
+
+    @classmethod
+    def from_config(cls, port=None):
+        settings = simulator_settings('labrecorder')
+        return cls(settings['host'], settings.get('port', 0) if port is None else port, settings.get('latency', 0.0),
+                   settings.get('jitter', 0.0), settings.get('reply', True), record_streams=settings.get('record_streams', False))
+
+    def handle_connection(self, conn):
+        for line in conn.makefile('r', encoding='utf-8'):
+            command = line.strip()
+            if not command:
+                continue
+            self.commands.append(command)
+            self.delay()
+            reply = self.execute(command)
+            if self.reply:
+                # Like LabRecorder, "OK" goes out bare, without a line terminator
+                conn.sendall(reply.encode('utf-8') if reply == "OK" else reply.encode('utf-8') + b"\n")
+
+    def execute(self, command):
+        """Apply one RCS command and return the reply line."""
+        match = FILENAME_COMMAND.match(command)
+        if match:
+            self._root, self._template = match.groups()
+        elif command == "start":
+            if self._root is None:
+                return "Error: no filename set"
+            self._start_file(os.path.join(self._root, self._template))
+        elif command == "stop":
+            self._stop_file()
+        elif command not in ("update", "select all", "select none"):
+            return f"Error: unknown command {command}"
+        return "OK"
+
+    def _start_file(self, path):
+        self._stop_file()
+        if not self.create_file:
+            return
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        if self.record_streams:
+            self._recorder = XDFRecorder(path, stream_names=[])
+            self._recorder.start()
+        else:
+            XDFWriter(path).close()
+        self.recordings.append(path)
+
+    def _stop_file(self):
+        if self._recorder is not None:
+            self._recorder.stop()
+            self._recorder = None
+
+    def stop(self):
+        self._stop_file()
+        super().stop()
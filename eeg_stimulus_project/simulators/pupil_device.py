@@ -0,0 +1,162 @@
+import json
+import struct
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.simulators.common import TCPSimulator, simulated_delay, simulator_settings
+
+
+class TimeEchoSimulator(TCPSimulator):
+    """Time echo service of the Companion app: answers each 8-byte client time (ms) with (client ms, device ms)."""
+
+    name = "Pupil time echo"
+
+    def handle_connection(self, conn):
+        while not self.is_stopped():
+            request = b""
+            while len(request) < 8:
+                data = conn.recv(8 - len(request))
+                if not data:
+                    return
+                request += data
+            self.delay()
+            client_ms = struct.unpack("!Q", request)[0]
+            conn.sendall(struct.pack("!QQ", client_ms, time.time_ns() // 1_000_000))
+
+
+class PupilDeviceSimulator:
+    """
+    Stand-in for a Pupil Labs Companion device speaking the realtime API over HTTP.
+
+    Serves GET /api/status, POST /api/recording:start, /api/recording:stop_and_save, /api/recording:cancel
+    and POST /api/event, plus the time echo service used by estimate_time_offset. Sensor streaming
+    (RTSP) and the status websocket are not simulated.
+
+    :param port: HTTP port (0 picks a free port).
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, device_name="Simulated Neon"):
+        self.host = host
+        self.latency = latency
+        self.jitter = jitter
+        self.device_name = device_name
+        self.device_id = uuid.uuid4().hex[:16]
+        self.recording_id = None
+        self.recording_started = None
+        self.recordings = []
+        self.events = []
+        self._lock = threading.Lock()
+        self.time_echo = TimeEchoSimulator(host, 0, latency, jitter)
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, port=None):
+        settings = simulator_settings('pupil')
+        return cls(settings['host'], settings.get('port', 0) if port is None else port,
+                   settings.get('latency', 0.0), settings.get('jitter', 0.0))
+
+    @property
+    def address(self):
+        return self.host, self.port
+
+    def start(self):
+        self.time_echo.start()
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True, name="PupilDeviceSimulator")
+        self._thread.start()
+        print(f"Pupil Labs simulator listening on {self.host}:{self.port}")
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self.time_echo.stop()
+
+    def status(self):
+        with self._lock:
+            recording_id = self.recording_id
+            duration = int((time.monotonic() - self.recording_started) * 1e9) if recording_id else 0
+        return [
+            {'model': 'Phone', 'data': {
+                'battery_level': 100, 'battery_state': 'OK', 'device_id': self.device_id,
+                'device_name': self.device_name, 'ip': self.host, 'memory': 64_000_000_000,
+                'memory_state': 'OK', 'time_echo_port': self.time_echo.port}},
+            {'model': 'Hardware', 'data': {
+                'version': '2.0', 'glasses_serial': 'sim', 'world_camera_serial': 'sim', 'module_serial': 'sim'}},
+            {'model': 'Sensor', 'data': {
+                'sensor': 'world', 'conn_type': 'DIRECT', 'connected': False, 'ip': self.host,
+                'params': '', 'port': 8086, 'protocol': 'rtsp'}},
+            {'model': 'Sensor', 'data': {
+                'sensor': 'gaze', 'conn_type': 'DIRECT', 'connected': False, 'ip': self.host,
+                'params': '', 'port': 8086, 'protocol': 'rtsp'}},
+            {'model': 'Recording', 'data': {
+                'action': 'START' if recording_id else 'STOP', 'id': recording_id or '',
+                'message': '', 'rec_duration_ns': duration}},
+        ]
+
+    def handle(self, method, path, body):
+        """Return (http_status, message, result) for one API request."""
+        if method == 'GET' and path == '/api/status':
+            return 200, 'Success', self.status()
+        if method != 'POST':
+            return 404, f'Unknown endpoint {path}', None
+        with self._lock:
+            if path == '/api/recording:start':
+                if self.recording_id:
+                    return 400, 'Already recording!', None
+                self.recording_id = str(uuid.uuid4())
+                self.recording_started = time.monotonic()
+                return 200, 'Started recording', {'id': self.recording_id}
+            if path in ('/api/recording:stop_and_save', '/api/recording:cancel'):
+                if not self.recording_id:
+                    return 400, 'Recording not running', None
+                if path.endswith('stop_and_save'):
+                    self.recordings.append(self.recording_id)
+                self.recording_id = None
+                return 200, 'Recording stopped', None
+            if path == '/api/event':
+                timestamp = body.get('timestamp') or time.time_ns()
+                event = {'name': body.get('name'), 'recording_id': self.recording_id, 'timestamp': timestamp}
+                self.events.append(event)
+                return 200, 'Event received', event
+        return 404, f'Unknown endpoint {path}', None
+
+    def _make_handler(self):
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self, method):
+                length = int(self.headers.get('Content-Length') or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                except ValueError:
+                    body = {}
+                simulated_delay(simulator.latency, simulator.jitter)
+                status, message, result = simulator.handle(method, self.path, body)
+                payload = json.dumps({'message': message, 'result': result}).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._respond('GET')
+
+            def do_POST(self):
+                self._respond('POST')
+
+            def log_message(self, format, *args):
+                pass  # Keep the console quiet
+
+        return Handler
@@ -0,0 +1,119 @@
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.config import config
+from eeg_stimulus_project.simulators.common import simulator_settings
+from eeg_stimulus_project.simulators.fake_ticcmd import state_dir, write_launcher
+from eeg_stimulus_project.simulators.force_server import ForceSimulator
+from eeg_stimulus_project.simulators.labrecorder_rcs import RCSSimulator
+from eeg_stimulus_project.simulators.pupil_device import PupilDeviceSimulator
+
+DEVICES = ('labrecorder', 'force', 'ticcmd', 'pupil')
+
+
+def apply_simulator_config(ports=None, force_in_process=False):
+    """
+    Point every device connection of this process at the simulators.
+
+    :param ports: Ports actually used, by device name (defaults to the configured simulators.<device>.port).
+    :param force_in_process: The force server already runs in this process; otherwise the tactile
+                             supervisor starts it locally in place of the SSH session to the Pi.
+    """
+    ports = dict(ports or {})
+    host = config.get('simulators.host', '127.0.0.1')
+
+    def port(device, default):
+        return ports.get(device) or simulator_settings(device).get('port') or default
+
+    config.set('hardware.eeg.labrecorder_host', host)
+    config.set('network.labrecorder_port', port('labrecorder', 22345))
+
+    config.set('network.tactile_system.host', host)
+    config.set('network.tactile_system.data_port', port('force', 5006))
+    if not force_in_process:
+        config.set('network.tactile_system.local_command',
+                   [sys.executable, "-m", "eeg_stimulus_project.simulators.force_server",
+                    "--host", host, "--port", str(port('force', 5006)), "--echo"])
+
+    launcher = write_launcher(state_dir())
+    config.set('hardware.motors.backend', 'ticcmd')
+    config.set('hardware.motors.turntable.ticcmd_path', launcher)
+    config.set('hardware.motors.door.ticcmd_path', launcher)
+
+    config.set('hardware.eye_tracker.host', host)
+    config.set('hardware.eye_tracker.port', port('pupil', 8080))
+
+
+class SimulatorSuite:
+    """
+    Starts local stand-ins for the lab hardware, for benchmarks and testing off the rig.
+
+    Usable as a context manager; apply_config() then redirects LabRecorder, the tactile data port,
+    the Tic motors and the Pupil Labs device of the current process to the simulators.
+
+    :param devices: Devices to simulate (defaults to all of DEVICES).
+    :param use_configured_ports: Listen on simulators.<device>.port instead of free ports.
+    """
+
+    def __init__(self, devices=None, use_configured_ports=False):
+        self.devices = list(DEVICES if devices is None else devices)
+        self.use_configured_ports = use_configured_ports
+        self.servers = {}
+        self.ticcmd_path = None
+
+    def _port(self, device):
+        return simulator_settings(device).get('port', 0) if self.use_configured_ports else 0
+
+    def start(self):
+        if 'labrecorder' in self.devices:
+            self.servers['labrecorder'] = RCSSimulator.from_config(port=self._port('labrecorder')).start()
+        if 'force' in self.devices:
+            self.servers['force'] = ForceSimulator.from_config(port=self._port('force')).start()
+        if 'pupil' in self.devices:
+            self.servers['pupil'] = PupilDeviceSimulator.from_config(port=self._port('pupil')).start()
+        if 'ticcmd' in self.devices:
+            self.ticcmd_path = write_launcher(state_dir())
+        return self
+
+    @property
+    def ports(self):
+        return {device: server.port for device, server in self.servers.items()}
+
+    def apply_config(self):
+        apply_simulator_config(self.ports, force_in_process='force' in self.servers)
+
+    def stop(self):
+        for server in self.servers.values():
+            server.stop()
+        self.servers = {}
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Run the hardware simulators on their configured ports.")
+    parser.add_argument("--devices", nargs="*", choices=DEVICES, default=list(DEVICES))
+    args = parser.parse_args(argv)
+    suite = SimulatorSuite(args.devices, use_configured_ports=True).start()
+    if suite.ticcmd_path:
+        print(f"Simulated ticcmd: {suite.ticcmd_path}")
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        suite.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""
+Supervisor for the remote tactile force script.
+
+Runs the script through a channel factory (an SSH session on the Raspberry Pi in
+production, a local subprocess in tests), blocks on channel readiness with select
+instead of spinning on recv_ready(), forwards output in batches, and restarts the
+script automatically when it exits or stops producing output.
+"""
+
+import codecs
+import select
+import socket
+import subprocess
+import threading
+import time
+
+
+class LocalProcessChannel:
+    """
+    Stand-in for a paramiko Channel backed by a local subprocess.
+
+    Output is copied onto one end of a socket pair so the channel can be passed to
+    select() on every platform, exactly like a paramiko Channel.
+    """
+
+    def __init__(self, command):
+        self.process = subprocess.Popen(
+            command,
+            shell=isinstance(command, str),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0
+        )
+        self._reader, self._writer = socket.socketpair()
+        self._pump_thread = threading.Thread(target=self._pump, daemon=True)
+        self._pump_thread.start()
+
+    def _pump(self):
+        try:
+            while True:
+                data = self.process.stdout.read1(4096) if hasattr(self.process.stdout, 'read1') else self.process.stdout.read(4096)
+                if not data:
+                    break
+                self._writer.sendall(data)
+        except OSError:
+            pass
+        finally:
+            try:
+                self._writer.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+
+    def fileno(self):
+        return self._reader.fileno()
+
+    def recv(self, nbytes):
+        return self._reader.recv(nbytes)
+
+    def recv_ready(self):
+        ready, _, _ = select.select([self._reader], [], [], 0)
+        return bool(ready)
+
+    def exit_status_ready(self):
+        return self.process.poll() is not None
+
+    def recv_exit_status(self):
+        return self.process.wait()
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        for sock in (self._reader, self._writer):
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+
+class RemoteScriptSupervisor:
+    """
+    Keeps the remote tactile script running and streams its output.
+
+    :param channel_factory: Callable returning a started channel (fileno/recv/exit_status_ready/close).
+    :param output_callback: Called with decoded output text, one call per batch.
+    :param on_started: Optional callable invoked with the restart count each time the script (re)starts.
+    :param batch_interval: Seconds of output to coalesce before forwarding a batch.
+    :param heartbeat_timeout: Seconds without any output before the script is considered hung.
+    :param max_restarts: Automatic restarts allowed before giving up.
+    :param restart_backoff: Base delay in seconds between restarts (multiplied by the attempt number).
+    """
+
+    def __init__(self, channel_factory, output_callback, on_started=None, batch_interval=0.1,
+                 max_batch_bytes=65536, heartbeat_timeout=10.0, max_restarts=3, restart_backoff=1.0):
+        self.channel_factory = channel_factory
+        self.output_callback = output_callback
+        self.on_started = on_started
+        self.batch_interval = batch_interval
+        self.max_batch_bytes = max_batch_bytes
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_restarts = max_restarts
+        self.restart_backoff = restart_backoff
+
+        self.restarts = 0
+        self.state = "idle"
+        self.last_output_time = None
+        self.last_exit_status = None
+        self._channel = None
+        self._channel_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start supervising in a background thread."""
+        if self.is_running():
+            return
+        self._stop_event.clear()
+        self.restarts = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Stop the remote script and do not restart it."""
+        self._stop_event.set()
+        self._close_channel()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self.state = "stopped"
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def status(self):
+        """Return a snapshot of the supervisor's health information."""
+        return {
+            'state': self.state,
+            'restarts': self.restarts,
+            'last_output_age': None if self.last_output_time is None else time.monotonic() - self.last_output_time,
+            'last_exit_status': self.last_exit_status,
+        }
+
+    def _emit(self, text):
+        try:
+            self.output_callback(text)
+        except Exception as e:
+            print(f"Remote supervisor output callback failed: {e}")
+
+    def _close_channel(self):
+        with self._channel_lock:
+            channel, self._channel = self._channel, None
+        if channel is not None:
+            try:
+                channel.close()
+            except Exception:
+                pass
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self.state = "starting"
+            try:
+                channel = self.channel_factory()
+            except Exception as e:
+                self._emit(f"[ERROR] Failed to start remote script: {e}\n")
+            else:
+                with self._channel_lock:
+                    self._channel = channel
+                self.state = "running"
+                if self.on_started is not None:
+                    try:
+                        self.on_started(self.restarts)
+                    except Exception as e:
+                        self._emit(f"[ERROR] Remote script start callback failed: {e}\n")
+                reason = self._pump(channel)
+                self._close_channel()
+                if self._stop_event.is_set():
+                    break
+                self._emit(f"[INFO] Remote script ended ({reason}).\n")
+
+            if self._stop_event.is_set():
+                break
+            if self.restarts >= self.max_restarts:
+                self._emit(f"[ERROR] Remote script failed {self.restarts + 1} times, giving up.\n")
+                self.state = "failed"
+                return
+            self.restarts += 1
+            delay = self.restart_backoff * self.restarts
+            self._emit(f"[INFO] Restarting remote script in {delay:.1f} s (attempt {self.restarts}/{self.max_restarts}).\n")
+            self.state = "restarting"
+            self._stop_event.wait(delay)
+        self.state = "stopped"
+        self._emit("[INFO] Remote script stopped.\n")
+
+    def _pump(self, channel):
+        """Forward output until the channel closes, the script exits or the heartbeat is lost."""
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        batch = []
+        batch_bytes = 0
+        batch_started = None
+        self.last_output_time = time.monotonic()
+
+        def flush():
+            nonlocal batch, batch_bytes, batch_started
+            if batch:
+                text = decoder.decode(b"".join(batch))
+                if text:
+                    self._emit(text)
+            batch, batch_bytes, batch_started = [], 0, None
+
+        reason = "channel closed"
+        while not self._stop_event.is_set():
+            try:
+                ready, _, _ = select.select([channel], [], [], self.batch_interval)
+            except (OSError, ValueError):
+                break
+            now = time.monotonic()
+            if ready:
+                try:
+                    data = channel.recv(4096)
+                except OSError:
+                    break
+                if not data:
+                    break
+                batch.append(data)
+                batch_bytes += len(data)
+                if batch_started is None:
+                    batch_started = now
+                self.last_output_time = now
+            if batch and (not ready or batch_bytes >= self.max_batch_bytes or now - batch_started >= self.batch_interval):
+                flush()
+            if not ready and channel.exit_status_ready():
+                break
+            if now - self.last_output_time > self.heartbeat_timeout:
+                reason = f"no output for {self.heartbeat_timeout:.0f} s"
+                flush()
+                return reason
+        flush()
+        # The exit status usually arrives just after the end of the output
+        deadline = time.monotonic() + 1.0
+        while not channel.exit_status_ready() and time.monotonic() < deadline:
+            if self._stop_event.wait(0.01):
+                break
+        if channel.exit_status_ready():
+            try:
+                self.last_exit_status = channel.recv_exit_status()
+                reason = f"exit status {self.last_exit_status}"
+            except Exception:
+                pass
+        return reason
@@ -17,6 +17,12 @@ project_root = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from eeg_stimulus_project.config import config
+from eeg_stimulus_project.lsl.force_stream import TactileForceStream, parse_force_records
+from eeg_stimulus_project.stimulus.tactile_box_code.remote_supervisor import LocalProcessChannel, RemoteScriptSupervisor
+from pylsl import local_clock
+
+# Size of each read from the Pi's data port
+RECV_BUFFER_SIZE = 16384
 
 # SSH connection info - load from configuration
 def get_ssh_config():
@@ -39,47 +45,63 @@ remote_venv_activate = ssh_config['venv_activate']
 remote_script = ssh_config['script_path']
 
 ssh_client = None
-remote_channel = None
+supervisor = None
 output_queue = queue.Queue()
 
-def start_remote_script(local_script_callback): 
-    def task():
-        global ssh_client, remote_channel
+def open_remote_channel():
+    """Open an SSH session on the Pi and start the force script, closing any previous session."""
+    global ssh_client
+    close_ssh_client()
+    # A configured local command (e.g. the force simulator) replaces the script on the Pi
+    local_command = config.get('network.tactile_system.local_command')
+    if local_command:
+        return LocalProcessChannel(local_command)
+    ssh_client = paramiko.SSHClient()
+    ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    ssh_client.connect(ssh_host, username=ssh_user, password=ssh_password)
+
+    remote_command = f"{remote_venv_activate} && {remote_script}"
+    channel = ssh_client.get_transport().open_session()
+    channel.get_pty()
+    channel.exec_command(remote_command)
+    return channel
+
+def close_ssh_client():
+    global ssh_client
+    if ssh_client is not None:
         try:
-            ssh_client = paramiko.SSHClient()
-            ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            ssh_client.connect(ssh_host, username=ssh_user, password=ssh_password)
-
-            remote_command = f"{remote_venv_activate} && {remote_script}"
-            remote_channel = ssh_client.get_transport().open_session()
-            remote_channel.get_pty()
-            remote_channel.exec_command(remote_command)
-
-
-            while True:
-                if remote_channel.recv_ready():
-                    data = remote_channel.recv(1024).decode()
-                    output_queue.put(data)
-                if remote_channel.exit_status_ready():
-                    break
-
             ssh_client.close()
-            output_queue.put("[INFO] Remote script ended.\n")
-        except Exception as e:
-            output_queue.put(f"[ERROR] Failed to start remote script: {e}\n")
-
-    threading.Thread(target=task, daemon=True).start()
+        except Exception:
+            pass  # Ignore errors if already closed
+        ssh_client = None
+
+def start_remote_script(local_script_callback, channel_factory=open_remote_channel):
+    """
+    Start the remote script under a supervisor. The local receiver is started each time the
+    remote script (re)starts and retries its connection until the Pi's data port is up.
+    """
+    global supervisor
+    if supervisor is not None and supervisor.is_running():
+        output_queue.put("[INFO] Remote script is already running.\n")
+        return
+
+    def on_started(restart_count):
+        threading.Thread(target=local_script_callback, args=(restart_count > 0,), daemon=True).start()
+
+    supervisor = RemoteScriptSupervisor(
+        channel_factory,
+        output_queue.put,
+        on_started=on_started,
+        heartbeat_timeout=config.get('network.tactile_system.heartbeat_timeout', 10),
+        max_restarts=config.get('network.tactile_system.max_restarts', 3)
+    )
     print("Attempting to remote in to the Raspberry Pi...")
-    time.sleep(5)  # Allow time for the thread to start
-    local_script_callback()
+    supervisor.start()
 
 def stop_remote_script():
-    global remote_channel
-    if remote_channel is not None:
-        try:
-            remote_channel.close()
-        except Exception:
-            pass  # Ignore errors if already closed
+    if supervisor is not None:
+        supervisor.stop()
+        close_ssh_client()
         output_queue.put("[INFO] Remote script manually stopped.\n")
 
 class RemoteScriptGUI(QMainWindow):
@@ -108,8 +130,9 @@ class RemoteScriptGUI(QMainWindow):
         self.last_rezero_time = time.time()
 
         self.lsl_enabled = self.shared_status['lsl_enabled']
+        self.status_sequence = self.shared_status.sequence
 
-        # Timer to sync lsl_enabled with shared_status
+        # Timer to sync lsl_enabled with shared_status (a local memory read until something changes)
         self.sync_timer = QTimer()
         self.sync_timer.timeout.connect(self.sync_lsl_enabled)
         self.sync_timer.start(200)  # Check every 200 ms
@@ -160,6 +183,7 @@ class RemoteScriptGUI(QMainWindow):
         self.timer.start(300)
 
         self.connected = False
+        self.force_stream = None
 
     #def connect_label_socket(self):
     #    """Establish a persistent connection to the control window for label sending."""
@@ -182,10 +206,23 @@ class RemoteScriptGUI(QMainWindow):
 
     def start_script(self):
         self.status_label.setText("Status: Starting remote script...")
-        threading.Thread(target=lambda: start_remote_script(self.start_local_script), daemon=True).start()
+        start_remote_script(self.start_local_script)
         #start_remote_script(on_success=lambda: self.send_label_to_control("tactile_started"))
 
-    def start_local_script(self):
+    def connect_data_port(self, host, port, timeout):
+        """Connect to the Pi's data port, retrying until the remote script has opened it."""
+        deadline = time.monotonic() + timeout
+        delay = 0.1
+        while True:
+            try:
+                return socket.create_connection((host, port), timeout=2)
+            except OSError:
+                if time.monotonic() + delay > deadline:
+                    raise
+                time.sleep(delay)
+                delay = min(delay * 2, 1.0)
+
+    def start_local_script(self, append=False):
         # Get configuration values
         ssh_config = get_ssh_config()
         PI_IP = ssh_config['host']
@@ -193,21 +230,39 @@ class RemoteScriptGUI(QMainWindow):
         
         # Get output filename from configuration
         output_file = config.get_absolute_path('paths.tactile_data_file')
-        
+
+        # Publish the force readings on LSL so they are recorded in the XDF with the EEG
+        if self.force_stream is None:
+            try:
+                self.force_stream = TactileForceStream()
+            except Exception as e:
+                print(f"Could not create tactile LSL stream, saving to file only: {e}")
+        force_stream = self.force_stream
+
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.connect((PI_IP, PORT))
-                with open(output_file, "wb") as f:
+            with self.connect_data_port(PI_IP, PORT, config.get('network.timeout', 30)) as s:
+                s.settimeout(None)
+                # Buffer the raw copy on disk instead of writing every recv straight through
+                with open(output_file, "ab" if append else "wb", buffering=RECV_BUFFER_SIZE * 4) as f:
                     print(f"Connected to {PI_IP}:{PORT}. Receiving data...")
                     self.send_label_to_control("tactile_connected")
+                    pending = b""
                     while True:
-                        data = s.recv(1024)
+                        data = s.recv(RECV_BUFFER_SIZE)
                         if not data:
                             break
+                        receive_time = local_clock()
                         f.write(data)
+                        records, pending = parse_force_records(pending + data)
+                        if force_stream is not None and records:
+                            force_stream.push_records(records, receive_time)
             print(f"All data saved to {output_file}")
+            if force_stream is not None:
+                print(f"Pushed {force_stream.samples_pushed} force samples to LSL")
         except KeyboardInterrupt:
-            print("Connection terminated by user.")  
+            print("Connection terminated by user.")
+        except OSError as e:
+            output_queue.put(f"[ERROR] Could not receive tactile data from {PI_IP}:{PORT}: {e}\n")
 
     def stop_script(self):
         self.status_label.setText("Status: Stopping remote script...")
@@ -301,7 +356,11 @@ class RemoteScriptGUI(QMainWindow):
         #    #threading.Thread(target=self.connect_label_socket, daemon=True).start()
 
     def sync_lsl_enabled(self):
-        # Update local variable from shared dict
+        # Update local variable from the shared status when any flag changed
+        sequence = self.shared_status.sequence
+        if sequence == self.status_sequence:
+            return
+        self.status_sequence = sequence
         new_val = self.shared_status.get('lsl_enabled', False)
         if self.lsl_enabled != new_val:
             self.lsl_enabled = new_val
@@ -314,11 +373,9 @@ def run_tactile_setup(shared_status, connection):
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
-    from multiprocessing import Manager
+    from eeg_stimulus_project.utils.shared_status import SharedStatus
     app = QApplication(sys.argv)
-    manager = Manager()
-    shared_status = manager.dict()
-    shared_status['lsl_enabled'] = False
+    shared_status = SharedStatus()
     window = RemoteScriptGUI(shared_status)
     window.show()
     sys.exit(app.exec_())
@@ -0,0 +1,155 @@
+"""
+Object-to-bay assignment that minimizes turntable travel for a given test order.
+
+Bays are numbered 1..num_bays like in the GUI. The turntable homes at bay 1 and always takes the
+shortest direction, so the cost of a trial is the circular distance between consecutive bays.
+The stimulus order itself is never changed, only where each object sits on the table.
+"""
+
+from collections import Counter
+from itertools import permutations
+
+from eeg_stimulus_project.stimulus.turn_table_code.motion_planner import predict_move_time
+
+
+def circular_distance(bay_a, bay_b, num_bays=16):
+    """Number of bay intervals between two bays along the shortest direction."""
+    diff = abs(bay_a - bay_b) % num_bays
+    return min(diff, num_bays - diff)
+
+
+def total_travel(test_order, object_to_bay, num_bays=16, home_bay=1):
+    """
+    Total number of bay intervals the turntable travels to present a test order.
+
+    :param test_order: Object names in presentation order (repetitions allowed).
+    :param object_to_bay: Mapping of object name to bay number; unassigned objects are skipped.
+    :param home_bay: Bay the table is at when the block starts.
+    """
+    travel = 0
+    current = home_bay
+    for object_name in test_order:
+        bay = object_to_bay.get(object_name)
+        if bay is None:
+            continue
+        travel += circular_distance(current, bay, num_bays)
+        current = bay
+    return travel
+
+
+def _transition_weights(test_order):
+    """Count how often each unordered pair of objects (or home and an object) is presented back to back."""
+    weights = Counter()
+    previous = None
+    for object_name in test_order:
+        if previous != object_name:
+            weights[frozenset((previous, object_name)) if previous is not None else ('home', object_name)] += 1
+        previous = object_name
+    return weights
+
+
+def _cost(weights, bays, home_bay, num_bays):
+    cost = 0
+    for pair, count in weights.items():
+        if isinstance(pair, tuple):
+            cost += count * circular_distance(home_bay, bays[pair[1]], num_bays)
+        else:
+            a, b = tuple(pair)
+            cost += count * circular_distance(bays[a], bays[b], num_bays)
+    return cost
+
+
+def optimize_bay_assignment(test_order, num_bays=16, home_bay=1, exact_limit=7, max_rounds=100):
+    """
+    Assign every object in a test order to a distinct bay so the total rotation is minimal.
+
+    Up to exact_limit objects, every arrangement of the objects on the bays nearest home is tried.
+    Larger sets start from a greedy arrangement (most frequent transitions placed closest together).
+    Both are then refined by swapping objects with each other and with empty bays until no swap helps.
+
+    :param test_order: Object names in presentation order (repetitions allowed).
+    :param num_bays: Number of bays on the turntable.
+    :param home_bay: Bay the table is at when the block starts.
+    :return: Dict mapping each object name to a bay number (1..num_bays).
+    """
+    objects = list(dict.fromkeys(test_order))
+    if len(objects) > num_bays:
+        raise ValueError(f"{len(objects)} objects do not fit on {num_bays} bays")
+    if not objects:
+        return {}
+    weights = _transition_weights(test_order)
+
+    # Bays ordered by distance from home: home, home+1, home-1, home+2, ...
+    nearby = sorted(range(1, num_bays + 1), key=lambda bay: (circular_distance(home_bay, bay, num_bays), bay))
+
+    if len(objects) <= exact_limit:
+        candidates = nearby[:len(objects)]
+        best = None
+        best_cost = None
+        for arrangement in permutations(candidates):
+            bays = dict(zip(objects, arrangement))
+            cost = _cost(weights, bays, home_bay, num_bays)
+            if best_cost is None or cost < best_cost:
+                best, best_cost = bays, cost
+    else:
+        # Greedy start: the first presented object goes home, then each object goes next to its strongest neighbour
+        best = {objects[0]: home_bay}
+        free = [bay for bay in nearby if bay != home_bay]
+        for object_name in objects[1:]:
+            def pull(bay):
+                return sum(count * circular_distance(bay, best[other], num_bays)
+                           for pair, count in weights.items() if not isinstance(pair, tuple) and object_name in pair
+                           for other in pair if other != object_name and other in best)
+            bay = min(free, key=pull)
+            free.remove(bay)
+            best[object_name] = bay
+        best_cost = _cost(weights, best, home_bay, num_bays)
+
+    # Local search: swap two objects, or move an object to an empty bay
+    for _ in range(max_rounds):
+        improved = False
+        for i, obj in enumerate(objects):
+            trials = []
+            for other in objects[i + 1:]:
+                trial = dict(best)
+                trial[obj], trial[other] = best[other], best[obj]
+                trials.append(trial)
+            used = set(best.values())
+            for bay in range(1, num_bays + 1):
+                if bay not in used:
+                    trial = dict(best)
+                    trial[obj] = bay
+                    trials.append(trial)
+            for trial in trials:
+                cost = _cost(weights, trial, home_bay, num_bays)
+                if cost < best_cost:
+                    best, best_cost = trial, cost
+                    improved = True
+                    break
+        if not improved:
+            break
+    return best
+
+
+def expected_block_duration(test_order, object_to_bay, num_bays=16, home_bay=1, interval_steps=200,
+                            max_speed=6000000, max_accel=4000000, trial_overhead=0.0):
+    """
+    Predict the turntable time for one block of a test order.
+
+    :param interval_steps: Steps between neighbouring bays (TurntableController.interval_steps).
+    :param max_speed: Tic max speed setting used for the turntable.
+    :param max_accel: Tic max acceleration setting used for the turntable.
+    :param trial_overhead: Seconds added per trial for everything that is not rotation (doors, display).
+    :return: Predicted duration in seconds.
+    """
+    duration = 0.0
+    current = home_bay
+    for object_name in test_order:
+        duration += trial_overhead
+        bay = object_to_bay.get(object_name)
+        if bay is None:
+            continue
+        distance = circular_distance(current, bay, num_bays)
+        duration += predict_move_time(distance * interval_steps, max_speed, max_accel)
+        current = bay
+    return duration
@@ -1,52 +1,89 @@
-# Uses ticcmd to send and receive data from the Tic over USB.
+# Drives the door Tic through the persistent TicDriver (native USB when available, ticcmd otherwise).
 #
 # NOTE: The Tic's control mode must be "Serial / I2C / USB"
 # in order to set the target position over USB.
 
-import subprocess
-import yaml
-import time
+from concurrent.futures import Future
+
+from eeg_stimulus_project.config import config
+from eeg_stimulus_project.stimulus.turn_table_code.tic_driver import TicDriver, create_transport
 
 class DoorController:
-    def __init__(self, device_id='00475502', move_steps=-400):
-        self.device_id = device_id
+    def __init__(self, device_id=None, move_steps=-400, driver=None, move_timeout=5):
+        settings = config.get('hardware.motors.door', {})
+        self.device_id = device_id or settings.get('device_id', '00475502')
         self.move_steps = move_steps
+        self.move_timeout = move_timeout
+        self.driver = driver or TicDriver(create_transport(self.device_id, settings.get('ticcmd_path', 'ticcmd')), name="Door")
         self.set_motor_parameters()
         self.home()
 
-    def ticcmd(self, *args):
-        return subprocess.check_output(['ticcmd', '-d', self.device_id] + list(args))
-
     def get_position(self):
-        status = yaml.safe_load(self.ticcmd('-s', '--full'))
-        return status['Current position']
+        return self.driver.refresh_status().result()['position']
 
     #DO NOT MODIFY THESE PARAMETERS WITHOUT DEEP UNDERSTANING OF THE MOTOR AND CONTROLLER
     def set_motor_parameters(self):
         print("Setting motor parameters...")
-        self.ticcmd('--current', '1920')
-        self.ticcmd('--step-mode', '8')
-        self.ticcmd('--max-speed', '500000000')
-        self.ticcmd('--max-accel', '100000') # Max of 100000, DON'T GO HIGHER THAN THIS
+        self.driver.set_current_limit(1920)
+        self.driver.set_step_mode(8)
+        self.driver.set_max_speed(500000000)
+        self.driver.set_max_accel(100000).result() # Max of 100000, DON'T GO HIGHER THAN THIS
+        # Braking is left to the controller's own setting unless max_decel is configured
+        max_decel = config.get('hardware.motors.door.max_decel')
+        if max_decel is not None:
+            self.driver.set_max_decel(max_decel).result()
 
     def home(self):
         print("Homing to position 0...")
-        self.ticcmd('--halt-and-set-position', '0')
+        self.driver.halt_and_set_position(0)
         current_pos = self.get_position()
         print(f"Current motor position after homing: {current_pos}")
 
-    def open(self):
-        self.ticcmd('--energize')
+    def _move_and_release(self, position, callback=None):
+        """
+        Energize, move to position and de-energize once the controller reports the move finished.
+        Returns a Future resolved after the motor is de-energized; callback is attached to it.
+        """
+        done = Future()
+        if callback is not None:
+            done.add_done_callback(callback)
+
+        def release(move_future):
+            error = move_future.exception() if not move_future.cancelled() else None
+            if error is not None:
+                print(f"Door move did not complete: {error}")
+            self.driver.deenergize().add_done_callback(lambda _: finish(error))
+
+        def finish(error):
+            print("Motor de-energized.")
+            if error is not None:
+                done.set_exception(error)
+            else:
+                done.set_result(position)
+
+        self.driver.energize()
+        self.driver.move_to(position, timeout=self.move_timeout, callback=release)
+        return done
+
+    def open_async(self, callback=None):
         print(f"Opening by {self.move_steps} steps...")
-        self.ticcmd('--exit-safe-start', '--position', str(self.move_steps))
-        time.sleep(2)
-        self.ticcmd('--deenergize')
-        print("Motor de-energized.")
+        return self._move_and_release(self.move_steps, callback)
 
-    def close(self):
-        self.ticcmd('--energize')
+    def close_async(self, callback=None):
         print("Closing (moving to 0)...")
-        self.ticcmd('--exit-safe-start', '--position', '0')
-        time.sleep(2)
-        self.ticcmd('--deenergize')
-        print("Motor de-energized.")
\ No newline at end of file
+        return self._move_and_release(0, callback)
+
+    def open(self):
+        return self._wait(self.open_async())
+
+    def close(self):
+        return self._wait(self.close_async())
+
+    def _wait(self, future):
+        try:
+            return future.result(self.move_timeout + 2)
+        except Exception as e:
+            print(f"Warning: door move failed: {e}")
+
+    def shutdown(self):
+        self.driver.close()
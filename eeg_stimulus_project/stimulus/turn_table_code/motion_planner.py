@@ -0,0 +1,101 @@
+"""
+Look-ahead motion planning for the viewing booth turntable.
+
+The planner starts the move to the next object's bay as soon as the doors close, so the rotation
+overlaps the crosshair and craving screens instead of adding to the inter-trial interval, and it
+predicts when the table will be ready so the stimulus schedule can wait only as long as needed.
+"""
+
+import math
+import time
+
+from eeg_stimulus_project.stimulus.turn_table_code.tic_driver import pulses_per_second, pulses_per_second_squared
+
+
+def predict_move_time(steps, max_speed, max_accel):
+    """
+    Predict how long a Tic takes to travel a number of steps with a trapezoidal velocity profile.
+
+    :param steps: Distance in steps (sign is ignored).
+    :param max_speed: Tic max speed setting (pulses per 10000 s).
+    :param max_accel: Tic max acceleration setting (pulses per second per 100 s).
+    :return: Travel time in seconds.
+    """
+    distance = abs(steps)
+    if distance == 0:
+        return 0.0
+    speed = pulses_per_second(max_speed)
+    accel = pulses_per_second_squared(max_accel)
+    if distance >= speed * speed / accel:
+        # Accelerate to cruising speed, cruise, decelerate
+        return distance / speed + speed / accel
+    # Triangular profile: the move ends before cruising speed is reached
+    return 2 * math.sqrt(distance / accel)
+
+
+class MotionPlanner:
+    """
+    Prefetches turntable moves and tracks when the table will be at its target bay.
+
+    :param controller: TurntableController used to issue the moves.
+    :param settle_time: Seconds added to every prediction for command latency and status polling.
+    """
+
+    def __init__(self, controller, settle_time=0.05):
+        self.controller = controller
+        self.settle_time = settle_time
+        self.pending_bay = None
+        self.pending_future = None
+        self.ready_at = None
+
+    def predict_bay_move(self, from_bay, to_bay):
+        """Predicted seconds to move between two bays (0-based indices)."""
+        steps = self.controller.steps_between(from_bay, to_bay)
+        if steps == 0:
+            return 0.0
+        return predict_move_time(steps, self.controller.max_speed, self.controller.max_accel) + self.settle_time
+
+    def schedule(self, test_order, object_to_bay, start_bay=0):
+        """
+        Predict the move time before each trial of a test order.
+
+        :param test_order: Object names in presentation order.
+        :param object_to_bay: Mapping of object name to 1-based bay number.
+        :param start_bay: 0-based bay the table starts at.
+        :return: List of predicted move times in seconds, one per trial (0 for unassigned objects).
+        """
+        times = []
+        current = start_bay
+        for object_name in test_order:
+            bay = object_to_bay.get(object_name)
+            if bay is None:
+                times.append(0.0)
+                continue
+            times.append(self.predict_bay_move(current, bay - 1))
+            current = bay - 1
+        return times
+
+    def prefetch(self, bay_index, callback=None):
+        """
+        Make sure the table is on its way to bay_index (0-based) and return the move Future.
+
+        A move already heading to the same bay is reused, so calling this again when the trial starts
+        only attaches the callback. A move that failed or was cancelled is issued again.
+        """
+        failed = (self.pending_future is not None and self.pending_future.done()
+                  and (self.pending_future.cancelled() or self.pending_future.exception() is not None))
+        if (failed or self.pending_future is None or self.pending_bay != bay_index
+                or self.controller.current_bay != bay_index):
+            predicted = self.predict_bay_move(self.controller.current_bay, bay_index)
+            self.ready_at = time.monotonic() + predicted
+            self.pending_bay = bay_index
+            self.pending_future = self.controller.move_to_bay(bay_index, wait=False)
+        if callback is not None:
+            self.pending_future.add_done_callback(callback)
+        return self.pending_future
+
+    def ready_in_ms(self):
+        """Predicted milliseconds until the prefetched move finishes (0 when the table is idle)."""
+        if self.pending_future is None or self.pending_future.done():
+            return 0
+        return max(0, int((self.ready_at - time.monotonic()) * 1000))
@@ -4,6 +4,8 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QFont, QIntValidator, QPalette, QColor
 from PyQt5.QtCore import Qt
 
+from eeg_stimulus_project.stimulus.turn_table_code.bay_optimizer import optimize_bay_assignment, expected_block_duration
+
 class ObjectToBayDialog(QDialog):
     def __init__(self, object_names, num_bays=16, parent=None):
         super().__init__(parent)
@@ -67,9 +69,33 @@ class ObjectToBayDialog(QDialog):
         scroll.setWidget(scroll_content)
         main_layout.addWidget(scroll, stretch=1)
 
+        # Predicted turntable time for the current assignments
+        self.duration_label = QLabel("")
+        self.duration_label.setFont(QFont("Segoe UI", 12))
+        self.duration_label.setAlignment(Qt.AlignCenter)
+        self.duration_label.setStyleSheet("color: #000000;")
+        main_layout.addWidget(self.duration_label)
+
         # Button row
         btn_layout = QHBoxLayout()
         btn_layout.addStretch()
+        auto_btn = QPushButton("Auto-Assign")
+        auto_btn.setFont(QFont("Segoe UI", 14))
+        auto_btn.setToolTip("Assign bays that minimize turntable rotation for this test order")
+        auto_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #64b5f6;
+                color: white;
+                border-radius: 8px;
+                padding: 10px 32px;
+            }
+            QPushButton:hover {
+                background-color: #1976d2;
+            }
+        """)
+        auto_btn.clicked.connect(self.auto_assign)
+        btn_layout.addWidget(auto_btn)
+
         self.ok_btn = QPushButton("OK")
         self.ok_btn.setFont(QFont("Segoe UI", 14, QFont.Bold))
         self.ok_btn.setStyleSheet("""
@@ -134,6 +160,21 @@ class ObjectToBayDialog(QDialog):
                 used_bays.add(int(text))
             edit.setPalette(palette)
         self.ok_btn.setEnabled(valid)
+        if valid:
+            duration = expected_block_duration(self.object_names, self.get_assignments(), num_bays=self.num_bays)
+            self.duration_label.setText(f"Expected turntable travel per block: {duration:.1f} s")
+        else:
+            self.duration_label.setText("")
+
+    def auto_assign(self):
+        # Fill in the assignment that minimizes total rotation for the test order (order itself is unchanged)
+        try:
+            assignments = optimize_bay_assignment(self.object_names, num_bays=self.num_bays)
+        except ValueError as e:
+            QMessageBox.warning(self, "Auto-Assign", str(e))
+            return
+        for obj, bay in assignments.items():
+            self.edits[obj].setText(str(bay))
 
     def get_assignments(self):
         # Returns a dict: {object_name: bay_number (int)}
@@ -0,0 +1,501 @@
+"""
+Persistent driver layer for the Pololu Tic stepper controllers used by the turntable and the doors.
+
+All I/O with a controller happens on one long-lived worker thread. Commands are queued and return
+concurrent.futures.Future objects, move commands complete when the controller reports that the
+target position has been reached, and the last status read is cached so callers never have to
+wait on the hardware to know where the motor is.
+
+Transports:
+    TicUsbTransport       - native USB control transfers through pyusb (no process per command)
+    TicCmdTransport       - the ticcmd command line utility (fallback when pyusb is unavailable)
+    SimulatedTicTransport - an in-process motion model for testing without hardware
+"""
+
+import math
+import queue
+import struct
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+import yaml
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.config import config
+
+# Optional native USB backend
+try:
+    import usb.core
+except ImportError:
+    usb = None
+
+# --- Tic USB protocol constants ---
+TIC_VENDOR_ID = 0x1FFB
+TIC_PRODUCTS = {0x00B3: 'T825', 0x00B5: 'T834', 0x00BD: 'T500', 0x00C3: '36v4', 0x00C9: 'T249'}
+
+CMD_SET_TARGET_POSITION = 0xE0
+CMD_HALT_AND_SET_POSITION = 0xEC
+CMD_RESET_COMMAND_TIMEOUT = 0x8C
+CMD_DEENERGIZE = 0x86
+CMD_ENERGIZE = 0x85
+CMD_EXIT_SAFE_START = 0x83
+CMD_SET_MAX_SPEED = 0xE6
+CMD_SET_MAX_ACCEL = 0xEA
+CMD_SET_MAX_DECEL = 0xE9
+CMD_SET_STEP_MODE = 0x94
+CMD_SET_CURRENT_LIMIT = 0x91
+CMD_GET_VARIABLE = 0xA1
+
+VAR_BLOCK_LENGTH = 0x2A  # Operation state up to and including the current velocity
+VAR_MISC_FLAGS = 0x01
+VAR_ERROR_STATUS = 0x02
+VAR_TARGET_POSITION = 0x0A
+VAR_CURRENT_POSITION = 0x22
+VAR_CURRENT_VELOCITY = 0x26
+
+STEP_MODE_CODES = {1: 0, 2: 1, 4: 2, 8: 3, 16: 4, 32: 5}
+# Current limit units in mA for the products with a linear current limit code
+CURRENT_LIMIT_UNITS_MA = {'T825': 32, 'T834': 32, 'T249': 40, '36v4': 71.615}
+
+
+def pulses_per_second(max_speed):
+    """Convert a Tic speed (pulses per 10000 s) to pulses per second."""
+    return max_speed / 10000.0
+
+
+def pulses_per_second_squared(max_accel):
+    """Convert a Tic acceleration (pulses per second per 100 s) to pulses per second squared."""
+    return max_accel / 100.0
+
+
+class TicUsbTransport:
+    """Talks to a Tic over native USB control transfers using pyusb."""
+
+    # A status read is one control transfer, so moves can be polled closely
+    poll_interval = 0.01
+
+    def __init__(self, serial_number):
+        if usb is None:
+            raise RuntimeError("pyusb is not installed")
+        self.serial_number = serial_number
+        self.device = None
+        self.product = None
+        for device in usb.core.find(find_all=True, idVendor=TIC_VENDOR_ID):
+            if device.idProduct in TIC_PRODUCTS and (not serial_number or usb.util.get_string(device, device.iSerialNumber) == serial_number):
+                self.device = device
+                self.product = TIC_PRODUCTS[device.idProduct]
+                break
+        if self.device is None:
+            raise RuntimeError(f"No Tic with serial number {serial_number} found on USB")
+
+    def _write(self, command, value=0):
+        self.device.ctrl_transfer(0x40, command, value & 0xFFFF, (value >> 16) & 0xFFFF, None)
+
+    def move_to(self, target):
+        self._write(CMD_EXIT_SAFE_START)
+        self._write(CMD_SET_TARGET_POSITION, target & 0xFFFFFFFF)
+
+    def halt_and_set_position(self, position):
+        self._write(CMD_HALT_AND_SET_POSITION, position & 0xFFFFFFFF)
+
+    def energize(self):
+        self._write(CMD_ENERGIZE)
+
+    def deenergize(self):
+        self._write(CMD_DEENERGIZE)
+
+    def reset_command_timeout(self):
+        self._write(CMD_RESET_COMMAND_TIMEOUT)
+
+    def set_max_speed(self, value):
+        self._write(CMD_SET_MAX_SPEED, value)
+
+    def set_max_accel(self, value):
+        self._write(CMD_SET_MAX_ACCEL, value)
+
+    def set_max_decel(self, value):
+        self._write(CMD_SET_MAX_DECEL, value)
+
+    def set_step_mode(self, divisor):
+        self._write(CMD_SET_STEP_MODE, STEP_MODE_CODES[int(divisor)])
+
+    def set_current_limit(self, milliamps):
+        units = CURRENT_LIMIT_UNITS_MA.get(self.product)
+        if units is None:
+            print(f"Current limit over USB is not supported for the Tic {self.product}; keeping the stored setting.")
+            return
+        self._write(CMD_SET_CURRENT_LIMIT, int(milliamps // units))
+
+    def read_status(self):
+        data = bytes(self.device.ctrl_transfer(0xC0, CMD_GET_VARIABLE, 0, 0, VAR_BLOCK_LENGTH))
+        flags = data[VAR_MISC_FLAGS]
+        return {
+            'position': struct.unpack_from('<i', data, VAR_CURRENT_POSITION)[0],
+            'target': struct.unpack_from('<i', data, VAR_TARGET_POSITION)[0],
+            'velocity': struct.unpack_from('<i', data, VAR_CURRENT_VELOCITY)[0],
+            'energized': bool(flags & 0x01),
+            'position_uncertain': bool(flags & 0x02),
+            'errors': struct.unpack_from('<H', data, VAR_ERROR_STATUS)[0],
+        }
+
+    def close(self):
+        if self.device is not None:
+            usb.util.dispose_resources(self.device)
+            self.device = None
+
+
+class TicCmdTransport:
+    """Talks to a Tic through the ticcmd command line utility (one process per command)."""
+
+    def __init__(self, serial_number, ticcmd_path='ticcmd'):
+        self.serial_number = serial_number
+        self.ticcmd_path = ticcmd_path
+        # Every status read starts a ticcmd process and parses its YAML output; poll sparingly
+        self.poll_interval = max(0.1, config.get('hardware.motors.ticcmd_poll_interval', 0.1))
+
+    def ticcmd(self, *args):
+        return subprocess.check_output([self.ticcmd_path, '-d', self.serial_number] + list(args))
+
+    def move_to(self, target):
+        self.ticcmd('--exit-safe-start', '--position', str(target))
+
+    def halt_and_set_position(self, position):
+        self.ticcmd('--halt-and-set-position', str(position))
+
+    def energize(self):
+        self.ticcmd('--energize')
+
+    def deenergize(self):
+        self.ticcmd('--deenergize')
+
+    def reset_command_timeout(self):
+        # Every ticcmd invocation already resets the timeout; avoid spawning extra processes
+        pass
+
+    def set_max_speed(self, value):
+        self.ticcmd('--max-speed', str(value))
+
+    def set_max_accel(self, value):
+        self.ticcmd('--max-accel', str(value))
+
+    def set_max_decel(self, value):
+        self.ticcmd('--max-decel', str(value))
+
+    def set_step_mode(self, divisor):
+        self.ticcmd('--step-mode', str(divisor))
+
+    def set_current_limit(self, milliamps):
+        self.ticcmd('--current', str(milliamps))
+
+    def read_status(self):
+        status = yaml.safe_load(self.ticcmd('-s', '--full'))
+        target = status.get('Target position')
+        return {
+            'position': status['Current position'],
+            'target': target if isinstance(target, int) else None,
+            'velocity': status.get('Current velocity', 0),
+            'energized': str(status.get('Energized', 'Yes')).lower() in ('yes', 'true'),
+            'position_uncertain': str(status.get('Position uncertain', 'No')).lower() in ('yes', 'true'),
+            'errors': 0,
+        }
+
+    def close(self):
+        pass
+
+
+class SimulatedTicTransport:
+    """
+    In-process model of a Tic driving a stepper with a trapezoidal velocity profile.
+
+    :param latency: Seconds added to every command to mimic the transport round trip.
+    """
+
+    poll_interval = 0.01
+
+    def __init__(self, latency=0.0, max_speed=6000000, max_accel=4000000):
+        self.latency = latency
+        self.max_speed = max_speed
+        self.max_accel = max_accel
+        self.max_decel = 0  # 0: brake at max_accel, the Tic default
+        self.position = 0.0
+        self.velocity = 0.0
+        self.target = 0
+        self.energized = True
+        self._last_update = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _delay(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _advance(self):
+        now = time.monotonic()
+        dt_total = now - self._last_update
+        self._last_update = now
+        if not self.energized:
+            self.velocity = 0.0
+            return
+        vmax = pulses_per_second(self.max_speed)
+        accel = pulses_per_second_squared(self.max_accel)
+        # Like the Tic, a max deceleration of 0 means "same as max acceleration"
+        decel = pulses_per_second_squared(self.max_decel) if self.max_decel else accel
+        step = 0.001
+        while dt_total > 0:
+            dt = min(step, dt_total)
+            dt_total -= dt
+            remaining = self.target - self.position
+            if abs(remaining) < 0.5 and abs(self.velocity) < accel * step * 2:
+                self.position = float(self.target)
+                self.velocity = 0.0
+                break
+            allowed = math.sqrt(2 * decel * abs(remaining))
+            desired = math.copysign(min(vmax, allowed), remaining)
+            limit = decel if abs(desired) < abs(self.velocity) or desired * self.velocity < 0 else accel
+            change = max(-limit * dt, min(limit * dt, desired - self.velocity))
+            self.velocity += change
+            self.position += self.velocity * dt
+            if (self.target - self.position) * remaining < 0:
+                # Overshoot within a single sub-step means we have arrived
+                self.position = float(self.target)
+                self.velocity = 0.0
+                break
+
+    def move_to(self, target):
+        self._delay()
+        with self._lock:
+            self._advance()
+            self.target = int(target)
+
+    def halt_and_set_position(self, position):
+        self._delay()
+        with self._lock:
+            self._advance()
+            self.position = float(position)
+            self.target = int(position)
+            self.velocity = 0.0
+
+    def energize(self):
+        self._delay()
+        with self._lock:
+            self._advance()
+            self.energized = True
+
+    def deenergize(self):
+        self._delay()
+        with self._lock:
+            self._advance()
+            self.energized = False
+
+    def reset_command_timeout(self):
+        pass
+
+    def set_max_speed(self, value):
+        self._delay()
+        self.max_speed = int(value)
+
+    def set_max_accel(self, value):
+        self._delay()
+        self.max_accel = int(value)
+
+    def set_max_decel(self, value):
+        self._delay()
+        self.max_decel = int(value)
+
+    def set_step_mode(self, divisor):
+        self._delay()
+
+    def set_current_limit(self, milliamps):
+        self._delay()
+
+    def read_status(self):
+        self._delay()
+        with self._lock:
+            self._advance()
+            return {
+                'position': int(round(self.position)),
+                'target': self.target,
+                'velocity': int(self.velocity * 10000),
+                'energized': self.energized,
+                'position_uncertain': False,
+                'errors': 0,
+            }
+
+    def close(self):
+        pass
+
+
+def create_transport(serial_number, ticcmd_path='ticcmd', backend=None):
+    """
+    Create the transport configured in hardware.motors.backend.
+
+    :param backend: One of 'auto', 'usb', 'ticcmd' or 'simulated'. 'auto' prefers native USB and
+                    falls back to ticcmd when pyusb or the device is not available.
+    """
+    backend = (backend or config.get('hardware.motors.backend', 'auto')).lower()
+    if backend == 'simulated':
+        return SimulatedTicTransport(latency=config.get('hardware.motors.simulated_latency', 0.0))
+    if backend == 'ticcmd':
+        return TicCmdTransport(serial_number, ticcmd_path)
+    try:
+        return TicUsbTransport(serial_number)
+    except Exception as e:
+        if backend == 'usb':
+            raise
+        print(f"Native USB Tic transport unavailable ({e}), falling back to ticcmd.")
+        return TicCmdTransport(serial_number, ticcmd_path)
+
+
+class MotionTimeout(Exception):
+    """Raised through a move future when the target is not reached in time."""
+
+
+class TicDriver:
+    """
+    Owns one Tic controller and serializes all access to it on a worker thread.
+
+    :param transport: One of the transports above.
+    :param poll_interval: Seconds between status reads while a move is in progress (defaults to the
+                          transport's poll_interval: 10 ms over USB, at least 100 ms through ticcmd).
+    :param tolerance: Position error (in steps) accepted as having reached the target.
+    """
+
+    def __init__(self, transport, poll_interval=None, tolerance=5, name="Tic"):
+        self.transport = transport
+        self.poll_interval = getattr(transport, 'poll_interval', 0.01) if poll_interval is None else poll_interval
+        self.tolerance = tolerance
+        self.name = name
+        self.status = {}
+        self.status_time = None
+        self._commands = queue.Queue()
+        self._moves = []
+        self._running = True
+        self._thread = threading.Thread(target=self._worker, name=f"{name}Driver", daemon=True)
+        self._thread.start()
+
+    # --- Public asynchronous API ---
+    def submit(self, func, *args):
+        """Queue a transport call; returns a Future resolved with its result."""
+        future = Future()
+        self._commands.put((func, args, future))
+        return future
+
+    def move_to(self, target, timeout=20, callback=None):
+        """Start a move and return a Future that resolves with the final status once the target is reached."""
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+        self._commands.put((self._start_move, (int(target), timeout, future), None))
+        return future
+
+    def halt_and_set_position(self, position):
+        return self.submit(self.transport.halt_and_set_position, position)
+
+    def energize(self):
+        return self.submit(self.transport.energize)
+
+    def deenergize(self):
+        return self.submit(self.transport.deenergize)
+
+    def set_max_speed(self, value):
+        return self.submit(self.transport.set_max_speed, value)
+
+    def set_max_accel(self, value):
+        return self.submit(self.transport.set_max_accel, value)
+
+    def set_max_decel(self, value):
+        return self.submit(self.transport.set_max_decel, value)
+
+    def set_step_mode(self, divisor):
+        return self.submit(self.transport.set_step_mode, divisor)
+
+    def set_current_limit(self, milliamps):
+        return self.submit(self.transport.set_current_limit, milliamps)
+
+    def refresh_status(self):
+        """Queue a status read; the returned Future resolves with the new status."""
+        return self.submit(self._read_status)
+
+    def get_position(self):
+        """Return the cached position (no hardware round trip)."""
+        return self.status.get('position')
+
+    def is_moving(self):
+        return bool(self._moves)
+
+    def close(self, timeout=2.0):
+        self._running = False
+        self._commands.put(None)
+        self._thread.join(timeout)
+        try:
+            self.transport.close()
+        except Exception:
+            pass
+
+    # --- Worker thread ---
+    def _read_status(self):
+        status = self.transport.read_status()
+        self.status = status
+        self.status_time = time.monotonic()
+        return status
+
+    def _start_move(self, target, timeout, future):
+        self.transport.move_to(target)
+        self._moves.append((target, time.monotonic() + timeout, future))
+
+    def _worker(self):
+        while self._running:
+            try:
+                item = self._commands.get(timeout=self.poll_interval if self._moves else None)
+            except queue.Empty:
+                item = False
+            if item is None:
+                break
+            if item:
+                func, args, future = item
+                try:
+                    result = func(*args)
+                    if future is not None:
+                        future.set_result(result)
+                except Exception as e:
+                    if future is not None:
+                        future.set_exception(e)
+                    elif args and isinstance(args[-1], Future):
+                        args[-1].set_exception(e)
+                    else:
+                        print(f"{self.name} driver command failed: {e}")
+                # Drain queued commands before polling the hardware again
+                if not self._commands.empty():
+                    continue
+            if self._moves:
+                self._poll_moves()
+        for _, _, future in self._moves:
+            if not future.done():
+                future.cancel()
+        self._moves = []
+
+    def _poll_moves(self):
+        try:
+            self.transport.reset_command_timeout()
+            status = self._read_status()
+        except Exception as e:
+            for _, _, future in self._moves:
+                future.set_exception(e)
+            self._moves = []
+            return
+        now = time.monotonic()
+        remaining = []
+        for target, deadline, future in self._moves:
+            if abs(status['position'] - target) < self.tolerance:
+                future.set_result(status)
+            elif now > deadline:
+                future.set_exception(MotionTimeout(f"{self.name} did not reach position {target} (at {status['position']})"))
+            else:
+                remaining.append((target, deadline, future))
+        self._moves = remaining
@@ -1,82 +1,83 @@
-import subprocess
-import yaml
-import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
+from eeg_stimulus_project.config import config
+from eeg_stimulus_project.stimulus.turn_table_code.tic_driver import TicDriver, MotionTimeout, create_transport
 
 
 class TurntableController:
-    def __init__(self, interval_steps=200, num_bays=16):
+    def __init__(self, interval_steps=200, num_bays=16, driver=None):
         self.interval_steps = interval_steps
         self.num_bays = num_bays
         self.current_bay = 0
-        self.ticcmd_path = r'C:\Program Files (x86)\Pololu\Tic\Bin\ticcmd.exe'
+        self.target_steps = 0
+        settings = config.get('hardware.motors.turntable', {})
+        self.device_id = settings.get('device_id', '00466055')
+        self.ticcmd_path = settings.get('ticcmd_path', r'C:\Program Files (x86)\Pololu\Tic\Bin\ticcmd.exe')
+        self.driver = driver or TicDriver(create_transport(self.device_id, self.ticcmd_path), name="Turntable")
         self.home()
 
         print("Setting motor parameters...")
         #DO NOT MODIFY THESE PARAMETERS WITHOUT DEEP UNDERSTANING OF THE MOTOR AND CONTROLLER
-        #self.ticcmd('--reset-command-timeout')
-        self.ticcmd('--current', '1000')                # Set motor current to 1760 mA
-        self.ticcmd('--step-mode', '16')                 # 1/16 step mode (4 = 1/16 for Tic controllers)
-        self.ticcmd('--max-speed', '6000000')             # Max speed: 20000 pulses/sec
-        self.ticcmd('--max-accel', '4000000')               # Max acceleration: 500 pulses/sec^2
-
-    def ticcmd(self, *args):
-        return subprocess.check_output([self.ticcmd_path, '-d', '00466055'] + list(args))
+        self.max_speed = 6000000                         # Max speed: 600 pulses/sec
+        self.max_accel = 4000000                         # Max acceleration: 40000 pulses/sec^2
+        self.driver.set_current_limit(1000)              # Set motor current to 1000 mA
+        self.driver.set_step_mode(16)                    # 1/16 step mode
+        self.driver.set_max_speed(self.max_speed)
+        self.driver.set_max_accel(self.max_accel).result()
+        # Braking is left to the controller's own setting unless max_decel is configured
+        if settings.get('max_decel') is not None:
+            self.driver.set_max_decel(settings['max_decel']).result()
 
     def get_position(self):
-        status = yaml.safe_load(self.ticcmd('-s', '--full'))
-        return status['Current position']
+        # Read the position from the controller (the driver also caches it as driver.status)
+        return self.driver.refresh_status().result()['position']
 
     def home(self):
-        # Home to position 0
-        #self.ticcmd('--exit-safe-start', '--position', '0')
-        #time.sleep(2)
-        self.ticcmd('--halt-and-set-position', '0')
+        # Declare the current position to be bay 1
+        self.driver.halt_and_set_position(0).result()
         self.current_bay = 0
+        self.target_steps = 0
+
+    def steps_between(self, from_bay, to_bay):
+        """Signed number of steps for the shortest path between two bays (0-based indices)."""
+        diff = (to_bay - from_bay) % self.num_bays
+        if diff > self.num_bays // 2:
+            # Move clockwise (reverse previous direction)
+            return (self.num_bays - diff) * self.interval_steps
+        # Move counterclockwise (reverse previous direction)
+        return -diff * self.interval_steps
 
-    def move_to_bay(self, bay_index, wait=True, timeout=20):
+    def move_to_bay(self, bay_index, wait=True, timeout=20, callback=None):
         """Move to the specified bay (0-based index) using the shortest path.
+        Returns a Future that resolves once the turntable reaches the bay; callback is attached to it.
         If wait=True, block until the move is complete or timeout (in seconds) is reached.
         """
-        diff = (bay_index - self.current_bay) % self.num_bays
-        if diff > self.num_bays // 2:
-            # Move clockwise (reverse previous direction)
-            steps = (self.num_bays - diff) * self.interval_steps
-        else:
-            # Move counterclockwise (reverse previous direction)
-            steps = -diff * self.interval_steps
+        steps = self.steps_between(self.current_bay, bay_index)
 
-        # Get current position in steps
-        current_steps = self.get_position()
-        target_steps = current_steps + steps
+        # Moves are relative to the last commanded target, so no status read is needed before moving
+        self.target_steps += steps
 
         print(f"Moving from bay {self.current_bay + 1} to {bay_index + 1}")
-        #print(f"Current steps: {current_steps}, Target steps: {target_steps}")
-
-        self.ticcmd('--exit-safe-start', '--position', str(target_steps))
-        #time.sleep(3)
+        future = self.driver.move_to(self.target_steps, timeout=timeout, callback=callback)
+        self.current_bay = bay_index
 
         if wait:
-            start_time = time.time()
-            while True:
-                pos = self.get_position()
-                #print(f"Current position: {pos}, Target: {target_steps}")
-                if abs(pos - target_steps) < 5:  # Increased tolerance
-                    break
-                if time.time() - start_time > timeout:
-                    print("Warning: move_to_bay timed out.")
-                    break
-                time.sleep(0.2)  # Slower polling
-
-        self.current_bay = bay_index
+            try:
+                future.result(timeout + 1)
+            except (MotionTimeout, FutureTimeoutError):
+                print("Warning: move_to_bay timed out.")
+        return future
 
     def move_by_bays(self, num_bays):
         self.move_to_bay((self.current_bay + num_bays) % self.num_bays)
 
     def de_energize(self):
         print("De-energizing motor...")
-        self.ticcmd("--deenergize")
+        return self.driver.deenergize()
 
     def energize(self):
         print("Energizing motor...")
-        self.ticcmd("--energize")
\ No newline at end of file
+        return self.driver.energize()
+
+    def close(self):
+        self.driver.close()
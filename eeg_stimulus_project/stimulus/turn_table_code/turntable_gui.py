@@ -5,10 +5,12 @@ from PyQt5.QtWidgets import (
     QListWidget, QListWidgetItem, QTableWidget, QTableWidgetItem
 )
 from PyQt5.QtGui import QPainter, QPen, QBrush, QColor, QFont
-from PyQt5.QtCore import Qt, QPoint, QTimer, pyqtSlot
+from PyQt5.QtCore import Qt, QPoint, QTimer, pyqtSlot, pyqtSignal
 
 from eeg_stimulus_project.stimulus.turn_table_code.turntable_controller import TurntableController
 from eeg_stimulus_project.stimulus.turn_table_code.doorcode import DoorController
+from eeg_stimulus_project.stimulus.turn_table_code.motion_planner import MotionPlanner
+from eeg_stimulus_project.utils.gui_watchdog import timed
 
 class TurntableWidget(QWidget):
     def __init__(self, parent=None, controller=None):
@@ -52,7 +54,7 @@ class TurntableWidget(QWidget):
                     border: 2px inset #888888;
                 }
             """)
-            btn.clicked.connect(lambda checked, bay=odd_num-1: self.controller.move_to_bay(bay))
+            btn.clicked.connect(lambda checked, bay=odd_num-1: self.controller.move_to_bay(bay, wait=False))
             self.inner_buttons.append(btn)
 
         # Outer buttons: 16 at top, then 2, 4, ..., 14 clockwise
@@ -81,7 +83,7 @@ class TurntableWidget(QWidget):
                     border: 2px inset #555555;
                 }
             """)
-            btn2.clicked.connect(lambda checked, bay=even_num-1: self.controller.move_to_bay(bay))
+            btn2.clicked.connect(lambda checked, bay=even_num-1: self.controller.move_to_bay(bay, wait=False))
             self.outer_buttons.append(btn2)
 
     def resizeEvent(self, event):
@@ -125,6 +127,9 @@ class AssignmentTableWidget(QTableWidget):
         painter.end()
 
 class TurntableWindow(QWidget):
+    # Carries callables from the motor driver threads back onto the GUI thread
+    _run_in_gui = pyqtSignal(object)
+
     def __init__(self, test_order=None, object_to_bay=None, tactile_mode=False, send_message=None):
         super().__init__()
         print(test_order)
@@ -132,7 +137,9 @@ class TurntableWindow(QWidget):
         self.send_message = send_message
         self.controller = TurntableController()
         self.door_controller = DoorController()
+        self.planner = MotionPlanner(self.controller)
         self.setWindowTitle("Turntable GUI")
+        self._run_in_gui.connect(lambda func: func())
 
         # Top bar with Connection and Zero buttons
         top_bar = QHBoxLayout()
@@ -145,8 +152,8 @@ class TurntableWindow(QWidget):
         self.resume_btn = QPushButton("Resume")
         self.stop_btn = QPushButton("Stop")
 
-        self.open_btn.clicked.connect(self.door_controller.open)
-        self.close_btn.clicked.connect(self.door_controller.close)
+        self.open_btn.clicked.connect(lambda: self.door_controller.open_async())
+        self.close_btn.clicked.connect(lambda: self.door_controller.close_async())
         self.de_energize_btn.clicked.connect(self.controller.de_energize)
         self.energize_btn.clicked.connect(self.controller.energize)
         self.start_btn.clicked.connect(self.run_test_sequence)
@@ -222,6 +229,10 @@ class TurntableWindow(QWidget):
         # State variables for pause/resume/stop
         self._paused = False
         self._stopped = False
+        # Token of the trial's wait for its bay; callbacks of an earlier wait (before a pause/resume) are ignored
+        self._bay_token = None
+        self._bay_attempts = 0
+        self.move_attempts = 2  # moves to a bay tried before the sequence pauses
         self._pending_timer = QTimer(self)
         self._pending_timer.setSingleShot(True)
         self._pending_timer.timeout.connect(self._timer_callback)
@@ -294,6 +305,7 @@ class TurntableWindow(QWidget):
                 font.setItalic(True)
                 self.assignment_list.item(row, 1).setFont(font)
 
+    @timed('turntable.run_test_sequence')
     def run_test_sequence(self):
         # Only reset if stopped, not at end
         if self._stopped:
@@ -318,7 +330,30 @@ class TurntableWindow(QWidget):
             self._start_timer(1000, self.run_test_sequence)
             return
         print(f"Moving to bay {bay} for object {object_name}")
-        self.controller.move_to_bay(bay - 1, wait=True)
+        self._bay_attempts = 0
+        self._await_bay(bay - 1)
+
+    def _await_bay(self, bay_index):
+        # Usually already under way (prefetched when the doors closed); continue once the bay is reached
+        self._bay_token = token = object()
+        self._bay_attempts += 1
+        self.planner.prefetch(bay_index, callback=self._in_gui(lambda future: self.on_bay_reached(future, token)))
+
+    @timed('turntable.on_bay_reached')
+    def on_bay_reached(self, move_future, token=None):
+        if token is not self._bay_token or self._stopped or self._paused:
+            return
+        self._bay_token = None
+        error = 'cancelled' if move_future.cancelled() else move_future.exception()
+        if error is not None:
+            # Never open the doors at a position the controller did not confirm
+            if self._bay_attempts < self.move_attempts:
+                print(f"Warning: move_to_bay did not complete ({error}); retrying.")
+                self._await_bay(self.planner.pending_bay)
+            else:
+                print(f"Error: turntable did not reach the bay ({error}); pausing the test sequence.")
+                self._paused = True
+            return
         if self.tactile_mode:
             print("Waiting for touch signal from tactile box...")
             self.waiting_for_touch = True
@@ -326,23 +361,46 @@ class TurntableWindow(QWidget):
                 self.send_message({"action": "touchbox_lsl_true"})
             # Do not open doors yet; wait for touch signal
         else:
-            self.door_controller.open()
-            self._start_timer(2000, self.close_doors_and_continue)
+            self.open_doors()
+
+    def open_doors(self):
+        # Start the display interval once the doors are fully open
+        self.door_controller.open_async(callback=self._in_gui(lambda _: self._start_timer(2000, self.close_doors_and_continue)))
 
     @pyqtSlot()
     def on_object_touched(self):
         if self.tactile_mode and self.waiting_for_touch:
             print("Touch detected! Opening doors.")
             self.waiting_for_touch = False
-            self.door_controller.open()
-            self._start_timer(2000, self.close_doors_and_continue)
+            self.open_doors()
 
     def close_doors_and_continue(self):
         if self._stopped or self._paused:
             return
-        self.door_controller.close()
         self.current_index += 1
-        self._start_timer(1000, self.run_test_sequence)
+        self.door_controller.close_async(callback=self._in_gui(self.on_doors_closed))
+
+    def on_doors_closed(self, close_future):
+        if self._stopped:
+            return
+        # Start rotating to the next object right away so it overlaps the display's crosshair/rating screens
+        if not self._paused and self.current_index < len(self.test_order):
+            next_bay = self.object_to_bay.get(self.test_order[self.current_index])
+            if next_bay is not None:
+                self.planner.prefetch(next_bay - 1)
+        self._start_timer(0, self.run_test_sequence)
+
+    def ready_in_ms(self):
+        # Predicted time until the turntable reaches the next object's bay
+        return self.planner.ready_in_ms()
+
+    def predicted_move_times(self):
+        # Predicted move time (seconds) before each trial of the current test order
+        return self.planner.schedule(self.test_order, self.object_to_bay)
+
+    def _in_gui(self, func):
+        # Wrap a Future callback so it runs on the GUI thread
+        return lambda future: self._run_in_gui.emit(lambda: func(future))
 
     def _start_timer(self, ms, callback):
         self._timer_callback_func = callback
@@ -372,6 +430,7 @@ class TurntableWindow(QWidget):
         print("Stopping test sequence.")
         self._stopped = True
         self._paused = False
+        self._bay_token = None
         self.current_index = 0
         self._pending_timer.stop()  # Immediately stop any pending timer
 
@@ -0,0 +1,70 @@
+import sys
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from eeg_stimulus_project.data.xdf_recorder import XDFWriter
+from eeg_stimulus_project.utils.batch_convert import batch_convert
+from eeg_stimulus_project.tests.xdf_fixtures import EEG_HEADER
+
+
+class TestBatchConvert(unittest.TestCase):
+    """Test cases for converting a saved_data tree in a process pool."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = os.path.join(self.tmp.name, "saved_data")
+        test_dir = os.path.join(self.data_dir, "subject_1", "test_1", "Unisensory Neutral Visual")
+        os.makedirs(test_dir)
+        writer = XDFWriter(os.path.join(test_dir, "recording.xdf"))
+        writer.write_stream_header(1, EEG_HEADER)
+        writer.write_samples(1, [0.0, 0.01, 0.02], [[1, 2], [3, 4], [5, 6]], 'float32')
+        writer.close()
+        with open(os.path.join(test_dir, "data.csv"), 'w') as f:
+            f.write("User Inputs,Elapsed Time\nYes,100\nNo,200\n")
+        self.output_dir = os.path.join(self.tmp.name, "converted")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_converts_then_skips_unchanged(self):
+        summary = batch_convert(self.data_dir, self.output_dir, fmt="npz", workers=2)
+        self.assertEqual((summary['converted'], summary['skipped'], summary['failed']), (2, 0, 0))
+        out_dir = os.path.join(self.output_dir, "subject_1", "test_1", "Unisensory Neutral Visual")
+        eeg = np.load(os.path.join(out_dir, "recording__EEG.npz"))
+        np.testing.assert_array_equal(eeg['Channel_2'], [2, 4, 6])
+        responses = np.load(os.path.join(out_dir, "data.npz"), allow_pickle=True)
+        np.testing.assert_array_equal(responses['Elapsed_Time'], [100, 200])
+
+        summary = batch_convert(self.data_dir, self.output_dir, fmt="npz", workers=2)
+        self.assertEqual((summary['converted'], summary['skipped']), (0, 2))
+
+    def test_touched_file_is_hashed_not_converted(self):
+        batch_convert(self.data_dir, self.output_dir, fmt="npz", workers=1)
+        csv_path = os.path.join(self.data_dir, "subject_1", "test_1", "Unisensory Neutral Visual", "data.csv")
+        os.utime(csv_path, ns=(0, 0))
+        summary = batch_convert(self.data_dir, self.output_dir, fmt="npz", workers=1)
+        self.assertEqual((summary['converted'], summary['skipped']), (0, 2))
+        with open(csv_path, 'a') as f:
+            f.write("Yes,300\n")
+        summary = batch_convert(self.data_dir, self.output_dir, fmt="npz", workers=1)
+        self.assertEqual((summary['converted'], summary['skipped']), (1, 1))
+
+    def test_csv_sources_are_not_submitted_for_csv_output(self):
+        summary = batch_convert(self.data_dir, self.output_dir, fmt="csv", workers=1)
+        self.assertEqual((summary['converted'], summary['skipped'], summary['failed']), (1, 1, 0))
+
+    def test_parquet_without_an_engine_fails_up_front(self):
+        with mock.patch.dict(sys.modules, {"pyarrow": None, "fastparquet": None}):
+            with self.assertRaises(RuntimeError):
+                batch_convert(self.data_dir, self.output_dir, fmt="parquet", workers=1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
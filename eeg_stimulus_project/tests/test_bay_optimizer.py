@@ -0,0 +1,52 @@
+import sys
+import os
+import random
+import unittest
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from eeg_stimulus_project.stimulus.turn_table_code.bay_optimizer import (
+    circular_distance, total_travel, optimize_bay_assignment, expected_block_duration
+)
+
+
+class TestBayOptimizer(unittest.TestCase):
+    """Test cases for minimizing turntable travel through the object-to-bay assignment."""
+
+    def test_circular_distance_wraps(self):
+        self.assertEqual(circular_distance(1, 16), 1)
+        self.assertEqual(circular_distance(1, 9), 8)
+        self.assertEqual(circular_distance(3, 3), 0)
+
+    def test_assignment_is_valid_and_beats_naive(self):
+        rng = random.Random(7)
+        for count in (4, 7, 12):
+            objects = [f"object_{i}" for i in range(count)]
+            test_order = [rng.choice(objects) for _ in range(60)]
+            assignment = optimize_bay_assignment(test_order)
+            self.assertEqual(set(assignment), set(test_order))
+            self.assertEqual(len(set(assignment.values())), len(assignment))
+            self.assertTrue(all(1 <= bay <= 16 for bay in assignment.values()))
+            # Spread the objects evenly around the table as an experimenter might
+            naive = {obj: 1 + i * (16 // count) for i, obj in enumerate(dict.fromkeys(test_order))}
+            self.assertLessEqual(total_travel(test_order, assignment), total_travel(test_order, naive))
+
+    def test_exact_search_finds_adjacent_layout(self):
+        # Alternating between two objects: the first at home, the second right next to it
+        assignment = optimize_bay_assignment(["a", "b"] * 5)
+        self.assertEqual(total_travel(["a", "b"] * 5, assignment), 9)
+
+    def test_too_many_objects(self):
+        with self.assertRaises(ValueError):
+            optimize_bay_assignment([str(i) for i in range(17)])
+
+    def test_expected_block_duration(self):
+        self.assertEqual(expected_block_duration(["a", "a"], {"a": 1}), 0.0)
+        one_bay = expected_block_duration(["a"], {"a": 2})
+        self.assertGreater(one_bay, 0.0)
+        self.assertAlmostEqual(expected_block_duration(["a"], {"a": 2}, trial_overhead=2.0), one_bay + 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,60 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from eeg_stimulus_project.benchmarks.harness import (BENCHMARKS, compare, latest_results, metric,
+                                                     percentile, run_benchmarks, save_results)
+
+
+def result(benchmarks, timestamp="2026-01-01T00:00:00"):
+    return {'timestamp': timestamp, 'benchmarks': {
+        name: {'metrics': metrics} for name, metrics in benchmarks.items()}}
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+    def test_percentile(self):
+        values = list(range(101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile([3.0], 99), 3.0)
+
+    def test_compare_flags_regressions_in_the_right_direction(self):
+        baseline = result({'bench': {'latency': metric(10.0, "ms"), 'rate': metric(100.0, "1/s", "higher")}})
+        slower = result({'bench': {'latency': metric(13.0, "ms"), 'rate': metric(70.0, "1/s", "higher")}})
+        faster = result({'bench': {'latency': metric(7.0, "ms"), 'rate': metric(130.0, "1/s", "higher")}})
+        rows = {row['metric']: row for row in compare(slower, baseline, threshold=0.2)}
+        self.assertTrue(rows['latency']['regression'])
+        self.assertTrue(rows['rate']['regression'])
+        self.assertAlmostEqual(rows['latency']['change'], 0.3)
+        self.assertFalse(any(row['regression'] for row in compare(faster, baseline, threshold=0.2)))
+
+    def test_compare_skips_metrics_missing_from_baseline(self):
+        baseline = result({'bench': {'latency': metric(10.0, "ms")}})
+        current = result({'bench': {'latency': metric(10.0, "ms"), 'new': metric(1.0, "ms")},
+                          'other': {'x': metric(1.0, "ms")}})
+        self.assertEqual([row['metric'] for row in compare(current, baseline)], ['latency'])
+
+    def test_save_and_find_latest(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = save_results(result({}, "2026-01-01T00:00:00"), tmp)
+            second = save_results(result({}, "2026-01-02T00:00:00"), tmp)
+            self.assertEqual(latest_results(tmp), second)
+            self.assertEqual(latest_results(tmp, exclude=second), first)
+            with open(second, 'r', encoding='utf-8') as f:
+                self.assertEqual(json.load(f)['timestamp'], "2026-01-02T00:00:00")
+
+    def test_save_export_quick_run(self):
+        results = run_benchmarks(["save_export"], quick=True)
+        entry = results['benchmarks']['save_export']
+        self.assertIn('metrics', entry, entry)
+        self.assertIn('xdf_write_ms', entry['metrics'])
+        self.assertIn('info', entry)
+        self.assertIn('collector_throughput', BENCHMARKS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import sys
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from eeg_stimulus_project.data.epoching import epoch, epoch_session, select_events
+from eeg_stimulus_project.tests.xdf_fixtures import write_xdf
+
+LABELS = ["Crosshair Shown", "Beer Image", "Beer Image: Yes", "Instruction Text: Beer Image",
+          "craving_rating_4", "Stella Image", "tactile_touch"]
+
+
+class TestEpoching(unittest.TestCase):
+    """Test cases for marker selection and vectorized epoching."""
+
+    def test_select_events_by_condition(self):
+        times = np.arange(len(LABELS), dtype=float)
+        self.assertEqual(select_events(LABELS, times, 'image')[1], ["Beer Image", "Stella Image"])
+        self.assertEqual(select_events([[l] for l in LABELS], times, 'craving')[0].tolist(), [4.0])
+        self.assertEqual(select_events(LABELS, times, r"^Beer")[1], ["Beer Image", "Beer Image: Yes"])
+
+    def test_epoch_shape_baseline_and_drops(self):
+        srate = 100
+        data_times = np.arange(1000) / srate
+        data = np.stack([np.arange(1000.0), np.full(1000, 5.0)], axis=1)
+        events = np.array([0.05, 2.0, 5.0, 9.9])
+        result = epoch(data, data_times, events, tmin=-0.1, tmax=0.2, srate=srate, baseline=(None, 0.0))
+        self.assertEqual(result.data.shape, (2, 2, 30))
+        self.assertEqual(result.dropped, 2)
+        np.testing.assert_allclose(result.event_times, [2.0, 5.0])
+        # Channel 1 is a ramp: the baseline (-0.1 s..0 s, 11 samples) averages 5 below the sample at t=0
+        self.assertAlmostEqual(result.data[0, 0, 10], 5.0)
+        np.testing.assert_allclose(result.data[:, 1, :], 0.0)
+        np.testing.assert_allclose(result.average().shape, (2, 30))
+
+    def test_epoch_session_uses_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "session.xdf")
+            write_xdf(path, np.arange(500) / 100, [[i, -i] for i in range(500)],
+                      [1.0, 2.0, 3.0], ["Beer Image", "Crosshair Shown", "Stella Image"])
+
+            first = epoch_session(path, 'image', tmin=-0.1, tmax=0.3)
+            self.assertEqual(first.data.shape, (2, 2, 40))
+            self.assertEqual(first.labels, ["Beer Image", "Stella Image"])
+            self.assertEqual(len(os.listdir(path + ".epochs")), 1)
+            cached = epoch_session(path, 'image', tmin=-0.1, tmax=0.3)
+            np.testing.assert_array_equal(cached.data, first.data)
+            self.assertEqual(cached.labels, first.labels)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,80 @@
+import sys
+import os
+import gzip
+import tempfile
+import unittest
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from pylsl import StreamInlet, resolve_byprop
+
+from eeg_stimulus_project.lsl.labels import LSLLabelStream
+from eeg_stimulus_project.utils import event_journal
+from eeg_stimulus_project.utils.event_journal import EVENT_CODES, EventJournal, load_columns, read_events
+
+
+class TestEventJournal(unittest.TestCase):
+    """Test cases for the per-session event journal."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        event_journal.close_session_journal()
+        self.tmp.cleanup()
+
+    def test_events_round_trip_in_batches(self):
+        path = os.path.join(self.tmp.name, "journal", "events_test.jsonl.gz")
+        journal = EventJournal(path, flush_interval=60.0)
+        journal.record('state', 'test_started', test="Stroop")
+        journal.record('label', 'Image 1', timestamp=5.0)
+        journal.flush()
+        journal.record('device', 'eyetracker', status='failed')
+        journal.close()
+        events = read_events(path)
+        self.assertEqual([event['kind'] for event in events], ['label', 'state', 'device'])
+        self.assertEqual(events[0]['t'], 5.0)
+        self.assertEqual(events[1]['data'], {'test': "Stroop"})
+        self.assertEqual(events[2]['pid'], os.getpid())
+        # One gzip member per flush
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read().count(b"\x1f\x8b\x08"), 2)
+
+    def test_truncated_member_keeps_earlier_events(self):
+        path = os.path.join(self.tmp.name, "events_test.jsonl.gz")
+        journal = EventJournal(path, flush_interval=60.0)
+        journal.record('label', 'kept', timestamp=1.0)
+        journal.close()
+        with open(path, 'ab') as f:
+            f.write(gzip.compress(b'{"t": 2.0}\n')[:12])
+        self.assertEqual([event['name'] for event in read_events(path)], ['kept'])
+
+    def test_columns_merge_processes(self):
+        for role, times in (("host", [1.0, 3.0]), ("client", [2.0])):
+            journal = EventJournal(os.path.join(self.tmp.name, f"events_{role}.jsonl.gz"))
+            for t in times:
+                journal.record('label', f"{role} {t}", timestamp=t)
+            journal.record('state', role, timestamp=10.0)
+            journal.close()
+        columns = load_columns(self.tmp.name, kinds=['label'])
+        self.assertEqual(columns['t'].tolist(), [1.0, 2.0, 3.0])
+        self.assertEqual(columns['code'].tolist(), [EVENT_CODES['label']] * 3)
+        self.assertEqual(columns['name'], ["host 1.0", "client 2.0", "host 3.0"])
+
+    def test_label_push_is_journaled_with_the_marker_timestamp(self):
+        event_journal.open_session_journal(self.tmp.name, "host")
+        stream = LSLLabelStream(stream_name="journal_test_labels", source_id="journal_test_labels")
+        inlet = StreamInlet(resolve_byprop('name', "journal_test_labels", timeout=5.0)[0])
+        inlet.open_stream(timeout=5.0)
+        stream.push_label("Image 7")
+        sample, timestamp = inlet.pull_sample(timeout=5.0)
+        event_journal.close_session_journal()
+        events = read_events(self.tmp.name)
+        self.assertEqual(sample, ["Image 7"])
+        self.assertEqual((events[0]['kind'], events[0]['name']), ('label', "Image 7"))
+        self.assertAlmostEqual(events[0]['t'], timestamp, places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
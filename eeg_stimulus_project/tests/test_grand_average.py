@@ -0,0 +1,69 @@
+import sys
+import os
+import json
+import tempfile
+import unittest
+
+import numpy as np
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from eeg_stimulus_project.data.grand_average import RunningStats, grand_average
+from eeg_stimulus_project.tests.xdf_fixtures import stream_header, write_xdf
+
+EEG_HEADER = stream_header("EEG", "EEG", 1, 100, "float32")
+CONDITION = "Unisensory Neutral Visual"
+
+
+def write_session(path, level):
+    # 5 s of a constant signal with images at 1, 2 and 3 s
+    write_xdf(path, np.arange(500) / 100, [[level]] * 500,
+              [1.0, 2.0, 3.0], ["Beer Image", "Stella Image", "Water Image"], eeg_header=EEG_HEADER)
+
+
+class TestGrandAverage(unittest.TestCase):
+    """Test cases for the streaming statistics and the cross-subject grand average."""
+
+    def test_running_stats_match_numpy(self):
+        values = np.random.default_rng(0).normal(size=(50, 3, 4))
+        stats = RunningStats()
+        stats.update_batch(values[:20])
+        other = RunningStats()
+        for value in values[20:]:
+            other.update(value)
+        stats.merge(other)
+        self.assertEqual(stats.count, 50)
+        np.testing.assert_allclose(stats.mean, values.mean(axis=0))
+        np.testing.assert_allclose(stats.variance(), values.var(axis=0, ddof=1))
+        lower, upper = stats.confidence_band(0.95)
+        self.assertTrue(np.all(lower < stats.mean) and np.all(upper > stats.mean))
+
+    def test_grand_average_across_subjects(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = os.path.join(tmp, "saved_data")
+            for subject, level in ((1, 1.0), (2, 3.0)):
+                session_dir = os.path.join(data_dir, f"subject_{subject}", "test_1", CONDITION)
+                os.makedirs(session_dir)
+                write_session(os.path.join(session_dir, "recording.xdf"), level)
+            output_dir = os.path.join(tmp, "out")
+
+            results = grand_average(data_dir, output_dir, conditions=[CONDITION, "Unisensory Alcohol Visual"],
+                                    tmin=-0.1, tmax=0.2, baseline=None, workers=2, use_cache=False)
+
+            self.assertEqual(list(results), [CONDITION])
+            result = results[CONDITION]
+            self.assertEqual((result['n_subjects'], result['n_trials']), (2, 6))
+            self.assertEqual(result['mean'].shape, (1, 30))
+            # Subject ERPs are flat at 1 and 3
+            np.testing.assert_allclose(result['mean'], 2.0)
+            np.testing.assert_allclose(result['std'], np.sqrt(2.0))
+            np.testing.assert_allclose(result['trial_std'], np.sqrt(1.2))
+            with open(os.path.join(output_dir, "summary.json")) as f:
+                summary = json.load(f)
+            self.assertEqual(summary['conditions'][CONDITION]['n_subjects'], 2)
+            self.assertTrue(os.path.exists(os.path.join(output_dir, summary['conditions'][CONDITION]['file'])))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,69 @@
+import sys
+import os
+import time
+import unittest
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+
+from eeg_stimulus_project.utils import gui_watchdog
+from eeg_stimulus_project.utils.gui_watchdog import GuiWatchdog, Histogram, timed
+
+app = QApplication.instance() or QApplication([])
+
+
+def block_gui_thread(seconds):
+    time.sleep(seconds)
+
+
+class TestGuiWatchdog(unittest.TestCase):
+    """Test cases for the GUI stall watchdog and hot-path timing."""
+
+    def test_stall_is_measured_with_the_blocking_stack(self):
+        watchdog = GuiWatchdog(interval_ms=10, stall_threshold_ms=100, poll_interval_ms=10)
+        watchdog.start()
+        try:
+            QTest.qWait(100)
+            QTimer.singleShot(0, lambda: block_gui_thread(0.4))
+            # Long enough for the first heartbeat after the block to run, even on a loaded machine
+            QTest.qWait(800)
+        finally:
+            watchdog.stop(log_summary=False)
+        self.assertEqual(watchdog.stalls.count, 1)
+        duration_ms, where, stack = watchdog.stall_reports[-1]
+        self.assertGreaterEqual(duration_ms, 300)
+        self.assertIn("block_gui_thread", where)
+        self.assertIn("test_gui_watchdog.py", stack)
+        # Regular beats land in the low buckets
+        self.assertGreater(watchdog.latency.count, 5)
+
+    def test_timed_records_each_call(self):
+        @timed('test.sleepy')
+        def sleepy():
+            time.sleep(0.02)
+
+        sleepy()
+        with timed('test.sleepy'):
+            pass
+        histogram = gui_watchdog.hot_paths['test.sleepy']
+        self.assertEqual(histogram.count, 2)
+        self.assertGreaterEqual(histogram.max, 15)
+
+    def test_histogram_buckets(self):
+        histogram = Histogram((10, 100))
+        for value in (1, 10, 50, 500):
+            histogram.add(value)
+        self.assertEqual(histogram.counts, [2, 1, 1])
+        self.assertEqual(histogram.as_dict(), {"<=10": 2, "<=100": 1, ">100": 1})
+        self.assertIn("max=500.0 ms", histogram.summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import sys
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from eeg_stimulus_project.utils.labrecorder import LabRecorderRCSClient, LabRecorderError
+from eeg_stimulus_project.simulators.labrecorder_rcs import RCSSimulator
+
+
+class TestLabRecorderRCSClient(unittest.TestCase):
+    """Test cases for the acknowledged LabRecorder remote control client."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def start(self, server, ack_timeout=0.5, **kwargs):
+        client = LabRecorderRCSClient(host="127.0.0.1", port=server.port, ack_timeout=ack_timeout)
+        self.assertTrue(client.connect())
+        self.addCleanup(client.close)
+        self.addCleanup(server.stop)
+        return client.start_recording_async(self.tmp.name, "test.xdf", expected_streams=[], **kwargs), client
+
+    def test_start_is_acknowledged_and_confirmed(self):
+        server = RCSSimulator().start()
+        started = time.monotonic()
+        # The simulator answers a bare "OK" like LabRecorder; no command may wait out the ack timeout
+        future, client = self.start(server, ack_timeout=3.0)
+        path = future.result(5)
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertEqual(path, os.path.join(self.tmp.name, "test.xdf"))
+        self.assertTrue(client.acks_supported)
+        self.assertEqual(server.commands[0], "update")
+        self.assertEqual(server.commands[-1], "start")
+        client.stop_recording_async().result(5)
+        self.assertIsNone(client.recording_path)
+
+    def test_recorder_without_replies_is_verified_by_file(self):
+        server = RCSSimulator(reply=False).start()
+        future, client = self.start(server)
+        future.result(5)
+        self.assertFalse(client.acks_supported)
+
+    def test_missing_file_is_reported(self):
+        server = RCSSimulator(create_file=False).start()
+        future, client = self.start(server, timeout=0.3)
+        with self.assertRaises(LabRecorderError):
+            future.result(5)
+
+    def test_stop_waits_until_the_file_settles(self):
+        path = os.path.join(self.tmp.name, "growing.xdf")
+        client = LabRecorderRCSClient(host="127.0.0.1", port=1)
+
+        def write_footer():
+            for _ in range(6):
+                with open(path, 'ab') as f:
+                    f.write(b"x" * 100)
+                time.sleep(0.05)
+
+        writer = threading.Thread(target=write_footer)
+        started = time.monotonic()
+        writer.start()
+        self.assertTrue(client.wait_for_file_settled(path, settle=0.2, timeout=5))
+        self.assertGreaterEqual(time.monotonic() - started, 0.4)
+        writer.join()
+        self.assertEqual(os.path.getsize(path), 600)
+        client.close()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
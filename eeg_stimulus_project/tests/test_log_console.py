@@ -0,0 +1,83 @@
+import sys
+import os
+import logging
+import threading
+import unittest
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+
+from eeg_stimulus_project.gui.log_console import LogConsole, LogConsoleModel
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestLogConsole(unittest.TestCase):
+    """Test cases for the ring-buffered ControlWindow log console."""
+
+    def test_entries_wait_for_flush(self):
+        model = LogConsoleModel(capacity=10, refresh_hz=1)
+        model.append("one")
+        self.assertEqual(model.rowCount(), 0)
+        model.flush()
+        self.assertEqual(model.rowCount(), 1)
+        self.assertEqual(model.data(model.index(0), Qt.DisplayRole), "one")
+
+    def test_ring_buffer_keeps_newest(self):
+        model = LogConsoleModel(capacity=5, refresh_hz=1)
+        for batch in range(3):
+            for i in range(3):
+                model.append(str(batch * 3 + i))
+            model.flush()
+        self.assertEqual(model.rowCount(), 5)
+        self.assertEqual([entry.text for entry in model.entries()], ["4", "5", "6", "7", "8"])
+        for i in range(12):
+            model.append(str(i))
+        model.flush()
+        self.assertEqual([entry.text for entry in model.entries()], [str(i) for i in range(7, 12)])
+
+    def test_appends_from_threads(self):
+        model = LogConsoleModel(capacity=1000, refresh_hz=1)
+        threads = [threading.Thread(target=lambda: [model.append("x") for _ in range(100)]) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        model.flush()
+        self.assertEqual(model.rowCount(), 400)
+
+    def test_filters(self):
+        console = LogConsole(capacity=100, refresh_hz=1)
+        logger = logging.getLogger("test_log_console")
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        handler = console.handler()
+        logger.addHandler(handler)
+        try:
+            logger.debug("debug")
+            logger.info("host info")
+            logger.warning("host warning")
+            logger.info("client info", extra={'source': 'client'})
+        finally:
+            logger.removeHandler(handler)
+        console.model.flush()
+        texts = lambda: [console.proxy.index(row, 0).data() for row in range(console.proxy.rowCount())]
+        self.assertEqual(texts(), ["host info", "host warning", "[CLIENT] client info"])
+        console.level_box.setCurrentText('WARNING')
+        self.assertEqual(texts(), ["host warning"])
+        console.level_box.setCurrentText('DEBUG')
+        console.source_boxes['host'].setChecked(False)
+        self.assertEqual(texts(), ["[CLIENT] client info"])
+        console.source_boxes['host'].setChecked(True)
+        console.search_edit.setText("WARN")
+        self.assertEqual(texts(), ["host warning"])
+
+
+if __name__ == '__main__':
+    unittest.main()
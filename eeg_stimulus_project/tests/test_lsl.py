@@ -0,0 +1,72 @@
+import sys
+import os
+import unittest
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from eeg_stimulus_project.lsl.force_stream import TactileForceStream, parse_force_records
+
+
+class TestParseForceRecords(unittest.TestCase):
+    """Test cases for parsing the tactile Pi's data port output."""
+
+    def test_skips_header_and_keeps_partial_line(self):
+        records, remainder = parse_force_records(b"time,value\n1753470460.61,0\n1753470460.71,-2\n17534704")
+        self.assertEqual(records, [(1753470460.61, 0.0), (1753470460.71, -2.0)])
+        self.assertEqual(remainder, b"17534704")
+
+    def test_remainder_completes_on_next_chunk(self):
+        records, remainder = parse_force_records(b"1753470460.61,")
+        self.assertEqual(records, [])
+        records, remainder = parse_force_records(remainder + b"5\r\n")
+        self.assertEqual(records, [(1753470460.61, 5.0)])
+        self.assertEqual(remainder, b"")
+
+    def test_ignores_malformed_lines(self):
+        records, _ = parse_force_records(b"garbage\n1,2,3\nabc,1\n2.5,7\n")
+        self.assertEqual(records, [(2.5, 7.0)])
+
+
+class TestTactileForceStream(unittest.TestCase):
+    """Test cases for the Pi-to-LSL clock offset used by the force outlet."""
+
+    def setUp(self):
+        self.stream = TactileForceStream(source_id="test_tactile_force_stream")
+
+    def test_offset_uses_minimum_delay(self):
+        self.stream.update_clock_offset([(100.0, 1), (100.1, 2)], receive_time=10.3)
+        self.assertAlmostEqual(self.stream.clock_offset, 10.3 - 100.1)
+        # A slower chunk must not move the offset
+        self.stream.update_clock_offset([(100.2, 1)], receive_time=10.9)
+        self.assertAlmostEqual(self.stream.clock_offset, 10.3 - 100.1)
+        # A faster chunk tightens it
+        self.stream.update_clock_offset([(100.3, 1)], receive_time=10.35)
+        self.assertAlmostEqual(self.stream.clock_offset, 10.35 - 100.3)
+
+    def test_offset_follows_drift_after_the_window(self):
+        self.stream.clock_offset_window = 30.0
+        self.stream.update_clock_offset([(100.0, 1)], receive_time=10.0)
+        self.stream.update_clock_offset([(120.0, 1)], receive_time=30.2)
+        self.assertAlmostEqual(self.stream.clock_offset, 10.0 - 100.0)
+        # Once the fast chunk is older than the window, the offset moves up to the drifted clock
+        self.stream.update_clock_offset([(135.0, 1)], receive_time=45.3)
+        self.assertAlmostEqual(self.stream.clock_offset, 30.2 - 120.0)
+
+    def test_pushed_timestamps_never_decrease(self):
+        pushed = []
+        self.stream.outlet.push_chunk = lambda samples, timestamps: pushed.extend(timestamps)
+        self.stream.push_records([(100.0, 1), (100.5, 2)], receive_time=10.5)
+        # The faster chunk lowers the offset by 0.05 s, which would map 100.51 to 10.46
+        self.stream.push_records([(100.51, 3), (100.6, 4)], receive_time=10.55)
+        self.assertAlmostEqual(self.stream.clock_offset, 10.55 - 100.6)
+        self.assertEqual(pushed, sorted(pushed))
+        self.assertAlmostEqual(pushed[2], 10.5)
+
+    def test_push_records_counts_samples(self):
+        self.stream.push_records([(100.0, 1), (100.01, 2), (100.02, 3)], receive_time=5.0)
+        self.assertEqual(self.stream.samples_pushed, 3)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
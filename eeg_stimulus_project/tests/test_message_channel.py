@@ -0,0 +1,131 @@
+import sys
+import os
+import json
+import logging
+import socket
+import threading
+import time
+import unittest
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from eeg_stimulus_project.utils.logging_utils import NetworkLogHandler
+from eeg_stimulus_project.utils.message_channel import MessageChannel, channel_for, close_channel
+
+
+def read_lines(sock, count, timeout=5.0):
+    sock.settimeout(timeout)
+    buffer, lines = '', []
+    while len(lines) < count:
+        data = sock.recv(65536).decode('utf-8')
+        if not data:
+            break
+        buffer += data
+        while "\n" in buffer:
+            line, buffer = buffer.split("\n", 1)
+            lines.append(json.loads(line))
+    return lines
+
+
+class BlockingSocket:
+    """Socket stand-in whose sendall blocks until released, to hold the log thread mid-write."""
+
+    def __init__(self):
+        self.sent = []
+        self.release = threading.Event()
+
+    def sendall(self, data):
+        message = json.loads(data.decode('utf-8'))
+        if message.get("type") == "log_batch":
+            self.release.wait(5.0)
+        self.sent.append(message)
+
+
+class TestMessageChannel(unittest.TestCase):
+    """Test cases for the client's priority/log message channel."""
+
+    def setUp(self):
+        self.client, self.host = socket.socketpair()
+
+    def tearDown(self):
+        self.client.close()
+        self.host.close()
+
+    def test_control_messages_are_sent_immediately(self):
+        channel = MessageChannel(self.client, flush_interval=10.0)
+        channel.send({"action": "client_log", "message": "queued"})
+        channel.send({"action": "label", "label": "Image 1"})
+        self.assertEqual(read_lines(self.host, 1), [{"action": "label", "label": "Image 1"}])
+        self.assertEqual(channel.pending(), 1)
+        channel.close()
+        batch = read_lines(self.host, 1)[0]
+        self.assertEqual(batch["type"], "log_batch")
+        self.assertEqual(batch["messages"], [{"action": "client_log", "message": "queued"}])
+
+    def test_log_messages_are_coalesced_into_batches(self):
+        channel = MessageChannel(self.client, batch_size=10, flush_interval=0.5)
+        for i in range(25):
+            channel.log({"action": "client_log", "message": str(i)})
+        channel.close()
+        batches = read_lines(self.host, 3)
+        self.assertEqual([len(batch["messages"]) for batch in batches], [10, 10, 5])
+        messages = [m["message"] for batch in batches for m in batch["messages"]]
+        self.assertEqual(messages, [str(i) for i in range(25)])
+
+    def test_pressure_drops_info_before_warnings(self):
+        channel = MessageChannel(BlockingSocket(), queue_size=10, sample_every=1000)
+        channel.connection.release.set()
+        channel._thread = threading.current_thread()  # Keep the log thread from starting
+        for i in range(20):
+            channel.log({"type": "log_message", "levelno": logging.INFO, "message": str(i)})
+        channel.log({"type": "log_message", "levelno": logging.ERROR, "message": "error"})
+        self.assertLessEqual(channel.pending(), 10)
+        self.assertGreater(channel.dropped, 0)
+        self.assertIn("error", [m["message"] for m in channel._pending])
+
+    def test_labels_overtake_a_log_batch_in_progress(self):
+        connection = BlockingSocket()
+        channel = MessageChannel(connection, batch_size=1, flush_interval=0.0)
+        channel.log({"action": "client_log", "message": "first"})
+        channel.log({"action": "client_log", "message": "second"})
+        deadline = time.time() + 2.0
+        while channel.pending() > 1 and time.time() < deadline:
+            time.sleep(0.01)
+        # The first batch is blocked in sendall; a label has to wait for it, but goes before the second batch
+        sender = threading.Thread(target=channel.send, args=({"action": "label", "label": "L"},))
+        sender.start()
+        time.sleep(0.05)
+        connection.release.set()
+        sender.join(2.0)
+        channel.close()
+        order = [m.get("label") or m["messages"][0]["message"] for m in connection.sent]
+        self.assertEqual(order, ["first", "L", "second"])
+
+    def test_network_log_handler_ships_batches(self):
+        handler = NetworkLogHandler(self.client)
+        channel = handler.channel
+        logger = logging.getLogger("test_message_channel")
+        logger.addHandler(handler)
+        logger.propagate = False
+        try:
+            logger.warning("shipped")
+        finally:
+            logger.removeHandler(handler)
+            handler.close()
+        batch = read_lines(self.host, 1)[0]
+        record = batch["messages"][0]
+        self.assertEqual((record["type"], record["level"], record["message"]), ("log_message", "WARNING", "shipped"))
+        # Closing the handler retires its channel, so the connection gets a fresh one next time
+        self.assertIsNot(channel_for(self.client), channel)
+        close_channel(self.client)
+
+    def test_channel_is_shared_per_connection(self):
+        self.assertIs(channel_for(self.client), channel_for(self.client))
+        self.assertIsNot(channel_for(self.client), channel_for(self.host))
+        close_channel(self.client)
+        close_channel(self.host)
+
+
+if __name__ == '__main__':
+    unittest.main()
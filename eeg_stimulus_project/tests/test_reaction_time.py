@@ -0,0 +1,119 @@
+import sys
+import os
+import csv
+import tempfile
+import unittest
+
+import numpy as np
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEvent, Qt
+from PyQt5.QtGui import QKeyEvent
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication, QLabel
+from pylsl import local_clock
+
+from eeg_stimulus_project.data.reaction_time import RT_COLUMNS, EventClockMapper, ReactionTimeRecorder
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestReactionTime(unittest.TestCase):
+    """Test cases for reaction-time capture."""
+
+    def test_clock_mapper_uses_fastest_delivery(self):
+        mapper = EventClockMapper()
+        self.assertAlmostEqual(mapper.map(1000, received=10.005), 10.005)
+        # Delivered faster: the offset shrinks and later events map earlier
+        self.assertAlmostEqual(mapper.map(2000, received=11.001), 11.001)
+        self.assertAlmostEqual(mapper.map(3000, received=12.050), 12.001)
+
+    def test_vectorized_rts(self):
+        recorder = ReactionTimeRecorder()
+        recorder.onsets = [(0, 'image', 1.0, 'paint'), (0, 'prompt', 3.0, 'paint'),
+                           (1, 'image', 5.0, 'paint'), (1, 'prompt', 7.0, 'paint')]
+        recorder.responses = [(0, 'Y', 3.4567, 'qt'), (1, 'N', 7.25, 'global')]
+        columns = recorder.compute()
+        np.testing.assert_allclose(columns['rt_ms'], [456.7, 250.0])
+        np.testing.assert_allclose(columns['rt_from_image_ms'], [2456.7, 2250.0])
+        self.assertEqual(list(columns['source']), ['qt', 'global'])
+
+    def test_qt_timestamps_use_the_session_offset(self):
+        recorder = ReactionTimeRecorder()
+        recorder.onsets = [(0, 'prompt', 10.0, 'paint'), (1, 'prompt', 11.0, 'paint')]
+        # The first key was delivered 49 ms slower than the second; both are mapped with the faster offset
+        recorder.responses = [(0, 'Y', 10.05, 'qt'), (1, 'N', 11.001, 'qt')]
+        recorder.qt_stamps = [(0, 1000, 10.050), (1, 2000, 11.001)]
+        columns = recorder.compute()
+        np.testing.assert_allclose(columns['response_time'], [10.001, 11.001])
+        np.testing.assert_allclose(columns['rt_ms'], [1.0, 1.0])
+
+    def test_response_without_onset_is_nan(self):
+        recorder = ReactionTimeRecorder()
+        recorder.responses = [(0, 'Y', 1.0, 'qt')]
+        self.assertTrue(np.isnan(recorder.compute()['rt_ms'][0]))
+
+    def test_paint_onset(self):
+        recorder = ReactionTimeRecorder()
+        label = QLabel()
+        label.show()
+        QTest.qWaitForWindowExposed(label)
+        before = local_clock()
+        label.setText("Press Y or N")
+        recorder.mark_onset(0, 'prompt', label)
+        label.repaint()
+        self.assertEqual(len(recorder.onsets), 1)
+        trial, kind, t, source = recorder.onsets[0]
+        self.assertEqual((trial, kind, source), (0, 'prompt', 'paint'))
+        self.assertGreaterEqual(t, before)
+        label.repaint()
+        self.assertEqual(len(recorder.onsets), 1)  # Only the first paint counts
+        label.close()
+
+    def test_unpainted_onset_is_replaced(self):
+        recorder = ReactionTimeRecorder()
+        label = QLabel()
+        label.show()
+        QTest.qWaitForWindowExposed(label)
+        label.setText("image")
+        recorder.mark_onset(0, 'image', label)
+        label.setText("Press Y or N")
+        recorder.mark_onset(0, 'prompt', label)
+        label.repaint()
+        self.assertEqual([onset[1] for onset in recorder.onsets], ['prompt'])
+        label.close()
+
+    def test_key_event_timestamps(self):
+        recorder = ReactionTimeRecorder()
+        event = QKeyEvent(QEvent.KeyPress, Qt.Key_Y, Qt.NoModifier)
+        event.setTimestamp(5000)
+        t = recorder.key_event(0, 'Y', event)
+        self.assertEqual(recorder.responses[-1][3], 'qt')
+        self.assertLessEqual(t, local_clock())
+        # A posted event (no timestamp) takes the time of the global listener's key press
+        pressed = recorder.global_key('N')
+        t = recorder.key_event(1, 'N', QKeyEvent(QEvent.KeyPress, Qt.Key_N, Qt.NoModifier))
+        self.assertEqual((t, recorder.responses[-1][3]), (pressed, 'global'))
+        recorder.key_event(2, 'N', QKeyEvent(QEvent.KeyPress, Qt.Key_N, Qt.NoModifier))
+        self.assertEqual(recorder.responses[-1][3], 'delivery')
+
+    def test_save(self):
+        recorder = ReactionTimeRecorder()
+        recorder.onsets = [(0, 'prompt', 100.0, 'paint')]
+        recorder.responses = [(0, 'Y', 100.1234567, 'qt')]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'reaction_times.csv')
+            self.assertEqual(recorder.save(path), 1)
+            with open(path, newline='') as f:
+                rows = list(csv.reader(f))
+        self.assertEqual(rows[0], RT_COLUMNS)
+        self.assertEqual(rows[1][5:7], ['100.123457', '123.457'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import sys
+import os
+import queue
+import threading
+import unittest
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from eeg_stimulus_project.stimulus.tactile_box_code.remote_supervisor import LocalProcessChannel, RemoteScriptSupervisor
+
+
+def python_command(code):
+    return [sys.executable, "-u", "-c", code]
+
+
+class TestRemoteScriptSupervisor(unittest.TestCase):
+    """Test cases for the tactile remote script supervisor using a local subprocess stand-in."""
+
+    def collect(self, supervisor, timeout=10):
+        supervisor._thread.join(timeout)
+        self.assertFalse(supervisor.is_running())
+
+    def test_streams_output_and_restarts_after_exit(self):
+        output = queue.Queue()
+        starts = []
+        supervisor = RemoteScriptSupervisor(
+            lambda: LocalProcessChannel(python_command("print('1753470460.61,0'); print('1753470460.71,-2')")),
+            output.put,
+            on_started=starts.append,
+            max_restarts=2,
+            restart_backoff=0.05
+        )
+        supervisor.start()
+        self.collect(supervisor)
+
+        text = "".join(output.queue)
+        self.assertEqual(text.count("1753470460.61,0"), 3)
+        self.assertEqual(starts, [0, 1, 2])
+        self.assertEqual(supervisor.state, "failed")
+        self.assertEqual(supervisor.last_exit_status, 0)
+
+    def test_restarts_when_heartbeat_is_lost(self):
+        output = queue.Queue()
+        supervisor = RemoteScriptSupervisor(
+            lambda: LocalProcessChannel(python_command("import time; print('ready'); time.sleep(30)")),
+            output.put,
+            heartbeat_timeout=0.3,
+            max_restarts=1,
+            restart_backoff=0.05
+        )
+        supervisor.start()
+        self.collect(supervisor)
+        self.assertEqual(supervisor.restarts, 1)
+        self.assertIn("no output", "".join(output.queue))
+
+    def test_stop_does_not_restart(self):
+        output = queue.Queue()
+        started = threading.Event()
+        supervisor = RemoteScriptSupervisor(
+            lambda: LocalProcessChannel(python_command("import time\nwhile True:\n    print('1,1'); time.sleep(0.05)")),
+            output.put,
+            on_started=lambda restarts: started.set()
+        )
+        supervisor.start()
+        self.assertTrue(started.wait(5))
+        supervisor.stop()
+        self.assertFalse(supervisor.is_running())
+        self.assertEqual(supervisor.restarts, 0)
+        self.assertEqual(supervisor.state, "stopped")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
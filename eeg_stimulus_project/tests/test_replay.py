@@ -0,0 +1,74 @@
+import sys
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from pylsl import StreamInlet, resolve_byprop
+
+from eeg_stimulus_project.lsl.replay import SessionReplay, default_chunk_size, load_csv_streams, load_session
+from eeg_stimulus_project.tests.xdf_fixtures import stream_header, write_xdf
+
+EEG_HEADER = stream_header("ReplayTestEEG", "EEG", 2, 100, "float32",
+                           '<source_id>amp_1</source_id><desc><channels><channel><label>Fz</label><unit>microvolts</unit></channel>'
+                           '<channel><label>Cz</label><unit>microvolts</unit></channel></channels></desc>')
+MARKER_HEADER = stream_header("ReplayTestLabels", "Markers", 1, 0, "string")
+
+
+class TestReplay(unittest.TestCase):
+    """Test cases for re-streaming recorded sessions into LSL."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_load_csv_tables(self):
+        path = os.path.join(self.tmp.name, "recording__Tactile.csv")
+        with open(path, 'w') as f:
+            f.write("Timestamp,Channel_1\n" + "".join(f"{i / 100},{i}\n" for i in range(50)))
+        stream = load_csv_streams(path)[0]
+        self.assertEqual((stream.name, stream.type, stream.nominal_srate, len(stream)), ("Tactile", "Force", 100, 50))
+        self.assertEqual(default_chunk_size(stream), 1)
+
+        responses = os.path.join(self.tmp.name, "data.csv")
+        with open(responses, 'w') as f:
+            f.write("User Inputs,Elapsed Time\nYes,500\nNo,250\n")
+        stream = load_csv_streams(responses)[0]
+        np.testing.assert_allclose(stream.timestamps, [0.5, 0.75])
+        self.assertEqual(stream.samples, [["Yes"], ["No"]])
+
+    def test_replays_xdf_with_metadata(self):
+        path = os.path.join(self.tmp.name, "session.xdf")
+        write_xdf(path, 1000 + np.arange(200) / 100, [[i, -i] for i in range(200)],
+                  [1000.5, 1001.5], ["Beer Image", "Crosshair Shown"], EEG_HEADER, MARKER_HEADER)
+
+        replay = SessionReplay(load_session(path, ["ReplayTestEEG"]), speed=0)
+        self.assertEqual(replay.chunk_sizes, [10])
+        replay.start(wait_for_consumers=5.0)
+        try:
+            inlet = StreamInlet(resolve_byprop('name', 'ReplayTestEEG', timeout=5.0)[0])
+            info = inlet.info(timeout=5.0)
+            self.assertEqual(info.source_id(), "amp_1")
+            self.assertEqual(info.desc().child('channels').child('channel').child_value('label'), "Fz")
+            samples = []
+            for _ in range(50):
+                chunk, _ = inlet.pull_chunk(timeout=0.2)
+                samples.extend(chunk)
+                if len(samples) >= 200:
+                    break
+            replay.join(5.0)
+            self.assertEqual(len(samples), 200)
+            self.assertEqual(samples[-1], [199.0, -199.0])
+            self.assertEqual((replay.samples_pushed, replay.chunks_pushed), (200, 20))
+        finally:
+            replay.stop()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,93 @@
+import sys
+import os
+import csv
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from eeg_stimulus_project.data.data_saving import Save_Data
+from eeg_stimulus_project.data.response_journal import (JOURNAL_NAME, ResponseJournal, read_journal, restore_order,
+                                                        resume_state)
+
+TEST = "Stroop Multisensory Alcohol (Visual & Olfactory)"
+
+
+class TestResponseJournal(unittest.TestCase):
+    """Test cases for the write-ahead response journal."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base_dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_block(self, answered, finish=False):
+        journal = ResponseJournal.for_test(self.base_dir, TEST)
+        journal.record('block_start', test=TEST, order=["b.png", "a.png", "c.png"])
+        for index in range(answered):
+            journal.record('trial', index=index, label=f"trial {index}", elapsed=index * 1000)
+            journal.record('response', index=index, input="Yes", elapsed=index * 1000 + 500)
+        journal.record('trial', index=answered, label=f"trial {answered}", elapsed=answered * 1000)
+        if finish:
+            journal.record('block_end')
+        journal.close()
+
+    def test_records_are_durable_and_ordered(self):
+        journal = ResponseJournal.for_test(self.base_dir, TEST)
+        journal.record('trial', index=0)
+        journal.record('response', index=0, input="No", elapsed=10)
+        journal.close()
+        records = read_journal(os.path.join(self.base_dir, TEST, JOURNAL_NAME))
+        self.assertEqual([record['event'] for record in records], ['trial', 'response'])
+        self.assertGreaterEqual(journal.syncs, 1)
+        journal.record('ignored')  # After close
+
+    def test_resume_restores_responses_and_trial_index(self):
+        self.run_block(answered=2)
+        state = resume_state(self.base_dir, TEST)
+        self.assertEqual(state['resume_index'], 2)
+        self.assertEqual(state['user_inputs'], ["Yes", "Yes"])
+        self.assertEqual(state['elapsed_time'], [500, 1500])
+
+    def test_answered_last_trial_resumes_at_the_next(self):
+        journal = ResponseJournal.for_test(self.base_dir, TEST)
+        journal.record('block_start', test=TEST, order=[])
+        journal.record('trial', index=0)
+        journal.record('response', index=0, input="No", elapsed=300)
+        journal.close()
+        self.assertEqual(resume_state(self.base_dir, TEST)['resume_index'], 1)
+
+    def test_finished_block_does_not_resume(self):
+        self.run_block(answered=2, finish=True)
+        self.assertIsNone(resume_state(self.base_dir, TEST))
+        self.assertIsNone(resume_state(None, TEST))
+
+    def test_torn_last_line_is_skipped(self):
+        self.run_block(answered=1)
+        with open(os.path.join(self.base_dir, TEST, JOURNAL_NAME), 'a') as f:
+            f.write('{"event": "respo')
+        self.assertEqual(resume_state(self.base_dir, TEST)['resume_index'], 1)
+
+    def test_restore_order(self):
+        assets = [SimpleNamespace(filename=f"/assets/{name}") for name in ("a.png", "b.png", "c.png")]
+        restored = restore_order(assets, ["c.png", "a.png", "b.png"])
+        self.assertEqual([os.path.basename(asset.filename) for asset in restored], ["c.png", "a.png", "b.png"])
+        self.assertIsNone(restore_order(assets, ["c.png", "a.png", "d.png"]))
+
+    def test_save_data_stroop_replaces_atomically(self):
+        saver = Save_Data(self.base_dir, "2")
+        saver.save_data_stroop(TEST, ["Yes"], [100])
+        saver.save_data_stroop(TEST, ["No", "Yes"], [200, 300])
+        test_dir = os.path.join(self.base_dir, TEST)
+        with open(os.path.join(test_dir, 'data.csv'), newline='') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows, [['User Inputs', 'Elapsed Time'], ['No', '200'], ['Yes', '300']])
+        self.assertNotIn('data.csv.tmp', os.listdir(test_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import sys
+import os
+import tempfile
+import time
+import unittest
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from eeg_stimulus_project.data.session_catalog import SessionCatalog
+from eeg_stimulus_project.tests.xdf_fixtures import stream_header, write_xdf
+
+EEG_HEADER = stream_header("EEG", "EEG", 1, 100, "float32")
+
+
+class TestSessionCatalog(unittest.TestCase):
+    """Test cases for the SQLite session catalog."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = os.path.join(self.tmp.name, "saved_data")
+        self.test_dir = os.path.join(self.data_dir, "subject_7", "test_1", "Unisensory Neutral Visual")
+        os.makedirs(self.test_dir)
+        # 1 s at 100 Hz with 10 samples missing
+        stamps = [i / 100 for i in range(101) if not 40 <= i < 50]
+        write_xdf(os.path.join(self.test_dir, "recording.xdf"), stamps, [[0.0]] * len(stamps),
+                  [0.1, 0.5, 0.9], ["Crosshair Shown", "Beer Image", "Beer Image: Yes"], eeg_header=EEG_HEADER)
+        with open(os.path.join(self.test_dir, "data.csv"), 'w') as f:
+            f.write("User Inputs,Elapsed Time\nYes,100\n")
+        self.catalog = SessionCatalog(db_path=os.path.join(self.tmp.name, "catalog.sqlite"), data_dir=self.data_dir)
+
+    def tearDown(self):
+        self.catalog.close()
+        self.tmp.cleanup()
+
+    def test_update_and_query(self):
+        self.assertEqual(self.catalog.update(), 2)
+        xdf = self.catalog.query(subject=7, kind="xdf")[0]
+        self.assertEqual((xdf['test_number'], xdf['condition']), ("1", "Unisensory Neutral Visual"))
+        self.assertEqual((xdf['sample_count'], xdf['marker_count'], xdf['dropped_samples']), (91, 3, 10))
+        self.assertAlmostEqual(xdf['duration'], 1.0)
+        self.assertEqual(len(xdf['sha256']), 64)
+        self.assertEqual({s['name'] for s in self.catalog.streams(xdf['id'])}, {"EEG", "labels"})
+        self.assertEqual(self.catalog.query(kind="csv")[0]['sample_count'], 1)
+
+    def test_update_is_incremental(self):
+        self.catalog.update()
+        self.assertEqual(self.catalog.update(), 0)
+        csv_path = os.path.join(self.test_dir, "data.csv")
+        with open(csv_path, 'a') as f:
+            f.write("No,250\n")
+        os.utime(csv_path, ns=(time.time_ns(), time.time_ns() + 1000))
+        self.assertEqual(self.catalog.update(self.test_dir), 1)
+        self.assertEqual(len(self.catalog.query()), 2)
+        os.remove(csv_path)
+        self.assertEqual(self.catalog.remove_missing(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
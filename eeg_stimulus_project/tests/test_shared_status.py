@@ -0,0 +1,95 @@
+import sys
+import os
+import pickle
+import threading
+import time
+import unittest
+import multiprocessing
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from eeg_stimulus_project.utils.shared_status import FIELDS, SharedStatus
+
+
+def _set_flag(status, field, value):
+    status[field] = value
+
+
+def _wait_and_report(status, sequence, results):
+    results.put((status.wait_for_change(sequence, timeout=30), status['eyetracker_connected']))
+
+
+class TestSharedStatus(unittest.TestCase):
+    """Test cases for the shared-memory status flags."""
+
+    def setUp(self):
+        self.status = SharedStatus()
+
+    def tearDown(self):
+        self.status.close()
+
+    def test_behaves_like_the_status_dict(self):
+        self.assertEqual(dict(self.status), {field: False for field in FIELDS})
+        self.status['lsl_enabled'] = True
+        self.assertTrue(self.status['lsl_enabled'])
+        self.assertTrue(self.status.get('lsl_enabled', False))
+        self.assertEqual(self.status.get('unknown', 'default'), 'default')
+        self.assertIn('tactile_connected', self.status)
+        with self.assertRaises(KeyError):
+            self.status['unknown'] = True
+
+    def test_sequence_counts_changes_only(self):
+        self.status['lab_recorder_connected'] = True
+        self.status['lab_recorder_connected'] = True
+        self.assertEqual(self.status.sequence, 1)
+        self.status.update(lab_recorder_connected=False, tactile_connected=True)
+        self.assertEqual(self.status.sequence, 3)
+
+    def test_wait_for_change_wakes_on_write(self):
+        sequence = self.status.sequence
+        timer = threading.Timer(0.05, _set_flag, (self.status, 'eyetracker_connected', True))
+        timer.start()
+        started = time.monotonic()
+        self.assertEqual(self.status.wait_for_change(sequence, timeout=5), sequence + 1)
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(self.status.wait_for_change(sequence + 1, timeout=0.01), sequence + 1)
+
+    def test_spawned_process_shares_the_block(self):
+        context = multiprocessing.get_context('spawn')
+        self.status.close()
+        self.status = SharedStatus(context=context)
+        results = context.Queue()
+        waiter = context.Process(target=_wait_and_report, args=(self.status, self.status.sequence, results))
+        waiter.start()
+        writer = context.Process(target=_set_flag, args=(self.status, 'eyetracker_connected', True))
+        writer.start()
+        writer.join(timeout=30)
+        self.assertTrue(self.status['eyetracker_connected'])
+        sequence, seen = results.get(timeout=30)
+        waiter.join(timeout=30)
+        self.assertEqual(sequence, 1)
+        self.assertTrue(seen)
+
+    def test_attached_copy_can_be_dropped_without_close(self):
+        # Child processes never close their copy; dropping it must not raise BufferError
+        errors = []
+        previous_hook, sys.unraisablehook = sys.unraisablehook, errors.append
+        try:
+            attached = SharedStatus(name=self.status.name)
+            self.status['lsl_enabled'] = True
+            self.assertTrue(attached['lsl_enabled'])
+            self.assertEqual(attached.sequence, 1)
+            del attached
+        finally:
+            sys.unraisablehook = previous_hook
+        self.assertEqual(errors, [])
+
+    def test_condition_is_only_inherited(self):
+        # Like a Queue, the status has to be handed to a child when it is started
+        with self.assertRaises(RuntimeError):
+            pickle.dumps(self.status)
+
+
+if __name__ == "__main__":
+    unittest.main()
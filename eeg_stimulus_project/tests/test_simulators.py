@@ -0,0 +1,87 @@
+import sys
+import os
+import json
+import socket
+import struct
+import tempfile
+import time
+import unittest
+import urllib.request
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from eeg_stimulus_project.lsl.force_stream import parse_force_records
+from eeg_stimulus_project.simulators.common import simulated_delay
+from eeg_stimulus_project.simulators.fake_ticcmd import write_launcher
+from eeg_stimulus_project.simulators.force_server import ForceSimulator
+from eeg_stimulus_project.simulators.pupil_device import PupilDeviceSimulator
+from eeg_stimulus_project.stimulus.turn_table_code.tic_driver import TicCmdTransport
+
+
+class TestSimulators(unittest.TestCase):
+    """Test cases for the local hardware stand-ins."""
+
+    def test_delay_never_negative(self):
+        self.assertEqual(simulated_delay(0.0, 0.0), 0.0)
+        self.assertGreaterEqual(simulated_delay(0.0, 0.001), 0.0)
+
+    def test_force_server_streams_records(self):
+        server = ForceSimulator(sampling_rate=500, chunk_size=5, touch_interval=0.1, touch_duration=0.05,
+                                touch_force=1000, seed=1).start()
+        self.addCleanup(server.stop)
+        records, pending = [], b""
+        with socket.create_connection(server.address, timeout=2) as s:
+            while len(records) < 100:
+                data = s.recv(4096)
+                self.assertTrue(data)
+                chunk, pending = parse_force_records(pending + data)
+                records.extend(chunk)
+        forces = [force for _, force in records]
+        self.assertGreater(max(forces), 500)
+        self.assertLess(min(forces), 100)
+        self.assertTrue(all(b[0] >= a[0] for a, b in zip(records, records[1:])))
+
+    def test_fake_ticcmd_moves_between_invocations(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            transport = TicCmdTransport("00001234", write_launcher(tmp))
+            transport.halt_and_set_position(0)
+            transport.move_to(400)
+            deadline = time.monotonic() + 20
+            status = transport.read_status()
+            while status['position'] != 400 and time.monotonic() < deadline:
+                status = transport.read_status()
+            self.assertEqual(status['target'], 400)
+            self.assertEqual(status['position'], 400)
+            self.assertTrue(status['energized'])
+
+    def test_pupil_device_api(self):
+        device = PupilDeviceSimulator().start()
+        self.addCleanup(device.stop)
+        base = f"http://{device.host}:{device.port}/api"
+
+        def call(path, body=None):
+            request = urllib.request.Request(base + path, data=json.dumps(body or {}).encode() if body is not None else None)
+            with urllib.request.urlopen(request, timeout=2) as response:
+                return json.load(response)
+
+        phone = call("/status")['result'][0]
+        self.assertEqual(phone['model'], "Phone")
+        recording_id = call("/recording:start", {})['result']['id']
+        event = call("/event", {'name': "Beer Image", 'timestamp': 123})['result']
+        self.assertEqual((event['name'], event['recording_id']), ("Beer Image", recording_id))
+        call("/recording:stop_and_save", {})
+        self.assertEqual(device.recordings, [recording_id])
+
+        with socket.create_connection((device.host, phone['data']['time_echo_port']), timeout=2) as s:
+            s.sendall(struct.pack("!Q", 42))
+            reply = b""
+            while len(reply) < 16:
+                reply += s.recv(16 - len(reply))
+        client_ms, device_ms = struct.unpack("!QQ", reply)
+        self.assertEqual(client_ms, 42)
+        self.assertAlmostEqual(device_ms / 1000, time.time(), delta=5)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,75 @@
+import sys
+import os
+import json
+import subprocess
+import tempfile
+import textwrap
+import unittest
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from eeg_stimulus_project.utils.startup_profiler import StartupProfiler
+
+
+class TestStartupProfiler(unittest.TestCase):
+    """Test cases for the start-up profiler and the lazily loaded dependencies."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        # Two throwaway modules, one importing the other, each spending a known time at import
+        with open(os.path.join(self.tmp.name, "slow_outer_mod.py"), "w") as f:
+            f.write(textwrap.dedent("""
+                import time
+                time.sleep(0.05)
+                import slow_inner_mod
+            """))
+        with open(os.path.join(self.tmp.name, "slow_inner_mod.py"), "w") as f:
+            f.write("import time\ntime.sleep(0.1)\n")
+        sys.path.insert(0, self.tmp.name)
+
+    def tearDown(self):
+        sys.path.remove(self.tmp.name)
+        for name in ("slow_outer_mod", "slow_inner_mod"):
+            sys.modules.pop(name, None)
+        self.tmp.cleanup()
+
+    def test_import_times_split_self_and_cumulative(self):
+        profiler = StartupProfiler("test").install()
+        try:
+            import slow_outer_mod  # noqa: F401
+        finally:
+            profiler.uninstall()
+        outer_total, outer_self = profiler.imports["slow_outer_mod"]
+        inner_total, inner_self = profiler.imports["slow_inner_mod"]
+        self.assertGreaterEqual(inner_self, 0.09)
+        self.assertGreaterEqual(outer_total, outer_self + inner_total - 1e-6)
+        self.assertLess(outer_self, inner_total)
+        self.assertEqual(profiler.top_imports(1, "cumulative")[0]["module"], "slow_outer_mod")
+
+    def test_report_is_saved_with_milestones(self):
+        profiler = StartupProfiler("test")
+        profiler.mark("first_window")
+        profiler.mark("first_window")
+        path = profiler.save(self.tmp.name)
+        with open(path, encoding="utf-8") as f:
+            report = json.load(f)
+        self.assertEqual(report["role"], "test")
+        self.assertEqual(list(report["milestones_ms"]), ["first_window"])
+
+    def test_heavy_dependencies_are_not_imported_eagerly(self):
+        code = ("import sys, json; sys.path.insert(0, sys.argv[1]);"
+                "import eeg_stimulus_project.assets.asset_handler as assets;"
+                "import eeg_stimulus_project.utils.xdf_file_handler;"
+                "import eeg_stimulus_project.lsl.stream_manager;"
+                "print(json.dumps({'modules': [m for m in ('PIL', 'pandas', 'pyxdf') if m in sys.modules],"
+                "'personalized': assets.personalized_images}))")
+        result = subprocess.run([sys.executable, "-c", code, project_root], capture_output=True, text=True, check=True)
+        loaded = json.loads(result.stdout.strip().splitlines()[-1])
+        self.assertEqual(loaded["modules"], [])
+        self.assertIsNone(loaded["personalized"])
+
+
+if __name__ == "__main__":
+    unittest.main()
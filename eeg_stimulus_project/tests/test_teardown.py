@@ -0,0 +1,86 @@
+import sys
+import os
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QObject
+from PyQt5.QtTest import QSignalSpy, QTest
+from PyQt5.QtWidgets import QApplication
+
+from eeg_stimulus_project.gui.teardown import DONE, SAVING, STOPPING_DEVICES, Teardown
+
+app = QApplication.instance() or QApplication([])
+
+
+class Receiver(QObject):
+    """Collects the finished report on the GUI thread."""
+
+    def __init__(self):
+        super().__init__()
+        self.reports = []
+
+    def on_finished(self, report):
+        self.reports.append(report)
+
+
+class TestTeardown(unittest.TestCase):
+    """Test cases for the stop/teardown state machine."""
+
+    def test_devices_stop_in_parallel_before_saving(self):
+        order = []
+        teardown = Teardown("stop test", timeout=5)
+        teardown.add_device('labrecorder', lambda: (time.sleep(0.3), order.append('labrecorder')))
+        teardown.add_device('eyetracker', lambda: (time.sleep(0.3), order.append('eyetracker')))
+        teardown.add_save('data', lambda: order.append('data'))
+        states = QSignalSpy(teardown.state_changed)
+        receiver = Receiver()
+        teardown.finished.connect(receiver.on_finished)
+
+        started = time.perf_counter()
+        teardown.start()
+        # start() returns immediately; the GUI thread keeps running
+        self.assertLess(time.perf_counter() - started, 0.1)
+        report = teardown.wait(5)
+        self.assertLess(report['total_ms'], 550)
+        self.assertEqual(order[-1], 'data')
+        self.assertTrue(report['ok'])
+        self.assertGreaterEqual(report['devices']['labrecorder']['duration_ms'], 290)
+
+        QTest.qWait(50)
+        self.assertEqual(receiver.reports, [report])
+        self.assertEqual([args[0] for args in states], [STOPPING_DEVICES, SAVING, DONE])
+
+    def test_hanging_device_times_out_and_failures_are_reported(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        teardown = Teardown("stop test")
+        teardown.add_device('hangs', lambda: time.sleep(2), timeout=0.2)
+        teardown.add_device('future', lambda: executor.submit(time.sleep, 2), timeout=0.2)
+        teardown.add_device('broken', lambda: 1 / 0)
+        teardown.add_save('data', lambda: None)
+        teardown.start()
+        report = teardown.wait(5)
+        executor.shutdown(wait=False)
+        self.assertLess(report['total_ms'], 1000)
+        self.assertEqual(report['devices']['hangs']['status'], 'timeout')
+        self.assertEqual(report['devices']['future']['status'], 'timeout')
+        self.assertTrue(report['devices']['broken']['status'].startswith('failed'))
+        self.assertEqual(report['saves']['data']['status'], 'ok')
+        self.assertFalse(report['ok'])
+
+    def test_cannot_start_twice(self):
+        teardown = Teardown("stop test")
+        teardown.start()
+        teardown.wait(5)
+        with self.assertRaises(RuntimeError):
+            teardown.start()
+
+
+if __name__ == "__main__":
+    unittest.main()
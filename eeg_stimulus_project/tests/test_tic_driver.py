@@ -0,0 +1,152 @@
+import sys
+import os
+import threading
+import unittest
+from concurrent.futures import Future
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+
+from eeg_stimulus_project.config import config
+from eeg_stimulus_project.stimulus.turn_table_code.tic_driver import TicDriver, SimulatedTicTransport, MotionTimeout
+from eeg_stimulus_project.stimulus.turn_table_code.turntable_controller import TurntableController
+from eeg_stimulus_project.stimulus.turn_table_code.doorcode import DoorController
+from eeg_stimulus_project.stimulus.turn_table_code.motion_planner import MotionPlanner, predict_move_time
+from eeg_stimulus_project.stimulus.turn_table_code.turntable_gui import TurntableWindow
+
+app = QApplication.instance() or QApplication([])
+
+
+class TestTicDriver(unittest.TestCase):
+    """Test cases for the persistent Tic driver using the simulated backend."""
+
+    def setUp(self):
+        self.driver = TicDriver(SimulatedTicTransport(max_speed=6000000, max_accel=4000000))
+
+    def tearDown(self):
+        self.driver.close()
+
+    def test_move_future_resolves_at_target(self):
+        status = self.driver.move_to(-200, timeout=5).result(6)
+        self.assertLess(abs(status['position'] + 200), 5)
+        self.assertEqual(self.driver.get_position(), status['position'])
+        self.assertFalse(self.driver.is_moving())
+
+    def test_callback_runs_when_move_completes(self):
+        finished = threading.Event()
+        self.driver.move_to(400, timeout=5, callback=lambda future: finished.set())
+        self.assertTrue(finished.wait(6))
+
+    def test_move_times_out_when_deenergized(self):
+        self.driver.deenergize()
+        with self.assertRaises(MotionTimeout):
+            self.driver.move_to(1000, timeout=0.2).result(2)
+
+    def test_max_accel_leaves_deceleration_alone(self):
+        self.driver.set_max_accel(100000).result(2)
+        self.assertEqual(self.driver.transport.max_decel, 0)
+        self.driver.set_max_decel(200000).result(2)
+        self.assertEqual((self.driver.transport.max_accel, self.driver.transport.max_decel), (100000, 200000))
+
+
+class TestMotorControllers(unittest.TestCase):
+    """Test cases for the turntable and door controllers on top of the simulated driver."""
+
+    def test_turntable_takes_shortest_path(self):
+        controller = TurntableController(driver=TicDriver(SimulatedTicTransport()))
+        try:
+            controller.move_to_bay(15, timeout=5)
+            self.assertEqual(controller.target_steps, 200)
+            self.assertLess(abs(controller.get_position() - 200), 5)
+            future = controller.move_to_bay(2, wait=False, timeout=5)
+            self.assertEqual(controller.current_bay, 2)
+            future.result(6)
+            self.assertEqual(controller.target_steps, -400)
+        finally:
+            controller.close()
+
+    def test_door_deenergizes_after_open(self):
+        door = DoorController(driver=TicDriver(SimulatedTicTransport()))
+        try:
+            door.open_async().result(10)
+            status = door.driver.refresh_status().result()
+            self.assertLess(abs(status['position'] + 400), 5)
+            self.assertFalse(status['energized'])
+        finally:
+            door.shutdown()
+
+
+class TestMotionPlanner(unittest.TestCase):
+    """Test cases for turntable move prediction and prefetching."""
+
+    def setUp(self):
+        self.controller = TurntableController(driver=TicDriver(SimulatedTicTransport()))
+        self.planner = MotionPlanner(self.controller)
+
+    def tearDown(self):
+        self.controller.close()
+
+    def test_predict_move_time_profiles(self):
+        # 600 pulses/s cruise and 40000 pulses/s^2: 1600 steps is a trapezoid, 4 steps a triangle
+        self.assertAlmostEqual(predict_move_time(1600, 6000000, 4000000), 1600 / 600 + 600 / 40000)
+        self.assertAlmostEqual(predict_move_time(-4, 6000000, 4000000), 2 * (4 / 40000) ** 0.5)
+        self.assertEqual(predict_move_time(0, 6000000, 4000000), 0.0)
+
+    def test_schedule_follows_test_order(self):
+        times = self.planner.schedule(["a", "b", "c"], {"a": 1, "b": 3, "c": None})
+        self.assertEqual(times[0], 0.0)
+        self.assertGreater(times[1], 0.0)
+        self.assertEqual(times[2], 0.0)
+
+    def test_prefetch_reuses_move_to_same_bay(self):
+        first = self.planner.prefetch(1)
+        self.assertGreater(self.planner.ready_in_ms(), 0)
+        self.assertIs(self.planner.prefetch(1), first)
+        first.result(5)
+        self.assertEqual(self.planner.ready_in_ms(), 0)
+
+    def test_prefetch_retries_a_failed_move(self):
+        self.planner.prefetch(1).result(5)
+        failed = Future()
+        failed.set_exception(MotionTimeout("move did not finish"))
+        self.planner.pending_future = failed
+        retried = self.planner.prefetch(1)
+        self.assertIsNot(retried, failed)
+        retried.result(5)
+
+
+
+class TestTurntableSequence(unittest.TestCase):
+    """Test cases for the turntable window's trial sequence on simulated motors."""
+
+    def setUp(self):
+        self.backend = config.get('hardware.motors.backend')
+        config.set('hardware.motors.backend', 'simulated')
+        self.sent = []
+        self.window = TurntableWindow(test_order=["Beer"], object_to_bay={"Beer": 2}, tactile_mode=True,
+                                      send_message=self.sent.append)
+
+    def tearDown(self):
+        self.window.stop_test_sequence()
+        self.window.controller.close()
+        self.window.door_controller.shutdown()
+        self.window.close()
+        config.set('hardware.motors.backend', self.backend)
+
+    def test_pause_and_resume_during_a_move_reach_the_bay_once(self):
+        self.window.run_test_sequence()
+        self.window.pause_test_sequence()
+        self.window.resume_test_sequence()
+        self.window.planner.pending_future.result(5)
+        QTest.qWait(200)
+        self.assertEqual(self.sent, [{"action": "touchbox_lsl_true"}])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,94 @@
+import sys
+import os
+import json
+import socket
+import tempfile
+import unittest
+from multiprocessing import Queue
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from eeg_stimulus_project.main import warm_workers
+from eeg_stimulus_project.main.warm_workers import WarmWorkerPool
+from eeg_stimulus_project.utils.shared_status import SharedStatus
+
+
+class ProbeWindow:
+    """Stands in for a window class: records how it was built, greets over the connection and exits."""
+
+    def __init__(self, connection, shared_status, log_queue, base_dir, test_number, client=False):
+        self.connection = connection
+        self.settings = {'base_dir': base_dir, 'test_number': test_number, 'client': client,
+                         'shared_status': dict(shared_status), 'pid': os.getpid()}
+
+    def show(self):
+        with open(os.path.join(self.settings['base_dir'], 'probe.json'), 'w') as f:
+            json.dump(self.settings, f)
+        if self.connection is not None:
+            self.connection.sendall(b"ready")
+        raise SystemExit(0)
+
+
+class TestWarmWorkers(unittest.TestCase):
+    """Test cases for the pre-started child processes."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        warm_workers.ROLES['probe'] = (__name__, 'ProbeWindow')
+        self.log_queue = Queue()
+        self.shared_status = SharedStatus()
+        self.shared_status['lsl_enabled'] = True
+
+    def tearDown(self):
+        warm_workers.ROLES.pop('probe', None)
+        self.shared_status.close()
+        self.tmp.cleanup()
+
+    def read_probe(self):
+        with open(os.path.join(self.tmp.name, 'probe.json')) as f:
+            return json.load(f)
+
+    def test_warm_worker_receives_settings_and_connection(self):
+        pool = WarmWorkerPool(self.shared_status, self.log_queue, enabled=True)
+        pool.warm_up(roles=('probe',))
+        warm_pid = pool.workers['probe'][0].pid
+        ours, theirs = socket.socketpair()
+        try:
+            process = pool.launch('probe', connection=theirs, base_dir=self.tmp.name, test_number='2')
+            ours.settimeout(30)
+            self.assertEqual(ours.recv(5), b"ready")
+            process.join(timeout=30)
+        finally:
+            ours.close()
+            theirs.close()
+        self.assertEqual(process.exitcode, 0)
+        probe = self.read_probe()
+        self.assertEqual(probe['pid'], warm_pid)
+        self.assertEqual(probe['test_number'], '2')
+        self.assertEqual(probe['shared_status'], self.shared_status.snapshot())
+
+    def test_disabled_pool_starts_a_process_at_launch(self):
+        pool = WarmWorkerPool(self.shared_status, self.log_queue, enabled=False)
+        pool.warm_up(roles=('probe',))
+        self.assertEqual(pool.workers, {})
+        process = pool.launch('probe', connection=None, base_dir=self.tmp.name, test_number='1')
+        process.join(timeout=30)
+        self.assertEqual(process.exitcode, 0)
+        self.assertEqual(self.read_probe()['pid'], process.pid)
+
+    def test_released_workers_exit(self):
+        pool = WarmWorkerPool(self.shared_status, self.log_queue, enabled=True)
+        pool.warm_up(roles=('probe',))
+        process = pool.workers['probe'][0]
+        pool.shutdown(timeout=30)
+        self.assertFalse(process.is_alive())
+        self.assertEqual(process.exitcode, 0)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, 'probe.json')))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import sys
+import os
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+import pyxdf
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from eeg_stimulus_project.data.xdf_recorder import XDFWriter, TAG_SAMPLES, encode_varlen
+from eeg_stimulus_project.utils.xdf_file_handler import XDFIndexedReader, index_path_for
+from eeg_stimulus_project.tests.xdf_fixtures import EEG_HEADER, MARKER_HEADER
+
+
+class TestXDFIndexedReader(unittest.TestCase):
+    """Test cases for the indexed XDF reader against pyxdf."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "session.xdf")
+        writer = XDFWriter(self.path)
+        writer.write_stream_header(1, EEG_HEADER)
+        writer.write_stream_header(2, MARKER_HEADER)
+        for start in range(0, 100, 20):
+            stamps = [i / 100 for i in range(start, start + 20)]
+            writer.write_samples(1, stamps, [[i, 2 * i] for i in range(start, start + 20)], 'float32')
+        # A chunk without time stamps, as LabRecorder writes for regularly sampled data
+        body = encode_varlen(5) + b"".join(b"\x00" + struct.pack('<2f', i, 2 * i) for i in range(100, 105))
+        writer.write_chunk(TAG_SAMPLES, body, 1)
+        writer.write_samples(2, [0.5, 0.75], [["Beer Image"], ["Crosshair Shown"]], 'string')
+        writer.write_clock_offset(1, 10.0, 0.0)
+        writer.write_clock_offset(2, 10.0, 0.0)
+        writer.write_boundary()
+        writer.write_stream_footer(1, 0.0, 1.04, 105, [])
+        writer.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_streams_listed_and_index_persisted(self):
+        reader = XDFIndexedReader(self.path)
+        self.assertEqual([(s['name'], s['sample_count']) for s in reader.streams], [("EEG", 105), ("labels", 2)])
+        self.assertTrue(os.path.exists(index_path_for(self.path)))
+        self.assertEqual(XDFIndexedReader(self.path).index, reader.index)
+
+    def test_matches_pyxdf(self):
+        streams, _ = pyxdf.load_xdf(self.path, synchronize_clocks=False, dejitter_timestamps=False)
+        expected = {s['info']['name'][0]: s for s in streams}
+        reader = XDFIndexedReader(self.path)
+        eeg = reader.load_stream("EEG", synchronize_clocks=False)
+        np.testing.assert_array_equal(eeg['time_series'], expected["EEG"]['time_series'])
+        np.testing.assert_allclose(eeg['time_stamps'], expected["EEG"]['time_stamps'])
+        labels = reader.load_stream(2)
+        self.assertEqual(labels['time_series'], expected["labels"]['time_series'])
+
+    def test_time_range(self):
+        eeg = XDFIndexedReader(self.path).load_stream("EEG", t_start=0.45, t_end=0.5)
+        np.testing.assert_array_equal(eeg['time_series'][:, 0], [45, 46, 47, 48, 49])
+
+    def test_clock_synchronization_matches_pyxdf(self):
+        path = os.path.join(self.tmp.name, "drift.xdf")
+        writer = XDFWriter(path)
+        writer.write_stream_header(1, EEG_HEADER)
+        writer.write_clock_offset(1, 0.0, 2.0)
+        writer.write_samples(1, [i / 100 for i in range(100)], [[i, 2 * i] for i in range(100)], 'float32')
+        writer.write_clock_offset(1, 1.0, 2.5)
+        writer.write_stream_footer(1, 0.0, 0.99, 100, [])
+        writer.close()
+        streams, _ = pyxdf.load_xdf(path, synchronize_clocks=True, dejitter_timestamps=False)
+        eeg = XDFIndexedReader(path).load_stream("EEG")
+        np.testing.assert_allclose(eeg['time_stamps'], streams[0]['time_stamps'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,70 @@
+import sys
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pyxdf
+from pylsl import StreamInfo, local_clock
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from eeg_stimulus_project.data.xdf_recorder import XDFRecorder
+
+
+class FakeInlet:
+    """Inlet that hands out prepared chunks, one per pull."""
+
+    def __init__(self, info, chunks):
+        self._info = info
+        self.chunks = list(chunks)
+
+    def info(self):
+        return self._info
+
+    def pull_chunk(self, timeout=0.0, max_samples=1024):
+        if self.chunks:
+            return self.chunks.pop(0)
+        return [], []
+
+    def time_correction(self, timeout=1.0):
+        return 0.25
+
+
+class TestXDFRecorder(unittest.TestCase):
+    """Test cases for the in-process XDF recorder, read back with pyxdf."""
+
+    def test_recorded_file_loads_with_pyxdf(self):
+        eeg_info = StreamInfo("TestEEG", "EEG", 2, 100, 'float32', "test_eeg")
+        marker_info = StreamInfo("labels", "Markers", 1, 0, 'string', "test_labels")
+        eeg_chunks = [([[i, -i] for i in range(start, start + 10)], [start / 100 for start in range(start, start + 10)])
+                      for start in (0, 10, 20)]
+        marker_chunks = [([["Crosshair Shown"], ["Beer Image"]], [0.05, 0.15])]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "session.xdf")
+            recorder = XDFRecorder(path, stream_names=[], boundary_interval=0.05)
+            started = local_clock()
+            recorder.start(stream_infos=[])
+            recorder.add_inlet(FakeInlet(eeg_info, eeg_chunks))
+            recorder.add_inlet(FakeInlet(marker_info, marker_chunks))
+            stats = recorder.stop()
+            stopped = local_clock()
+            self.assertEqual(stats['samples'], 32)
+
+            streams, header = pyxdf.load_xdf(path, synchronize_clocks=False, dejitter_timestamps=False)
+        by_name = {stream['info']['name'][0]: stream for stream in streams}
+        eeg = by_name["TestEEG"]
+        self.assertEqual(eeg['time_series'].shape, (30, 2))
+        np.testing.assert_allclose(eeg['time_series'][:, 0], np.arange(30))
+        np.testing.assert_allclose(eeg['time_stamps'], np.arange(30) / 100)
+        self.assertEqual(int(eeg['footer']['info']['sample_count'][0]), 30)
+        self.assertEqual(by_name["labels"]['time_series'], [["Crosshair Shown"], ["Beer Image"]])
+        # Clock offsets are stamped on the sender's clock, as LabRecorder does
+        np.testing.assert_allclose(eeg['clock_values'], 0.25)
+        self.assertTrue(all(started - 0.25 <= t <= stopped - 0.25 for t in eeg['clock_times']))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
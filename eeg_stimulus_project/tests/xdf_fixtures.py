@@ -0,0 +1,38 @@
+"""
+Small XDF recordings shared by the tests: an EEG stream (id 1) and a string marker stream (id 2),
+written with the in-process XDFWriter.
+"""
+
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from eeg_stimulus_project.data.xdf_recorder import XDFWriter
+
+
+def stream_header(name, stream_type, channel_count, nominal_srate, channel_format, extra=''):
+    """Return the XML header of a stream; extra is inserted after channel_format (source_id, desc, ...)."""
+    return (f'<?xml version="1.0"?><info><name>{name}</name><type>{stream_type}</type>'
+            f'<channel_count>{channel_count}</channel_count><nominal_srate>{nominal_srate}</nominal_srate>'
+            f'<channel_format>{channel_format}</channel_format>{extra}</info>')
+
+
+EEG_HEADER = stream_header("EEG", "EEG", 2, 100, "float32")
+MARKER_HEADER = stream_header("labels", "Markers", 1, 0, "string")
+
+
+def write_xdf(path, eeg_stamps, eeg_samples, marker_stamps, markers, eeg_header=EEG_HEADER, marker_header=MARKER_HEADER):
+    """
+    Write an XDF file holding one EEG and one marker stream.
+
+    :param eeg_samples: One list of channel values per time stamp.
+    :param markers: One label per marker time stamp.
+    """
+    writer = XDFWriter(path)
+    writer.write_stream_header(1, eeg_header)
+    writer.write_stream_header(2, marker_header)
+    writer.write_samples(1, list(eeg_stamps), eeg_samples, 'float32')
+    writer.write_samples(2, list(marker_stamps), [[marker] for marker in markers], 'string')
+    writer.close()
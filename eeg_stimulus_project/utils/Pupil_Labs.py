@@ -9,6 +9,14 @@ from pupil_labs.realtime_api.simple import discover_one_device
 from pupil_labs.realtime_api.simple import Device
 import threading
 import logging
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.config import config
 
 class PupilLabs():
     def __init__(self):
@@ -16,9 +24,9 @@ class PupilLabs():
         logging.info("Attempting to connect to Pupil Labs device...")
         #self.device = discover_one_device(max_search_duration_seconds=5)
 
-        #ip = "172.20.10.2"
-        ip = "10.117.59.253"
-        self.device = Device(address=ip, port="8080")
+        ip = config.get('hardware.eye_tracker.host', "10.117.59.253")
+        port = config.get('hardware.eye_tracker.port', 8080)
+        self.device = Device(address=ip, port=str(port))
         
         print(f"Phone IP address: {self.device.phone_ip}")
         #print(f"Phone name: {self.device.phone_name}")
@@ -0,0 +1,290 @@
+"""
+Non-interactive batch conversion of a saved_data tree.
+
+Walks saved_data/subject_*/test_*, converts every XDF (one output per stream) and CSV file to the
+chosen analysis format in a process pool, and skips files that have not changed since the last run:
+files whose size and modification time match the manifest are skipped outright, the others are
+hashed in the worker, which only converts them if the content hash differs. Each worker can be given an address-space limit so a single huge recording cannot
+exhaust the machine's memory (POSIX only; Windows has no address-space limit). Parquet output needs
+pyarrow or fastparquet, which are not part of requirements.txt.
+
+Usage:
+    python -m eeg_stimulus_project.utils.batch_convert [--data-dir DIR] [--output-dir DIR]
+        [--format npz|csv|parquet] [--workers N] [--max-memory-mb MB] [--force]
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.config import config
+from eeg_stimulus_project.utils.xdf_file_handler import XDFIndexedReader
+
+MANIFEST_NAME = "convert_manifest.json"
+FORMATS = ("npz", "csv", "parquet")
+
+
+def file_sha256(path, block_size=1024 * 1024):
+    """Return the hex sha256 of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def find_source_files(data_dir):
+    """Return every .xdf and .csv file below data_dir/subject_*/test_*, sorted."""
+    files = []
+    for subject_dir in sorted(Path(data_dir).glob("subject_*")):
+        for test_dir in sorted(subject_dir.glob("test_*")):
+            for path in sorted(test_dir.rglob("*")):
+                if path.is_file() and path.suffix.lower() in (".xdf", ".csv"):
+                    files.append(path)
+    return files
+
+
+def _safe_name(name):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_") or "stream"
+
+
+def _write_table(columns, output_path, fmt):
+    """Write a dict of equal-length columns in the chosen format."""
+    if fmt == "npz":
+        np.savez(output_path, **{_safe_name(k): np.asarray(v) for k, v in columns.items()})
+    elif fmt == "csv":
+        pd.DataFrame(columns).to_csv(output_path, index=False)
+    else:
+        pd.DataFrame(columns).to_parquet(output_path, index=False)
+
+
+def parquet_engine():
+    """Name of the installed pandas parquet engine (pyarrow or fastparquet), or None."""
+    for name in ("pyarrow", "fastparquet"):
+        try:
+            importlib.import_module(name)
+            return name
+        except ImportError:
+            continue
+    return None
+
+
+def memory_limit_supported():
+    """Whether worker address-space limits can be applied on this platform (not on Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return False
+    return hasattr(resource, 'RLIMIT_AS')
+
+
+def _limit_worker_memory(max_memory_mb):
+    # Bound the address space of each worker process (POSIX only)
+    if not max_memory_mb:
+        return
+    try:
+        import resource
+        limit = int(max_memory_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError) as e:
+        print(f"Worker memory limit not applied: {e}")
+
+
+def convert_file(source, output_base, fmt):
+    """
+    Convert one source file; runs in a worker process.
+
+    :param source: Path of the .xdf or .csv file.
+    :param output_base: Output path without extension (stream names are appended for XDF files).
+    :param fmt: One of FORMATS.
+    :return: List of the written output paths.
+    """
+    source = Path(source)
+    Path(output_base).parent.mkdir(parents=True, exist_ok=True)
+    outputs = []
+    if source.suffix.lower() == ".xdf":
+        # Load one stream at a time so only a single stream is ever in memory
+        reader = XDFIndexedReader(str(source))
+        for info in reader.streams:
+            stream = reader.load_stream(info['stream_id'])
+            data = stream['time_series']
+            if isinstance(data, list):
+                data = np.asarray(data, dtype=object)
+            columns = {'Timestamp': stream['time_stamps']}
+            for ch in range(info['channel_count']):
+                columns[f"Channel_{ch + 1}"] = data[:, ch] if len(data) else np.empty(0)
+            output_path = f"{output_base}__{_safe_name(info['name'])}.{fmt}"
+            _write_table(columns, output_path, fmt)
+            outputs.append(output_path)
+    else:
+        if fmt == "csv":
+            return outputs  # Already in the target format
+        frame = pd.read_csv(source)
+        output_path = f"{output_base}.{fmt}"
+        _write_table({column: frame[column].to_numpy() for column in frame.columns}, output_path, fmt)
+        outputs.append(output_path)
+    return outputs
+
+
+def convert_job(source, output_base, fmt, known_sha256=None):
+    """
+    Hash a source file and convert it unless its content matches known_sha256; runs in a worker process.
+
+    :return: (sha256, list of the written output paths, or None when the content is unchanged).
+    """
+    digest = file_sha256(source)
+    if digest == known_sha256:
+        return digest, None
+    return digest, convert_file(source, output_base, fmt)
+
+
+def load_manifest(output_dir):
+    path = Path(output_dir) / MANIFEST_NAME
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(output_dir, manifest):
+    path = Path(output_dir) / MANIFEST_NAME
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def batch_convert(data_dir, output_dir, fmt="npz", workers=None, max_memory_mb=None, force=False):
+    """
+    Convert every recording below data_dir that changed since the last run.
+
+    :param data_dir: The saved_data directory.
+    :param output_dir: Directory receiving the converted files (mirrors the saved_data layout).
+    :param fmt: Output format, one of FORMATS.
+    :param workers: Worker processes (defaults to the number of CPUs).
+    :param max_memory_mb: Address-space limit per worker in MB (None for no limit; ignored on Windows).
+    :param force: Convert even when the file matches the manifest.
+    :return: Summary dict with counts, bytes and throughput.
+    :raises RuntimeError: For parquet output when no parquet engine is installed.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}, expected one of {', '.join(FORMATS)}")
+    if fmt == "parquet" and parquet_engine() is None:
+        raise RuntimeError("Parquet output needs pyarrow or fastparquet (pip install pyarrow)")
+    if max_memory_mb and not memory_limit_supported():
+        print("Worker memory limits are not supported on this platform; converting without them")
+        max_memory_mb = None
+    data_dir = Path(data_dir)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(output_dir)
+    started = time.monotonic()
+
+    jobs = {}
+    skipped = 0
+    for source in find_source_files(data_dir):
+        if fmt == "csv" and source.suffix.lower() == ".csv":
+            skipped += 1  # Already in the target format
+            continue
+        relative = source.relative_to(data_dir).as_posix()
+        stat = source.stat()
+        entry = manifest.get(relative)
+        known_sha256 = None
+        if (not force and entry and entry.get('format') == fmt
+                and all(os.path.exists(output_dir / out) for out in entry.get('outputs', []))):
+            if entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+                skipped += 1
+                continue
+            # Touched but maybe not changed: the worker compares the content hash
+            known_sha256 = entry.get('sha256')
+        jobs[relative] = (source, stat, known_sha256)
+
+    converted = failed = 0
+    total_bytes = 0
+    kwargs = {'max_workers': workers or os.cpu_count(), 'initializer': _limit_worker_memory, 'initargs': (max_memory_mb,)}
+    if sys.version_info >= (3, 11):
+        kwargs['max_tasks_per_child'] = 20  # Recycle workers so memory fragmentation cannot build up
+    if jobs:
+        with ProcessPoolExecutor(**kwargs) as pool:
+            futures = {
+                pool.submit(convert_job, str(source), str(output_dir / Path(relative).with_suffix("")), fmt,
+                            known_sha256): relative
+                for relative, (source, stat, known_sha256) in jobs.items()
+            }
+            for future in as_completed(futures):
+                relative = futures[future]
+                source, stat, known_sha256 = jobs[relative]
+                try:
+                    digest, outputs = future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"Failed to convert {relative}: {e}")
+                    continue
+                if outputs is None:
+                    # Same content under a new modification time; remember it so the next run skips the hash
+                    skipped += 1
+                    manifest[relative].update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                    continue
+                converted += 1
+                total_bytes += stat.st_size
+                manifest[relative] = {
+                    'sha256': digest,
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'format': fmt,
+                    'outputs': [Path(out).relative_to(output_dir).as_posix() for out in outputs],
+                }
+        save_manifest(output_dir, manifest)
+
+    elapsed = time.monotonic() - started
+    summary = {
+        'converted': converted,
+        'skipped': skipped,
+        'failed': failed,
+        'bytes': total_bytes,
+        'seconds': elapsed,
+        'mb_per_second': total_bytes / (1024 * 1024) / elapsed if elapsed > 0 else 0.0,
+        'files_per_second': converted / elapsed if elapsed > 0 else 0.0,
+    }
+    print(f"Converted {converted} files ({total_bytes / (1024 * 1024):.1f} MB), skipped {skipped} unchanged, "
+          f"{failed} failed in {elapsed:.1f} s ({summary['mb_per_second']:.1f} MB/s)")
+    return summary
+
+
+def main(argv=None):
+    data_dir = config.get_absolute_path('paths.data_directory')
+    parser = argparse.ArgumentParser(description="Convert every XDF and CSV recording of a saved_data tree.")
+    parser.add_argument("--data-dir", default=str(data_dir), help="saved_data directory to walk")
+    parser.add_argument("--output-dir", default=None, help="output directory (default: <data-dir>/converted)")
+    parser.add_argument("--format", choices=FORMATS, default="npz", help="analysis format to write")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--max-memory-mb", type=int, default=None,
+                        help="address-space limit per worker (POSIX only, ignored on Windows)")
+    parser.add_argument("--force", action="store_true", help="convert files even if unchanged")
+    args = parser.parse_args(argv)
+    output_dir = args.output_dir or os.path.join(args.data_dir, "converted")
+    try:
+        summary = batch_convert(args.data_dir, output_dir, args.format, args.workers, args.max_memory_mb, args.force)
+    except RuntimeError as e:
+        print(e)
+        return 2
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+Structured per-session event journal.
+
+Each process appends typed events (labels, state changes, device events) to its own gzip-compressed
+JSON-lines file in the session's journal directory. Every event carries the LSL clock (local_clock,
+so it lines up with recorded marker timestamps), the wall clock, the process id and an event code.
+Events are buffered and written by a background thread as one gzip member per flush, so a killed
+process loses at most the last flush interval and the file stays readable.
+"""
+
+import atexit
+import collections
+import datetime
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from pylsl import local_clock
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.config import config
+
+# Event codes by kind; codes are stable, new kinds get new numbers
+EVENT_CODES = {
+    'label': 1,        # label pushed to the LSL marker stream
+    'label_sent': 2,   # label sent by the client to the host
+    'state': 3,        # test / session state change
+    'device': 4,       # device connected, disconnected or failed
+    'stall': 5,        # GUI thread blocked (utils/gui_watchdog.py)
+}
+EVENT_KINDS = {code: kind for kind, code in EVENT_CODES.items()}
+
+
+class EventJournal:
+    """
+    Append-only event journal of one process.
+
+    :param path: Journal file (.jsonl.gz); appended to if it exists.
+    :param flush_interval: Seconds between background flushes.
+    :param max_pending: Buffered events that trigger an early flush.
+    """
+
+    def __init__(self, path, flush_interval=None, max_pending=None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval or config.get('journal.flush_interval', 1.0)
+        self.max_pending = max_pending or config.get('journal.max_pending', 1000)
+        self.pid = os.getpid()
+        self.events_written = 0
+        self._pending = collections.deque()
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True, name="EventJournal")
+        self._thread.start()
+
+    def record(self, kind, name, timestamp=None, **data):
+        """
+        Buffer one event.
+
+        :param kind: One of EVENT_CODES.
+        :param name: Label text, state or device name.
+        :param timestamp: LSL clock time of the event (defaults to now).
+        """
+        event = {'t': local_clock() if timestamp is None else timestamp, 'wall': time.time(), 'pid': self.pid,
+                 'code': EVENT_CODES[kind], 'kind': kind, 'name': str(name)}
+        if data:
+            event['data'] = data
+        with self._condition:
+            if self._closed:
+                return
+            self._pending.append(event)
+            if len(self._pending) >= self.max_pending:
+                self._condition.notify()
+
+    def flush(self):
+        """Write the buffered events as one gzip member."""
+        with self._write_lock:
+            with self._condition:
+                events = list(self._pending)
+                self._pending.clear()
+            if not events:
+                return
+            lines = "".join(json.dumps(event, default=str) + "\n" for event in events).encode('utf-8')
+            with open(self.path, 'ab') as f:
+                f.write(gzip.compress(lines, compresslevel=6))
+            self.events_written += len(events)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._closed or len(self._pending) >= self.max_pending,
+                                         self.flush_interval)
+                closed = self._closed
+            try:
+                self.flush()
+            except OSError as e:
+                # Never log from here: logging may itself be journaled one day
+                print(f"EventJournal: write failed: {e}", file=sys.stderr)
+            if closed:
+                return
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+
+_journal = None
+
+
+def journal_path(base_dir, role):
+    """Journal file of this process: <base_dir>/journal/events_<role>_<start time>_<pid>.jsonl.gz."""
+    if base_dir is None:
+        # The client has no session directory of its own
+        base_dir = config.get_absolute_path('paths.data_directory') / 'client_journal'
+    stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+    return Path(base_dir) / config.get('journal.directory', 'journal') / f"events_{role}_{stamp}_{os.getpid()}.jsonl.gz"
+
+
+def open_session_journal(base_dir, role):
+    """Start journaling this process's events for the session in base_dir (no-op if journal.enabled is false)."""
+    global _journal
+    if not config.get('journal.enabled', True):
+        return None
+    close_session_journal()
+    _journal = EventJournal(journal_path(base_dir, role))
+    atexit.register(close_session_journal)
+    return _journal
+
+
+def close_session_journal():
+    global _journal
+    journal, _journal = _journal, None
+    if journal is not None:
+        journal.close()
+
+
+def record_event(kind, name, timestamp=None, **data):
+    """Record an event in this process's session journal, if one is open."""
+    journal = _journal
+    if journal is not None:
+        journal.record(kind, name, timestamp, **data)
+
+
+def journal_files(path):
+    path = Path(path)
+    return [path] if path.is_file() else sorted(path.rglob("events_*.jsonl.gz"))
+
+
+def read_events(path):
+    """All events of a journal file or directory (every process), ordered by LSL clock time."""
+    events = []
+    for file in journal_files(path):
+        with gzip.open(file, 'rt', encoding='utf-8') as f:
+            try:
+                for line in f:
+                    if line.strip():
+                        events.append(json.loads(line))
+            except (EOFError, gzip.BadGzipFile, ValueError):
+                # A member cut short by a killed process; everything before it is intact
+                pass
+    events.sort(key=lambda event: event['t'])
+    return events
+
+
+def load_columns(path, kinds=None):
+    """
+    Journal events as columns, for timing audits.
+
+    :param kinds: Restrict to these event kinds.
+    :return: Dict with numpy arrays 't', 'wall', 'pid' and 'code', and lists 'kind', 'name' and 'data'.
+    """
+    events = read_events(path)
+    if kinds is not None:
+        codes = {EVENT_CODES[kind] for kind in kinds}
+        events = [event for event in events if event['code'] in codes]
+    return {
+        't': np.array([event['t'] for event in events], dtype=np.float64),
+        'wall': np.array([event['wall'] for event in events], dtype=np.float64),
+        'pid': np.array([event['pid'] for event in events], dtype=np.int64),
+        'code': np.array([event['code'] for event in events], dtype=np.int16),
+        'kind': [event['kind'] for event in events],
+        'name': [event['name'] for event in events],
+        'data': [event.get('data', {}) for event in events],
+    }
@@ -0,0 +1,212 @@
+"""
+GUI-thread stall watchdog and hot-path timing.
+
+GuiWatchdog runs a precise QTimer heartbeat on the GUI thread and measures how late each beat
+fires (the event-loop latency). A helper thread watches the heartbeat: when it has been silent for
+longer than the stall threshold, the helper captures the GUI thread's stack, so the code that
+blocked the event loop is known. Every stall is logged with its stack, counted in a stall
+histogram and recorded in the session event journal; the histograms are logged when the
+application quits.
+
+timed(name) measures a hot path (as a decorator or a with block) into a per-name histogram.
+"""
+
+import bisect
+import functools
+import logging
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+
+from PyQt5.QtCore import QObject, Qt, QTimer
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.config import config
+from eeg_stimulus_project.utils.event_journal import record_event
+
+DEFAULT_BUCKETS_MS = (1, 5, 16, 33, 50, 100, 250, 500, 1000, 2000, 5000)
+
+
+class Histogram:
+    """
+    Counts of durations (ms) per bucket; bucket i counts values <= edges[i], the last one the rest.
+
+    :param edges: Increasing upper bucket edges in milliseconds.
+    """
+
+    def __init__(self, edges=DEFAULT_BUCKETS_MS):
+        self.edges = tuple(edges)
+        self.counts = [0] * (len(self.edges) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, value_ms):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.edges, value_ms)] += 1
+            self.count += 1
+            self.total += value_ms
+            self.max = max(self.max, value_ms)
+
+    def as_dict(self):
+        labels = [f"<={edge}" for edge in self.edges] + [f">{self.edges[-1]}"]
+        return {label: count for label, count in zip(labels, self.counts) if count}
+
+    def summary(self):
+        if not self.count:
+            return "no samples"
+        buckets = ", ".join(f"{label} ms: {count}" for label, count in self.as_dict().items())
+        return f"n={self.count}, mean={self.total / self.count:.1f} ms, max={self.max:.1f} ms [{buckets}]"
+
+
+# Hot path name -> Histogram, filled by timed()
+hot_paths = {}
+_hot_paths_lock = threading.Lock()
+
+
+def _hot_path(name):
+    histogram = hot_paths.get(name)
+    if histogram is None:
+        with _hot_paths_lock:
+            histogram = hot_paths.setdefault(name, Histogram(config.get('gui_watchdog.buckets_ms', DEFAULT_BUCKETS_MS)))
+    return histogram
+
+
+class timed:
+    """
+    Time a hot path into hot_paths[name]; usable as @timed('name') or `with timed('name'):`.
+    Runs longer than gui_watchdog.hot_path_budget_ms are logged at debug level.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed_ms = (time.perf_counter() - self._started) * 1000.0
+        _hot_path(self.name).add(elapsed_ms)
+        if elapsed_ms > config.get('gui_watchdog.hot_path_budget_ms', 16):
+            logging.debug(f"{self.name} took {elapsed_ms:.1f} ms")
+        return False
+
+    def __call__(self, func):
+        # A fresh timing context per call, so nested and concurrent calls do not share _started
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(self.name):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+class GuiWatchdog(QObject):
+    """
+    Event-loop latency monitor of the GUI thread; create and start it on the GUI thread.
+
+    :param interval_ms: Heartbeat interval.
+    :param stall_threshold_ms: Heartbeat silence (beyond the interval) counted as a stall.
+    :param poll_interval_ms: How often the helper thread checks the heartbeat.
+    """
+
+    def __init__(self, interval_ms=None, stall_threshold_ms=None, poll_interval_ms=None, parent=None):
+        super().__init__(parent)
+        self.interval = (interval_ms or config.get('gui_watchdog.interval_ms', 20)) / 1000.0
+        self.stall_threshold = (stall_threshold_ms or config.get('gui_watchdog.stall_threshold_ms', 100)) / 1000.0
+        self.poll_interval = (poll_interval_ms or config.get('gui_watchdog.poll_interval_ms', 25)) / 1000.0
+        buckets = config.get('gui_watchdog.buckets_ms', DEFAULT_BUCKETS_MS)
+        self.latency = Histogram(buckets)
+        self.stalls = Histogram(buckets)
+        self.stall_reports = []  # (duration ms, where, stack), most recent last
+        self._gui_thread = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._captured = None  # (where, stack) of the stall in progress
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self._beat)
+
+    def start(self):
+        self._last_beat = time.perf_counter()
+        self.timer.start(int(self.interval * 1000))
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._watch, daemon=True, name="GuiWatchdog")
+        self._thread.start()
+
+    def stop(self, log_summary=True):
+        self.timer.stop()
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if log_summary:
+            self.log_summary()
+
+    def _beat(self):
+        now = time.perf_counter()
+        with self._lock:
+            lag = max(0.0, now - self._last_beat - self.interval)
+            self._last_beat = now
+            captured, self._captured = self._captured, None
+        self.latency.add(lag * 1000.0)
+        if lag >= self.stall_threshold:
+            self._report_stall(lag * 1000.0, *(captured or (None, None)))
+
+    def _watch(self):
+        while not self._stopped.wait(self.poll_interval):
+            with self._lock:
+                silent = time.perf_counter() - self._last_beat - self.interval
+                if silent < self.stall_threshold or self._captured is not None:
+                    continue
+            frame = sys._current_frames().get(self._gui_thread)
+            if frame is None:
+                continue
+            frames = traceback.extract_stack(frame)
+            del frame
+            where = f"{frames[-1].filename}:{frames[-1].lineno} in {frames[-1].name}"
+            with self._lock:
+                # The heartbeat may have resumed meanwhile; then this stack belongs to no stall
+                if time.perf_counter() - self._last_beat - self.interval >= self.stall_threshold:
+                    self._captured = (where, "".join(traceback.format_list(frames)))
+
+    def _report_stall(self, duration_ms, where, stack):
+        self.stalls.add(duration_ms)
+        self.stall_reports = (self.stall_reports + [(duration_ms, where, stack)])[-config.get('gui_watchdog.keep_reports', 50):]
+        record_event('stall', 'gui_thread', duration_ms=round(duration_ms, 1), where=where)
+        if stack:
+            logging.warning(f"GUI thread stalled for {duration_ms:.0f} ms in:\n{stack.rstrip()}")
+        else:
+            logging.warning(f"GUI thread stalled for {duration_ms:.0f} ms")
+
+    def log_summary(self):
+        logging.info(f"GUI event-loop latency: {self.latency.summary()}")
+        logging.info(f"GUI stalls: {self.stalls.summary()}")
+        for name, histogram in sorted(hot_paths.items()):
+            logging.info(f"Hot path {name}: {histogram.summary()}")
+
+
+_watchdog = None
+
+
+def install_watchdog(app):
+    """Start the GUI watchdog of this process (if gui_watchdog.enabled) and stop it when app quits."""
+    global _watchdog
+    if not config.get('gui_watchdog.enabled', True) or _watchdog is not None:
+        return _watchdog
+    _watchdog = GuiWatchdog(parent=app)
+    _watchdog.start()
+    app.aboutToQuit.connect(_watchdog.stop)
+    return _watchdog
+
+
+def get_watchdog():
+    return _watchdog
@@ -2,6 +2,8 @@ import socket
 import os
 import time
 import sys
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import datetime
 
@@ -12,62 +14,299 @@ sys.path.insert(0, str(project_root))
 from eeg_stimulus_project.config import config
 
 
+def compose_recording_path(base_dir, current_test, subject_id=None):
+    """
+    Create the save directory for a test and compose the XDF file name for a new recording.
+
+    :return: A tuple (save_dir, filename) where save_dir is an absolute Path.
+    """
+    # Create save directory using relative path
+    save_dir = Path(base_dir) / current_test
+    save_dir.mkdir(parents=True, exist_ok=True)
+
+    # --- Compose filename with subject ID, test name, and timestamp ---
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    subject_str = f"subj_{subject_id}_" if subject_id else ""
+    test_str = current_test.replace(" ", "_")
+    return save_dir.resolve(), f"{subject_str}{test_str}_{timestamp}.xdf"
+
+
+class LabRecorderError(Exception):
+    """Raised when LabRecorder does not confirm a command or a recording."""
+
+
+class LabRecorderRCSClient:
+    """
+    Client for the LabRecorder remote control socket (RCS) over a single persistent connection.
+
+    Every command waits for LabRecorder's "OK" reply (sent without a line terminator). Recorders that do not reply are detected
+    on the first command; after that, commands are sent without waiting and the results are verified
+    instead (streams listed, XDF file created).
+    Blocking methods run on the caller's thread; the *_async variants run on one worker thread
+    so commands are never interleaved, and they return concurrent.futures.Future objects.
+
+    :param host: LabRecorder host (defaults to hardware.eeg.labrecorder_host).
+    :param port: RCS port (defaults to network.labrecorder_port).
+    :param ack_timeout: Seconds to wait for the reply to a command.
+    """
+
+    def __init__(self, host=None, port=None, connect_timeout=5.0, ack_timeout=None):
+        settings = config.get('network.labrecorder', {})
+        self.host = host or config.get('hardware.eeg.labrecorder_host', 'localhost')
+        self.port = port or config.get('network.labrecorder_port', 22345)
+        self.connect_timeout = connect_timeout
+        self.ack_timeout = ack_timeout if ack_timeout is not None else settings.get('ack_timeout', 2.0)
+        self.stream_timeout = settings.get('stream_timeout', 10.0)
+        self.start_timeout = settings.get('start_timeout', 10.0)
+        self.stop_timeout = settings.get('stop_timeout', 5.0)
+        self.stop_settle = settings.get('stop_settle', 0.5)
+        self.expected_streams = settings.get('expected_streams', ['labels'])
+        self.acks_supported = None  # Unknown until the first command
+        self.sock = None
+        self.recording_path = None
+        self._buffer = b""
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="LabRecorderRCS")
+
+    def connect(self):
+        """Open the control connection; returns True on success."""
+        try:
+            self.sock = socket.create_connection((self.host, self.port), timeout=self.connect_timeout)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            print(f"LabRecorder socket connected on {self.host}:{self.port}.")
+            return True
+        except OSError as e:
+            print(f"Could not connect to LabRecorder: {e}")
+            self.sock = None
+            return False
+
+    def is_connected(self):
+        return self.sock is not None
+
+    def _take_reply(self):
+        # LabRecorder answers "OK" without a line terminator; other replies are read up to a newline
+        if self._buffer.startswith(b"OK"):
+            self._buffer = self._buffer[2:].lstrip(b"\r\n")
+            return "OK"
+        if b"\n" in self._buffer:
+            line, self._buffer = self._buffer.split(b"\n", 1)
+            return line.decode('utf-8', errors='replace').strip()
+        return None
+
+    def _read_line(self, timeout):
+        deadline = time.monotonic() + timeout
+        reply = self._take_reply()
+        while reply is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            self.sock.settimeout(remaining)
+            try:
+                data = self.sock.recv(4096)
+            except socket.timeout:
+                return None
+            if not data:
+                raise LabRecorderError("LabRecorder closed the control connection")
+            self._buffer += data
+            reply = self._take_reply()
+        return reply
+
+    def _drain(self):
+        # Discard late replies so they are not taken as the answer to the next command
+        self.sock.settimeout(0)
+        try:
+            while True:
+                data = self.sock.recv(4096)
+                if not data:
+                    break
+        except (BlockingIOError, socket.timeout, InterruptedError):
+            pass
+        self._buffer = b""
+
+    def send_command(self, command, timeout=None):
+        """
+        Send one RCS command and return LabRecorder's reply (None when the recorder does not reply).
+
+        :raises LabRecorderError: When not connected, the connection drops or the reply is not OK.
+        """
+        if self.sock is None:
+            raise LabRecorderError("No LabRecorder connection")
+        try:
+            self._drain()
+            self.sock.sendall(command.encode('utf-8') + b"\n")
+            if self.acks_supported is False:
+                return None
+            reply = self._read_line(self.ack_timeout if timeout is None else timeout)
+        except OSError as e:
+            self._close_socket()
+            raise LabRecorderError(f"LabRecorder connection lost: {e}")
+        if reply is None:
+            if self.acks_supported is None:
+                logging.info("LabRecorder does not acknowledge commands; verifying results instead.")
+                self.acks_supported = False
+            return None
+        self.acks_supported = True
+        if not reply.upper().startswith("OK"):
+            raise LabRecorderError(f"LabRecorder rejected '{command}': {reply}")
+        return reply
+
+    def wait_for_streams(self, names=None, timeout=None, poll_interval=0.25):
+        """
+        Refresh LabRecorder's stream list until all expected streams are visible on the network.
+
+        :param names: Stream names to wait for (defaults to network.labrecorder.expected_streams).
+        :return: List of stream names that are still missing (empty on success).
+        """
+        names = list(self.expected_streams if names is None else names)
+        timeout = self.stream_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        missing = names
+        while True:
+            self.send_command("update")
+            if not names:
+                return []
+            from pylsl import resolve_streams
+            visible = {info.name() for info in resolve_streams(wait_time=poll_interval)}
+            missing = [name for name in names if name not in visible]
+            if not missing or time.monotonic() >= deadline:
+                break
+        if not missing:
+            # One more update so LabRecorder lists the streams that just appeared
+            self.send_command("update")
+        return missing
+
+    def wait_for_file(self, path, timeout=None, poll_interval=0.05):
+        """Wait until LabRecorder has created the XDF file and written its header; returns the size."""
+        timeout = self.start_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                size = os.path.getsize(path)
+                if size > 0:
+                    return size
+            except OSError:
+                pass
+            time.sleep(poll_interval)
+        raise LabRecorderError(f"LabRecorder did not create {path} within {timeout:.1f} s")
+
+    def wait_for_file_settled(self, path, settle=None, timeout=None, poll_interval=0.05):
+        """
+        Wait until the size and mtime of a file have not changed for settle seconds, i.e. LabRecorder
+        has written the footer and closed it.
+
+        :return: True if the file settled, False if it was still changing (or missing) at the timeout.
+        """
+        settle = self.stop_settle if settle is None else settle
+        deadline = time.monotonic() + (self.stop_timeout if timeout is None else timeout)
+        last, unchanged_since = None, time.monotonic()
+        while True:
+            try:
+                stat = os.stat(path)
+                current = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                current = None
+            now = time.monotonic()
+            if current != last:
+                last, unchanged_since = current, now
+            elif current is not None and now - unchanged_since >= settle:
+                return True
+            if now >= deadline:
+                return False
+            time.sleep(poll_interval)
+
+    def start_recording(self, save_dir, filename, expected_streams=None, timeout=None):
+        """
+        Select the streams, set the file name and start recording, confirming each step.
+
+        :return: Path of the XDF file being recorded.
+        :raises LabRecorderError: When a step is rejected or the recording does not start in time.
+        """
+        missing = self.wait_for_streams(expected_streams, timeout)
+        if missing:
+            logging.info(f"LabRecorder streams not found: {', '.join(missing)}; recording the available streams.")
+        self.send_command("select all")
+        self.send_command(f'filename {{root:{save_dir}}} {{template:{filename}}}')
+        self.send_command("start")
+        path = os.path.join(str(save_dir), filename)
+        self.wait_for_file(path, timeout)
+        self.recording_path = path
+        return path
+
+    def stop_recording(self):
+        """Stop recording and wait until the XDF file is finished; returns its path."""
+        self.send_command("stop")
+        path, self.recording_path = self.recording_path, None
+        # The reply to "stop" can come before the footer is written, so watch the file itself
+        if path and not self.wait_for_file_settled(path):
+            logging.info(f"LabRecorder file {path} was still changing {self.stop_timeout:.1f} s after stop.")
+        return path
+
+    def start_recording_async(self, save_dir, filename, expected_streams=None, timeout=None):
+        return self._executor.submit(self.start_recording, save_dir, filename, expected_streams, timeout)
+
+    def stop_recording_async(self):
+        return self._executor.submit(self.stop_recording)
+
+    def _close_socket(self):
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+    def close(self):
+        """Close the connection and stop the worker thread (commands already queued still run)."""
+        self._close_socket()
+        self._executor.shutdown(wait=False)
+
+
 class LabRecorder:
     def __init__(self, base_dir, subject_id=None):
         self.base_dir = base_dir
         self.subject_id = subject_id
-        
-        # Get LabRecorder configuration
-        labrecorder_host = config.get('hardware.eeg.labrecorder_host', 'localhost')
-        labrecorder_port = config.get('network.labrecorder_port', 22345)
 
-        # Creates a connection with the LabRecorder Remote control server
-        try:
-            self.s = socket.create_connection((labrecorder_host, labrecorder_port))
-            print("LabRecorder socket connected.")
-        except socket.error as e:
-            print(f"Could not connect to LabRecorder: {e}")
-            self.s = None
+        # Creates a single persistent connection with the LabRecorder Remote control server
+        self.client = LabRecorderRCSClient()
+        self.client.connect()
 
-        self.check_tcp_port(labrecorder_host, labrecorder_port)
+    @property
+    def s(self):
+        # Socket of the control connection (None when not connected)
+        return self.client.sock
 
-    # Sends commands to the LabRecorder server to begin recording and assigns a filepath
+    # Sends commands to the LabRecorder server to begin recording and assigns a filepath.
+    # Returns a Future resolving to the XDF path once the recording is confirmed.
     def Start_Recorder(self, current_test):
         if not self.s:
             print("No LabRecorder connection.")
-            return
+            return None
 
-        # Create save directory using relative path
-        save_dir = Path(self.base_dir) / current_test
-        save_dir.mkdir(parents=True, exist_ok=True)
+        save_dir, filename = compose_recording_path(self.base_dir, current_test, self.subject_id)
+        started = time.monotonic()
+        future = self.client.start_recording_async(save_dir, filename)
 
-        # --- Compose filename with subject ID, test name, and timestamp ---
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        subject_str = f"subj_{self.subject_id}_" if self.subject_id else ""
-        test_str = current_test.replace(" ", "_")
-        filename = f"{subject_str}{test_str}_{timestamp}.xdf"
-
-        # Use the save directory path for recording
-        xdf_path = str(save_dir.resolve() / filename)
+        def report(done):
+            try:
+                xdf_path = done.result()
+                logging.info(f"LabRecorder started recording: {xdf_path} ({time.monotonic() - started:.2f} s)")
+            except Exception as e:
+                logging.error(f"LabRecorder failed to start recording: {e}")
 
-        self.s.sendall(b"update\n")
-        time.sleep(3)
-        self.s.sendall(b"select all\n")
-        self.s.sendall(f'filename {{root:{save_dir.resolve()}}} {{template:{filename}}}\n'.encode('utf-8'))
-        self.s.sendall(b"start\n")
-        print(f"LabRecorder started recording: {xdf_path}")
+        future.add_done_callback(report)
+        return future
 
     # Sends commands to the LabRecorder server to stop recording
     def Stop_Recorder(self):
-        if self.s:
-            self.s.sendall(b"stop\n")
-            print("LabRecorder stopped recording.")
+        if not self.s:
+            return None
+        future = self.client.stop_recording_async()
 
-    def check_tcp_port(self, host, port):
+        def report(done):
             try:
-                with socket.create_connection((host, port), timeout=5):
-                    print(f"Port {port} on {host} is open and connected.")
-            except (socket.timeout, ConnectionRefusedError):
-                print(f"Port {port} on {host} is not connected.")
+                done.result()
+                print("LabRecorder stopped recording.")
             except Exception as e:
-                print(f"An error occurred: {e}")
\ No newline at end of file
+                logging.error(f"LabRecorder failed to stop recording: {e}")
+
+        future.add_done_callback(report)
+        return future
@@ -5,10 +5,7 @@ Provides centralized logging configuration for multiprocessing environments.
 
 import logging
 import sys
-import json
-import socket
-import threading
-from logging.handlers import QueueHandler
+from logging.handlers import QueueHandler, RotatingFileHandler
 from pathlib import Path
 
 # Add the project root to Python path
@@ -16,12 +13,16 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from eeg_stimulus_project.config import config
+from eeg_stimulus_project.utils.message_channel import channel_for, close_channel
 
 
 class NetworkLogHandler(logging.Handler):
     """
     A logging handler that sends log messages over a network connection.
     Used for client-server logging in distributed setups.
+
+    Records are queued on the connection's MessageChannel and shipped to the host in batches
+    by a background thread, behind any label or control message, so emit never blocks on the socket.
     """
     
     def __init__(self, connection):
@@ -33,50 +34,39 @@ class NetworkLogHandler(logging.Handler):
         """
         super().__init__()
         self.connection = connection
-        self.lock = threading.RLock()  # Use RLock instead of Lock
+        self.channel = channel_for(connection)
     
     def emit(self, record):
         """
-        Send a log record over the network connection.
+        Queue a log record for the host.
         
         Args:
             record: LogRecord to send
         """
         try:
-            # Format the log message
-            formatted_msg = self.format(record)
-            
+            if self.connection is None:
+                return
             # Create a log message packet
             log_packet = {
+                'type': 'log_message',
                 'timestamp': record.created,
                 'level': record.levelname,
-                'message': formatted_msg,
+                'levelno': record.levelno,
+                'message': self.format(record),
                 'filename': record.filename,
                 'line_number': record.lineno
             }
-            
-            # Convert to JSON and send
-            json_msg = json.dumps(log_packet) + '\n'
-            
-            # Use a timeout to avoid hanging
-            with self.lock:
-                if self.connection:
-                    try:
-                        self.connection.send(json_msg.encode('utf-8'))
-                    except (ConnectionResetError, BrokenPipeError, OSError) as e:
-                        # Connection lost, disable this handler
-                        self.connection = None
-                        
+            self.channel.log(log_packet)
         except Exception as e:
             # Don't let logging errors crash the application
-            # Could consider writing to stderr or a backup log file
             print(f"NetworkLogHandler error: {e}", file=sys.stderr)
     
     def close(self):
-        """Close the network connection."""
+        """Flush queued records and detach from the network connection."""
         if self.connection:
-            with self.lock:
-                self.connection = None
+            # Also drops the channel from the shared registry, so a later handler gets a fresh one
+            close_channel(self.connection, config.get('logging.network.close_timeout', 1.0))
+            self.connection = None
         super().close()
 
 
@@ -104,8 +94,9 @@ def setup_logging(log_queue=None):
     # Create handlers
     handlers = []
     
-    # File handler (always add for main process)
-    file_handler = logging.FileHandler(log_file)
+    # File handler (always add for main process), rotated by size
+    file_handler = RotatingFileHandler(log_file, maxBytes=config.get('logging.max_bytes', 10 * 1024 * 1024),
+                                       backupCount=config.get('logging.backup_count', 5))
     file_handler.setFormatter(logging.Formatter(log_format))
     handlers.append(file_handler)
     
@@ -0,0 +1,181 @@
+"""
+Client-side writer for the JSON-lines socket shared with the host.
+
+Control and label messages are written immediately on the calling thread. Log traffic (log records
+and client_log messages) goes to a bounded queue that a background thread ships as log_batch
+messages; it only writes while no control message is waiting, so logging never delays a marker.
+"""
+
+import collections
+import json
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from eeg_stimulus_project.config import config
+
+# Actions that are shipped on the log lane instead of being sent immediately
+LOG_ACTIONS = {"client_log"}
+
+
+def is_log_message(message):
+    return message.get("type") == "log_message" or message.get("action") in LOG_ACTIONS
+
+
+class MessageChannel:
+    """
+    Priority and log lanes over one socket connection.
+
+    :param connection: Connected socket (anything with sendall).
+    :param queue_size: Maximum number of queued log messages; the oldest below WARNING are dropped when full.
+    :param batch_size: Maximum number of log messages per log_batch.
+    :param flush_interval: Seconds to wait for more log messages before sending a partial batch.
+    :param sample_every: Once the queue is half full, only every n-th message below WARNING is kept.
+    """
+
+    def __init__(self, connection, queue_size=None, batch_size=None, flush_interval=None, sample_every=None):
+        settings = config.get('logging.network', {}) or {}
+        self.connection = connection
+        self.queue_size = queue_size or settings.get('queue_size', 1000)
+        self.batch_size = batch_size or settings.get('batch_size', 50)
+        self.flush_interval = settings.get('flush_interval', 0.2) if flush_interval is None else flush_interval
+        self.sample_every = sample_every or settings.get('sample_every', 5)
+        self.dropped = 0
+        self.batches_sent = 0
+        self._reported_dropped = 0
+        self._sample_count = 0
+        self._pending = collections.deque()
+        self._priority_waiting = 0
+        self._write_lock = threading.Lock()
+        self._condition = threading.Condition()
+        self._closing = False
+        self._broken = False
+        self._thread = None
+
+    def send(self, message):
+        """Send a message dict; log messages are queued, everything else is written right away."""
+        if is_log_message(message):
+            self.log(message)
+        else:
+            self.send_now(message)
+
+    def send_now(self, message):
+        """Write a message on the calling thread, ahead of any queued log batch. Raises on socket errors."""
+        data = (json.dumps(message) + "\n").encode('utf-8')
+        with self._condition:
+            self._priority_waiting += 1
+        try:
+            with self._write_lock:
+                self.connection.sendall(data)
+        finally:
+            with self._condition:
+                self._priority_waiting -= 1
+                self._condition.notify_all()
+
+    def log(self, message):
+        """Queue a log message without blocking; it is dropped or sampled out when the queue is under pressure."""
+        if self._broken or self._closing:
+            return
+        level = message.get("levelno", logging.INFO)
+        with self._condition:
+            if level < logging.WARNING and len(self._pending) >= self.queue_size // 2:
+                self._sample_count += 1
+                if self._sample_count % self.sample_every:
+                    self.dropped += 1
+                    return
+            if len(self._pending) >= self.queue_size:
+                if not self._drop_oldest_below_warning() and level < logging.WARNING:
+                    self.dropped += 1
+                    return
+                if len(self._pending) >= self.queue_size:
+                    self._pending.popleft()
+                    self.dropped += 1
+            self._pending.append(message)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="MessageChannelLogs")
+                self._thread.start()
+            self._condition.notify_all()
+
+    def _drop_oldest_below_warning(self):
+        for index, queued in enumerate(self._pending):
+            if queued.get("levelno", logging.INFO) < logging.WARNING:
+                del self._pending[index]
+                self.dropped += 1
+                return True
+        return False
+
+    def _next_batch(self):
+        with self._condition:
+            self._condition.wait_for(lambda: self._pending or self._closing)
+            if not self._pending:
+                return None
+            if len(self._pending) < self.batch_size and not self._closing:
+                # Give the batch a moment to fill up
+                self._condition.wait_for(lambda: len(self._pending) >= self.batch_size or self._closing,
+                                         self.flush_interval)
+            batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+            if self.dropped > self._reported_dropped:
+                batch.append({"type": "log_message", "level": "WARNING", "levelno": logging.WARNING,
+                              "timestamp": time.time(),
+                              "message": f"{self.dropped - self._reported_dropped} client log messages dropped"})
+                self._reported_dropped = self.dropped
+            # Control messages always go first on the wire
+            self._condition.wait_for(lambda: self._priority_waiting == 0)
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            data = (json.dumps({"type": "log_batch", "messages": batch}) + "\n").encode('utf-8')
+            try:
+                with self._write_lock:
+                    self.connection.sendall(data)
+                self.batches_sent += 1
+            except (ConnectionResetError, BrokenPipeError, OSError) as e:
+                # Connection lost: stop shipping logs; never log from here, that would queue more
+                print(f"MessageChannel: log shipping stopped: {e}", file=sys.stderr)
+                self._broken = True
+                with self._condition:
+                    self._pending.clear()
+                return
+
+    def pending(self):
+        with self._condition:
+            return len(self._pending)
+
+    def close(self, timeout=1.0):
+        """Flush the queued log messages (waiting at most timeout seconds) and stop the log thread."""
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+_channels = {}
+_channels_lock = threading.Lock()
+
+
+def channel_for(connection):
+    """Return the MessageChannel shared by every sender on this connection, creating it on first use."""
+    with _channels_lock:
+        entry = _channels.get(id(connection))
+        if entry is None or entry[0] is not connection:
+            entry = (connection, MessageChannel(connection))
+            _channels[id(connection)] = entry
+        return entry[1]
+
+
+def close_channel(connection, timeout=1.0):
+    with _channels_lock:
+        entry = _channels.pop(id(connection), None)
+    if entry is not None and entry[0] is connection:
+        entry[1].close(timeout)
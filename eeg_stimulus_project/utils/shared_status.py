@@ -0,0 +1,137 @@
+"""
+Shared status flags of the session, in shared memory.
+
+Replaces the Manager().dict() that every process used to query through the manager process. The
+flags live in one small shared memory block: a 64-bit sequence counter followed by one byte per
+field. Reads are plain memory loads; writes are serialized by a lock, bump the sequence counter and
+wake processes waiting in wait_for_change(). The object behaves like the dict it replaces
+(status['lsl_enabled'], status.get(...), dict(status)) but only holds the fixed FIELDS.
+"""
+
+import multiprocessing
+import struct
+import sys
+import time
+from multiprocessing import shared_memory
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+# Field order is the memory layout; append new fields at the end
+FIELDS = ('lab_recorder_connected', 'eyetracker_connected', 'lsl_enabled', 'tactile_connected')
+_SEQUENCE = struct.Struct('Q')
+_SEQUENCE_BYTES = _SEQUENCE.size
+
+
+class SharedStatus:
+    """
+    Dict-like view of the shared status block.
+
+    Created once by the launcher and handed to child processes as a Process argument (the change
+    condition can only be inherited, so it cannot be sent over a pipe or queue afterwards).
+
+    :param name: Attach to an existing block instead of creating one.
+    :param condition: Change condition of an existing block.
+    :param context: multiprocessing context of the processes it is shared with (default context if None).
+    """
+
+    def __init__(self, name=None, condition=None, context=None):
+        self.owner = name is None
+        if self.owner:
+            # New blocks are zero-filled: sequence 0, every flag False
+            self._shm = shared_memory.SharedMemory(create=True, size=_SEQUENCE_BYTES + len(FIELDS))
+            self._changed = (context or multiprocessing).Condition()
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            self._changed = condition
+        # Offsets into shm.buf; no derived memoryviews are kept, since an exported view makes
+        # SharedMemory.close() (also run from __del__ at interpreter exit) raise BufferError
+        self._index = {field: _SEQUENCE_BYTES + i for i, field in enumerate(FIELDS)}
+
+    def _read_sequence(self):
+        return _SEQUENCE.unpack_from(self._shm.buf, 0)[0]
+
+    def __reduce__(self):
+        return (SharedStatus, (self._shm.name, self._changed))
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def sequence(self):
+        """Number of changes so far; compare with an earlier value to see whether anything changed."""
+        return self._read_sequence()
+
+    def __getitem__(self, field):
+        return bool(self._shm.buf[self._index[field]])
+
+    def __setitem__(self, field, value):
+        index = self._index[field]
+        value = 1 if value else 0
+        with self._changed:
+            if self._shm.buf[index] == value:
+                return
+            self._shm.buf[index] = value
+            _SEQUENCE.pack_into(self._shm.buf, 0, self._read_sequence() + 1)
+            self._changed.notify_all()
+
+    def get(self, field, default=None):
+        return self[field] if field in self._index else default
+
+    def update(self, values=(), **fields):
+        for field, value in dict(values, **fields).items():
+            self[field] = value
+
+    def __contains__(self, field):
+        return field in self._index
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def keys(self):
+        return list(FIELDS)
+
+    def items(self):
+        return list(self.snapshot().items())
+
+    def snapshot(self):
+        """All fields as a plain dict, read between two equal sequence values so it is consistent."""
+        while True:
+            before = self._read_sequence()
+            values = {field: bool(self._shm.buf[index]) for field, index in self._index.items()}
+            if self._read_sequence() == before:
+                return values
+
+    def wait_for_change(self, sequence, timeout=None):
+        """
+        Block until the sequence counter differs from sequence.
+
+        :return: The current sequence (equal to sequence if the timeout expired).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._changed:
+            while self._read_sequence() == sequence:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+            return self._read_sequence()
+
+    def close(self):
+        """Detach from the block; the creating process also frees it."""
+        if self._shm is None:
+            return
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+        self._shm = None
+
+    def __repr__(self):
+        return f"SharedStatus({self.snapshot()!r})"
+
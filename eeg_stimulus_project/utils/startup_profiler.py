@@ -0,0 +1,194 @@
+"""
+Start-up instrumentation.
+
+When enabled (environment variable EEG_STARTUP_PROFILE=1 or startup_profiler.enabled in the
+configuration), every module imported afterwards is timed through a meta path hook, and named
+milestones (e.g. the first window being shown) are recorded relative to the start of profiling.
+Each process writes its profile as JSON to startup_profiler.output_dir when it reaches its first window.
+"""
+
+import json
+import os
+import sys
+import time
+from importlib.abc import MetaPathFinder
+from pathlib import Path
+
+ENV_VAR = "EEG_STARTUP_PROFILE"
+
+
+class _TimedLoader:
+    """Wraps a module loader so that executing the module is timed."""
+
+    def __init__(self, loader, profiler):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler._enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._leave(module.__name__)
+
+
+class _TimingFinder(MetaPathFinder):
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self._busy = set()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname in self._busy:
+            return None
+        self._busy.add(fullname)
+        try:
+            # Let the regular finders locate the module, then wrap its loader
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                        spec.loader = _TimedLoader(spec.loader, self.profiler)
+                    return spec
+            return None
+        finally:
+            self._busy.discard(fullname)
+
+
+class StartupProfiler:
+    """
+    Per-process import timer and milestone recorder.
+
+    :param role: Name of the process in the report (launcher, host, client, ...).
+    """
+
+    def __init__(self, role="launcher"):
+        self.role = role
+        self.started = time.perf_counter()
+        self.imports = {}      # module -> [cumulative seconds, self seconds]
+        self.milestones = {}   # name -> seconds since start
+        self._stack = []
+        self._finder = None
+        self.report_path = None
+
+    def install(self):
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+        return self
+
+    def uninstall(self):
+        if self._finder is not None and self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+
+    def _enter(self, name):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _leave(self, name):
+        name, started, children = self._stack.pop()
+        elapsed = time.perf_counter() - started
+        self.imports[name] = [elapsed, elapsed - children]
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def mark(self, name):
+        """Record a milestone (seconds since profiling started); the first mark of a name wins."""
+        self.milestones.setdefault(name, time.perf_counter() - self.started)
+
+    def top_imports(self, count=25, key='self'):
+        index = 1 if key == 'self' else 0
+        ranked = sorted(self.imports.items(), key=lambda item: item[1][index], reverse=True)
+        return [{'module': name, 'cumulative_ms': round(times[0] * 1000, 3), 'self_ms': round(times[1] * 1000, 3)}
+                for name, times in ranked[:count]]
+
+    def report(self):
+        top_level = [name for name in self.imports if '.' not in name]
+        return {
+            'role': self.role,
+            'pid': os.getpid(),
+            'milestones_ms': {name: round(value * 1000, 3) for name, value in self.milestones.items()},
+            'import_total_ms': round(sum(self.imports[name][0] for name in top_level) * 1000, 3),
+            'modules_imported': len(self.imports),
+            'top_self': self.top_imports(key='self'),
+            'top_cumulative': self.top_imports(key='cumulative'),
+        }
+
+    def save(self, output_dir=None):
+        from eeg_stimulus_project.config import config
+        output_dir = Path(output_dir) if output_dir else config.get_absolute_path('startup_profiler.output_dir')
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        self.report_path = output_dir / f"startup_{self.role}_{stamp}_{os.getpid()}.json"
+        with open(self.report_path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+        return self.report_path
+
+
+_profiler = None
+
+
+def profiling_enabled():
+    if os.environ.get(ENV_VAR):
+        return os.environ[ENV_VAR] not in ("0", "false", "")
+    try:
+        from eeg_stimulus_project.config import config
+        return bool(config.get('startup_profiler.enabled', False))
+    except Exception:
+        return False
+
+
+def start(role="launcher", force=False, restart=False):
+    """
+    Begin profiling this process if enabled; call before the heavy imports.
+
+    :param restart: Start over under the new role, e.g. in a child process that inherited the launcher's profiler.
+    :return: The profiler, or None if profiling is disabled.
+    """
+    global _profiler
+    if restart and _profiler is not None:
+        _profiler.uninstall()
+        _profiler = None
+    if _profiler is None and (force or profiling_enabled()):
+        _profiler = StartupProfiler(role).install()
+        # Child processes inherit the switch
+        os.environ[ENV_VAR] = "1"
+    return _profiler
+
+
+def get_profiler():
+    return _profiler
+
+
+def mark(name):
+    if _profiler is not None:
+        _profiler.mark(name)
+
+
+def first_window_shown(window_name="first_window"):
+    """
+    Record time-to-first-window once the event loop has run after show(), then write the report.
+    Call right after window.show(), before app.exec_().
+    """
+    if _profiler is None:
+        return
+    from PyQt5.QtCore import QTimer
+
+    def finish():
+        _profiler.mark(window_name)
+        _profiler.uninstall()
+        try:
+            path = _profiler.save()
+            summary = ", ".join(f"{item['module']} {item['cumulative_ms']:.0f} ms" for item in _profiler.top_imports(5, 'cumulative'))
+            print(f"Startup profile ({_profiler.role}): first window after "
+                  f"{_profiler.milestones[window_name] * 1000:.0f} ms; slowest imports: {summary}; saved to {path}")
+        except OSError as e:
+            print(f"Could not save the startup profile: {e}", file=sys.stderr)
+    QTimer.singleShot(0, finish)
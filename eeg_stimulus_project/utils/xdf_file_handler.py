@@ -1,9 +1,23 @@
-import pyxdf
-import pandas as pd
+import numpy as np
 import os
+import json
+import struct
+import xml.etree.ElementTree as ET
 
 #This script is used to load and process XDF files, specifically for EEG data.
 #It provides functions to load an XDF file, print stream information, and save a specific stream to a CSV file.
+#XDFIndexedReader lists the streams of large files from a persisted chunk index and loads single streams
+#(or time ranges of them) without reading the rest of the file.
+
+INDEX_VERSION = 3
+NUMERIC_DTYPES = {
+    'float32': '<f4',
+    'double64': '<f8',
+    'int8': '<i1',
+    'int16': '<i2',
+    'int32': '<i4',
+    'int64': '<i8',
+}
 
 def load_xdf_file(file_path):
     """
@@ -13,6 +27,8 @@ def load_xdf_file(file_path):
     :return: A tuple containing the streams and file header.
     """
     try:
+        # pyxdf and pandas are imported on use; this module is imported at start-up for the chunk index
+        import pyxdf
         streams, file_header = pyxdf.load_xdf(file_path)
         print(f"Successfully loaded {len(streams)} streams from {file_path}.")
         return streams, file_header
@@ -47,6 +63,7 @@ def save_stream_to_csv(stream, file_path):
         data = stream['time_series']
         timestamps = stream['time_stamps']
         columns = [f"Channel_{i + 1}" for i in range(len(data[0]))]
+        import pandas as pd
         df = pd.DataFrame(data, columns=columns)
         df['Timestamp'] = timestamps
         df.to_csv(file_path, index=False)
@@ -54,6 +71,318 @@ def save_stream_to_csv(stream, file_path):
     except Exception as e:
         print(f"Error saving stream to CSV: {e}")
 
+def _read_varlen(f):
+    """Read an XDF variable-length integer from a file object."""
+    nbytes = f.read(1)
+    if not nbytes:
+        raise EOFError()
+    size = nbytes[0]
+    if size == 1:
+        return f.read(1)[0]
+    if size == 4:
+        return struct.unpack('<I', f.read(4))[0]
+    if size == 8:
+        return struct.unpack('<Q', f.read(8))[0]
+    raise ValueError(f"Invalid variable-length integer size {size}")
+
+
+def _varlen_from_buffer(buffer, pos):
+    """Read an XDF variable-length integer from a bytes buffer; returns (value, new_pos)."""
+    size = buffer[pos]
+    if size == 1:
+        return buffer[pos + 1], pos + 2
+    if size == 4:
+        return struct.unpack_from('<I', buffer, pos + 1)[0], pos + 5
+    if size == 8:
+        return struct.unpack_from('<Q', buffer, pos + 1)[0], pos + 9
+    raise ValueError(f"Invalid variable-length integer size {size}")
+
+
+def _stream_header_info(xml_bytes):
+    root = ET.fromstring(xml_bytes.decode('utf-8', errors='replace'))
+    def text(tag, default=''):
+        node = root.find(tag)
+        return node.text if node is not None and node.text is not None else default
+    return {
+        'name': text('name'),
+        'type': text('type'),
+        'channel_count': int(text('channel_count', '1')),
+        'nominal_srate': float(text('nominal_srate', '0')),
+        'channel_format': text('channel_format', 'float32'),
+        'source_id': text('source_id'),
+    }
+
+
+def _stream_footer_info(xml_bytes):
+    root = ET.fromstring(xml_bytes.decode('utf-8', errors='replace'))
+    footer = {}
+    for tag in ('first_timestamp', 'last_timestamp', 'sample_count'):
+        node = root.find(tag)
+        if node is not None and node.text:
+            footer[tag] = float(node.text)
+    return footer
+
+
+def build_xdf_index(file_path):
+    """
+    Scan the chunk headers of an XDF file once and record where every stream's data lives.
+
+    Only stream headers and the first bytes of each Samples chunk are read; sample data is skipped.
+
+    :param file_path: Path to the .xdf file.
+    :return: Index dict with the file signature and, per stream id, its header info and location, footer,
+             clock offsets and a list of [content_offset, content_length, sample_count, first_timestamp] chunks.
+    """
+    stat = os.stat(file_path)
+    streams = {}
+    with open(file_path, 'rb') as f:
+        if f.read(4) != b"XDF:":
+            raise ValueError(f"{file_path} is not an XDF file")
+        while True:
+            try:
+                length = _read_varlen(f)
+            except EOFError:
+                break
+            start = f.tell()
+            header = f.read(2)
+            if len(header) < 2:
+                break
+            tag = struct.unpack('<H', header)[0]
+            if tag in (2, 3, 4, 6):
+                stream_id = struct.unpack('<I', f.read(4))[0]
+                stream = streams.setdefault(str(stream_id), {'info': None, 'chunks': [], 'clock_offsets': [], 'sample_count': 0, 'footer': None})
+                if tag == 2:
+                    stream['header'] = [f.tell(), length - 6]
+                    stream['info'] = _stream_header_info(f.read(length - 6))
+                elif tag == 3:
+                    # Sample count and, when present, the first time stamp of the chunk
+                    content_offset = f.tell()
+                    head = f.read(min(length - 6, 18))
+                    count, pos = _varlen_from_buffer(head, 0)
+                    first_timestamp = struct.unpack_from('<d', head, pos + 1)[0] if len(head) >= pos + 9 and head[pos] == 8 else None
+                    stream['chunks'].append([content_offset, length - 6, count, first_timestamp])
+                    stream['sample_count'] += count
+                elif tag == 4:
+                    stream['clock_offsets'].append(list(struct.unpack('<dd', f.read(16))))
+                elif tag == 6:
+                    stream['footer'] = _stream_footer_info(f.read(length - 6))
+            f.seek(start + length)
+    return {
+        'version': INDEX_VERSION,
+        'file_size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'streams': {sid: stream for sid, stream in streams.items() if stream['info'] is not None},
+    }
+
+
+def index_path_for(file_path):
+    return str(file_path) + ".idx.json"
+
+
+def load_xdf_index(file_path, rebuild=False):
+    """
+    Return the chunk index of an XDF file, reusing the sidecar index file when it is still current.
+
+    :param file_path: Path to the .xdf file.
+    :param rebuild: Ignore an existing sidecar index.
+    """
+    sidecar = index_path_for(file_path)
+    stat = os.stat(file_path)
+    if not rebuild and os.path.exists(sidecar):
+        try:
+            with open(sidecar, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if (index.get('version') == INDEX_VERSION and index.get('file_size') == stat.st_size
+                    and index.get('mtime_ns') == stat.st_mtime_ns):
+                return index
+        except (OSError, ValueError):
+            pass
+    index = build_xdf_index(file_path)
+    try:
+        with open(sidecar, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+    except OSError as e:
+        print(f"Could not write XDF index {sidecar}: {e}")
+    return index
+
+
+def _decode_numeric_chunk(buffer, channel_count, dtype, last_timestamp, tdiff, values_out, stamps_out):
+    """
+    Decode one numeric Samples chunk straight into preallocated arrays.
+
+    :return: Time stamp of the last sample (used to deduce omitted time stamps in the next chunk).
+    """
+    count, pos = _varlen_from_buffer(buffer, 0)
+    value_bytes = channel_count * dtype.itemsize
+    body = memoryview(buffer)[pos:]
+    if len(body) == count * (9 + value_bytes) and all(body[k * (9 + value_bytes)] == 8 for k in range(count)):
+        # Every sample carries a time stamp: view the chunk as a structured array
+        records = np.frombuffer(body, dtype=[('tsb', 'u1'), ('ts', '<f8'), ('values', dtype, (channel_count,))], count=count)
+        stamps_out[:] = records['ts']
+        values_out[:] = records['values']
+    elif len(body) == count * (1 + value_bytes) and all(body[k * (1 + value_bytes)] == 0 for k in range(count)):
+        # No time stamps at all (regular sampling): deduce them from the nominal rate
+        records = np.frombuffer(body, dtype=[('tsb', 'u1'), ('values', dtype, (channel_count,))], count=count)
+        stamps_out[:] = last_timestamp + tdiff * np.arange(1, count + 1)
+        values_out[:] = records['values']
+    else:
+        offset = 0
+        for k in range(count):
+            if body[offset] == 8:
+                last_timestamp = struct.unpack_from('<d', body, offset + 1)[0]
+                offset += 9
+            else:
+                last_timestamp += tdiff
+                offset += 1
+            stamps_out[k] = last_timestamp
+            values_out[k] = np.frombuffer(body, dtype=dtype, count=channel_count, offset=offset)
+            offset += value_bytes
+    return stamps_out[-1] if count else last_timestamp
+
+
+def _decode_string_chunk(buffer, channel_count, last_timestamp, tdiff):
+    count, pos = _varlen_from_buffer(buffer, 0)
+    stamps = np.empty(count)
+    values = []
+    for k in range(count):
+        if buffer[pos] == 8:
+            last_timestamp = struct.unpack_from('<d', buffer, pos + 1)[0]
+            pos += 9
+        else:
+            last_timestamp += tdiff
+            pos += 1
+        stamps[k] = last_timestamp
+        sample = []
+        for _ in range(channel_count):
+            size, pos = _varlen_from_buffer(buffer, pos)
+            sample.append(bytes(buffer[pos:pos + size]).decode('utf-8', errors='replace'))
+            pos += size
+        values.append(sample)
+    return stamps, values, last_timestamp
+
+
+class XDFIndexedReader:
+    """
+    Reads selected streams of an XDF file using a persisted chunk index.
+
+    :param file_path: Path to the .xdf file.
+    :param rebuild_index: Rebuild the sidecar index even if it looks current.
+    """
+
+    def __init__(self, file_path, rebuild_index=False):
+        self.file_path = file_path
+        self.index = load_xdf_index(file_path, rebuild=rebuild_index)
+
+    @property
+    def streams(self):
+        """Header info of every stream (name, type, channel_count, ...) plus its id and sample count."""
+        return [dict(stream['info'], stream_id=int(sid), sample_count=stream['sample_count'])
+                for sid, stream in self.index['streams'].items()]
+
+    def _find(self, stream):
+        for sid, entry in self.index['streams'].items():
+            if str(stream) == sid or entry['info']['name'] == stream:
+                return sid, entry
+        raise KeyError(f"Stream {stream!r} not found in {self.file_path}")
+
+    def header_xml(self, stream):
+        """Return the complete StreamHeader XML of a stream (including its <desc> metadata)."""
+        sid, entry = self._find(stream)
+        offset, length = entry['header']
+        with open(self.file_path, 'rb') as f:
+            f.seek(offset)
+            return f.read(length).decode('utf-8', errors='replace')
+
+    def load_stream(self, stream, t_start=None, t_end=None, synchronize_clocks=True):
+        """
+        Load one stream, optionally restricted to a time range.
+
+        :param stream: Stream name or numeric stream id.
+        :param t_start: Keep samples with time stamps >= t_start (stream clock, before synchronization).
+        :param t_end: Keep samples with time stamps < t_end.
+        :param synchronize_clocks: Add the recorded clock offsets (interpolated) to the time stamps.
+        :return: A dict shaped like a pyxdf stream: 'info', 'time_series' and 'time_stamps'.
+        """
+        sid, entry = self._find(stream)
+        info = entry['info']
+        chunks = entry['chunks']
+        # Skip whole chunks outside the time range using their first time stamps
+        if t_start is not None or t_end is not None:
+            selected = []
+            for i, chunk in enumerate(chunks):
+                chunk_start = chunk[3]
+                next_start = chunks[i + 1][3] if i + 1 < len(chunks) else None
+                if t_end is not None and chunk_start is not None and chunk_start >= t_end:
+                    continue
+                if t_start is not None and next_start is not None and next_start <= t_start:
+                    continue
+                selected.append(chunk)
+            chunks = selected
+
+        total = sum(chunk[2] for chunk in chunks)
+        tdiff = 1.0 / info['nominal_srate'] if info['nominal_srate'] > 0 else 0.0
+        stamps = np.empty(total)
+        numeric = info['channel_format'] in NUMERIC_DTYPES
+        if numeric:
+            dtype = np.dtype(NUMERIC_DTYPES[info['channel_format']])
+            values = np.empty((total, info['channel_count']), dtype=dtype)
+        else:
+            values = []
+        last_timestamp = 0.0
+        filled = 0
+        with open(self.file_path, 'rb') as f:
+            for offset, length, count, first_timestamp in chunks:
+                f.seek(offset)
+                buffer = f.read(length)
+                if numeric:
+                    last_timestamp = _decode_numeric_chunk(buffer, info['channel_count'], dtype, last_timestamp, tdiff,
+                                                           values[filled:filled + count], stamps[filled:filled + count])
+                else:
+                    chunk_stamps, chunk_values, last_timestamp = _decode_string_chunk(buffer, info['channel_count'], last_timestamp, tdiff)
+                    stamps[filled:filled + count] = chunk_stamps
+                    values.extend(chunk_values)
+                filled += count
+
+        if t_start is not None or t_end is not None:
+            keep = np.ones(total, dtype=bool)
+            if t_start is not None:
+                keep &= stamps >= t_start
+            if t_end is not None:
+                keep &= stamps < t_end
+            stamps = stamps[keep]
+            values = values[keep] if numeric else [v for v, k in zip(values, keep) if k]
+
+        if synchronize_clocks and entry['clock_offsets']:
+            offsets = np.asarray(entry['clock_offsets'])
+            # Collection times are on the stream's clock already (local time minus the offset), as in pyxdf
+            stamps = stamps + np.interp(stamps, offsets[:, 0], offsets[:, 1])
+
+        return {
+            'info': {'name': [info['name']], 'type': [info['type']], 'channel_count': [str(info['channel_count'])],
+                     'nominal_srate': [str(info['nominal_srate'])], 'channel_format': [info['channel_format']],
+                     'stream_id': int(sid)},
+            'time_series': values,
+            'time_stamps': stamps,
+        }
+
+
+def list_streams(file_path):
+    """
+    Print the streams of an XDF file using the chunk index (no sample data is loaded).
+
+    :param file_path: Path to the .xdf file.
+    """
+    reader = XDFIndexedReader(file_path)
+    for i, info in enumerate(reader.streams):
+        print(f"Stream {i + 1}:")
+        print(f"  Name: {info['name']}")
+        print(f"  Type: {info['type']}")
+        print(f"  Channel Count: {info['channel_count']}")
+        print(f"  Sampling Rate: {info['nominal_srate']}")
+        print(f"  Data Points: {info['sample_count']}")
+        print()
+    return reader
+
 if __name__ == "__main__":
     # Prompt the user for the .xdf file path
     file_path = input("Enter the path to the .xdf file: ").strip()
@@ -62,14 +391,15 @@ if __name__ == "__main__":
     if not os.path.exists(file_path):
         print(f"Error: File '{file_path}' does not exist.")
     else:
-        streams, file_header = load_xdf_file(file_path)
+        # List the streams from the index and load only the one that is requested
+        reader = list_streams(file_path)
+        streams = reader.streams
 
         if streams:
-            print_stream_info(streams)
             # Prompt the user to save a specific stream
             stream_index = int(input(f"Enter the stream index (1-{len(streams)}) to save as CSV: ")) - 1
             if 0 <= stream_index < len(streams):
                 output_path = input("Enter the output CSV file path: ").strip()
-                save_stream_to_csv(streams[stream_index], output_path)
+                save_stream_to_csv(reader.load_stream(streams[stream_index]['stream_id']), output_path)
             else:
                 print("Invalid stream index.")
\ No newline at end of file